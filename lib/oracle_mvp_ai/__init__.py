@@ -1,4 +1,5 @@
 # lib 패키지 초기화 파일 
 from .ai_judge import AiJudge
+from .config import JudgeConfig
 
-__all__ = ["AiJudge"] 
\ No newline at end of file
+__all__ = ["AiJudge", "JudgeConfig"] 
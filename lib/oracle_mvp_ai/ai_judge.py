@@ -1,18 +1,48 @@
+import asyncio
+import copy
+import itertools
+import logging
+import time
 import numpy as np
 from bson import ObjectId
 from pathlib import Path
-from typing import List, Dict, Any, Optional, Tuple
-from .checker.duplicate_checker import DuplicateChecker
+from typing import List, Dict, Any, Optional, Tuple, Iterable, AsyncIterable, AsyncIterator, Awaitable, Callable, Union
+from .checker.duplicate_checker import DuplicateChecker, OnlineDeduplicator
 from .checker.credibility_checker import CredibilityChecker
 from .checker.credibility_checker_batch import CredibilityCheckerBatch
 from .llm_clients.factory import LLMClientFactory
+from .llm_clients.limiter import llm_priority
+from .llm_clients.coalescer import independent_chat_calls
+from .profiles import Deadline, get_profile
+from .prompt_registry import PromptRegistry, PromptVersion
+from .config import JudgeConfig, BATCH_PROMPT_FILES
 from .strategies.final_debate import JudgeAfterDebate
-import yaml
+from .strategies.final_ensemble import JudgeEnsemble, average_percentages
+from .strategies.self_consistency import JudgeSelfConsistency
+from .strategies.opinion_summary import OpinionSummarizer, count_tokens
+from .snapshots import TopicSnapshotStore
+from .compute import CpuPool
+from .tracing import JudgeTrace, start_trace
+from . import telemetry
+from .budget import BudgetExceeded, SpendBudget, TenantBudgets, activate_budgets, budget_allows
+from .result_cache import JudgeResultCache, make_cache_key
 import json
 
+logger = logging.getLogger(__name__)
+
+# 중복 의견으로 볼 임베딩 코사인 유사도
+DEDUP_SIMILARITY_THRESHOLD = 0.73
+
+# judge_consistency 실행 방식 ("final": 앞 단계 재사용, "full": 전체 파이프라인 반복)
+CONSISTENCY_MODES = ("final", "full")
+
 
 class AiJudge:
-    def __init__(self, api_key: str):
+    def __init__(self, api_key: str, config: Optional[JudgeConfig] = None,
+                 snapshot_store: Optional[TopicSnapshotStore] = None,
+                 result_cache: Optional[JudgeResultCache] = None,
+                 tenant_budgets: Optional[TenantBudgets] = None,
+                 cpu_pool: Optional[CpuPool] = None):
         self.openai_client = LLMClientFactory.create_client("openai")
         self.google_client = LLMClientFactory.create_client("google")
         self.anthropic_client = LLMClientFactory.create_client("anthropic")
@@ -20,18 +50,31 @@ class AiJudge:
         self.credibility_checker = CredibilityChecker(self.openai_client)
         self.credibility_checker_batch = CredibilityCheckerBatch(self.openai_client)
         self.prompt_metadata_dir = Path(__file__).parent / "prompt_metadata"
-        # 의견이 없을 경우 판결 방지 옵션
-        self.prevent_judgement_without_opinion = False
-        self.output_judgement_percentage = True
-        self.group_opinions_by_camp = False
-        # 최종 판결 모델 선택 (openai, google, anthropic)
-        self.final_judgement_provider = "openai"
-        # 토론 옵션 (openai 사용)
-        self.judge_after_debate = True
-        # 신뢰도 점수 배치 처리 옵션
-        self.batch_credibility_check = True
-
-    def _process_input_data(self, data: Dict[str, Any]) -> Dict[str, Any]:
+        self.prompt_registry = PromptRegistry(self.prompt_metadata_dir)
+        # 기본 설정 (judge 호출 시 config를 넘기지 않으면 사용)
+        self.config = config or JudgeConfig()
+        # 주제별 스냅샷 저장소 (있으면 같은 주제 재판결 시 바뀐 의견만 다시 처리)
+        self.snapshot_store = snapshot_store
+        # 판결 결과 캐시 (있으면 같은 입력/프롬프트/옵션의 판결은 저장된 결과를 반환)
+        self.result_cache = result_cache
+        # 테넌트별 누적 토큰/비용 예산 (config.tenant로 선택)
+        self.tenant_budgets = tenant_budgets
+        # CPU 작업(중복 의견 묶기)을 실행할 프로세스 풀 (없으면 스레드에서 실행하여 이벤트 루프는 막지 않음)
+        self.cpu_pool = cpu_pool or CpuPool(workers=0)
+
+    def _get_client(self, provider: str):
+        """
+        provider 이름으로 LLM 클라이언트 반환
+        """
+        if provider == "openai":
+            return self.openai_client
+        elif provider == "google":
+            return self.google_client
+        elif provider == "anthropic":
+            return self.anthropic_client
+        raise ValueError(f"Unsupported provider: {provider}")
+
+    def _process_input_data(self, data: Dict[str, Any], config: JudgeConfig) -> Dict[str, Any]:
         """
         입력 JSON 데이터를 처리하여 AI 판사 시스템에 필요한 형태로 변환
         
@@ -59,6 +102,7 @@ class AiJudge:
                     ],
                 },
             }
+            config: 요청 설정
             
         Returns:
             처리된 데이터
@@ -83,8 +127,9 @@ class AiJudge:
         
         # 진영 정보가 있는지 확인
         has_camp_ids = any("camp_id" in opinion for opinion in opinions_info)
+        post_camp_ids = [str(opinion.get("camp_id", "")) for opinion in opinions_info]
         
-        if has_camp_ids and self.group_opinions_by_camp:
+        if has_camp_ids and config.group_opinions_by_camp:
             # 진영 정보가 있고 진영별 그룹화 옵션이 켜져있으면 진영정보 포함
             posts_with_camps = [(str(opinion.get("msg", "")), str(opinion.get("camp_id", ""))) for opinion in opinions_info]
             result = {
@@ -93,7 +138,8 @@ class AiJudge:
                 "camps": camp_names,
                 "camp_ids": camp_ids,
                 "posts_with_camps": posts_with_camps,
-                "prompt_file": self._select_prompt_file(topic_info, camp_names)
+                "post_camp_ids": post_camp_ids,
+                "prompt_file": self._select_prompt_file(topic_info, camp_names, config)
             }
         else:
             # If no camp_ids or grouping is disabled, use the old format
@@ -104,18 +150,21 @@ class AiJudge:
                 "camps": camp_names,
                 "camp_ids": camp_ids,
                 "posts": posts,
-                "prompt_file": self._select_prompt_file(topic_info, camp_names)
+                "post_camp_ids": post_camp_ids,
+                "prompt_file": self._select_prompt_file(topic_info, camp_names, config)
             }
             
         return result
 
-    def _select_prompt_file(self, topic: str, camps: List[str]) -> str:
+    def _select_prompt_file(self, topic: str, camps: List[str], config: JudgeConfig) -> str:
         """
         주제와 진영 정보에 따라 적절한 프롬프트 메타데이터 파일 선택
-        우선은 프롬프트 고정
+        설정에 프롬프트 파일이 지정되어 있으면 그대로 사용, 아니면 우선은 프롬프트 고정
         """
-        if self.batch_credibility_check:
-            prompt_file = "v_2_1_1.yaml"
+        if config.prompt_file:
+            prompt_file = config.prompt_file
+        elif config.batch_credibility_check:
+            prompt_file = BATCH_PROMPT_FILES[0]
         else:
             prompt_file = "v_2_0_2.yaml"
         return prompt_file
@@ -153,11 +202,363 @@ class AiJudge:
         
         return camp_opinions
 
-    async def judge(self, data: Dict[str, Any]) -> Dict[str, Any]:
+    def _stratified_quotas(self, weights: Dict[str, int], available: Dict[str, int], total: int) -> Dict[str, int]:
+        """
+        전체 total개를 진영별 가중치(지지 수)에 비례하여 배분 (D'Hondt 방식)
+        배분할 수가 진영 수 이상이면 모든 진영에 최소 1개를 보장
+        """
+        camps = [camp for camp in weights if available[camp] > 0]
+        quotas = {camp: 0 for camp in weights}
+        if total >= len(camps):
+            for camp in camps:
+                quotas[camp] = 1
+        for _ in range(total - sum(quotas.values())):
+            open_camps = [camp for camp in camps if quotas[camp] < available[camp]]
+            if not open_camps:
+                break
+            camp = max(open_camps, key=lambda c: weights[c] / (quotas[c] + 1))
+            quotas[camp] += 1
+        return quotas
+
+    def _weight_opinion_clusters(self, clusters: List[List[int]], posts: List[str], scored_by_opinion: Dict[str, str],
+                                 post_camps: Optional[List[str]], camp_ids: List[str], camps: List[str],
+                                 max_clusters: Optional[int] = None,
+                                 post_support: Optional[List[Dict[str, int]]] = None) -> Tuple[List[Dict[str, Any]], Dict[str, int]]:
+        """
+        중복 제거 묶음마다 지지 수와 진영별 분포를 붙인 한 줄 의견 생성
+
+        Args:
+            clusters: 묶음별 의견 인덱스 리스트 (첫 번째가 대표 의견)
+            posts: 원본 의견 리스트
+            scored_by_opinion: {대표 의견: 신뢰도 점수가 붙은 의견}
+            post_camps: 의견별 캠프 아이디 (없으면 진영 분포 생략)
+            camp_ids: 캠프 아이디 리스트
+            camps: 캠프 이름 리스트
+            max_clusters: 최대 묶음 수. 넘으면 진영별 지지 수 비율대로 지지 수가 많은 묶음부터 선택
+            post_support: 의견별 {캠프 아이디: 지지 수} (스트리밍 중복 제거에서 이미 통합된 의견인 경우, 없으면 의견마다 1)
+
+        Returns:
+            (지지 수 내림차순 [{"camp_id", "support", "line"}, ...], {"clusters", "included", "omitted"})
+        """
+        camp_names = {str(camp_id): name for camp_id, name in zip(camp_ids, camps)}
+        entries = []
+        for cluster in clusters:
+            breakdown = {}
+            support = 0
+            for index in cluster:
+                if post_support is not None:
+                    support += sum(post_support[index].values())
+                    for camp_id, count in post_support[index].items():
+                        if camp_id:
+                            breakdown[camp_id] = breakdown.get(camp_id, 0) + count
+                    continue
+                support += 1
+                if post_camps and post_camps[index] is not None:
+                    camp_id = str(post_camps[index])
+                    breakdown[camp_id] = breakdown.get(camp_id, 0) + 1
+            representative = posts[cluster[0]]
+            entries.append({
+                # 묶음의 진영은 가장 많이 지지한 진영
+                "camp_id": max(breakdown, key=breakdown.get) if breakdown else "",
+                "support": support,
+                "breakdown": breakdown,
+                "opinion": scored_by_opinion.get(representative, representative)
+            })
+        entries.sort(key=lambda entry: -entry["support"])
+
+        selected = entries
+        if max_clusters and len(entries) > max_clusters:
+            by_camp = {}
+            for entry in entries:
+                by_camp.setdefault(entry["camp_id"], []).append(entry)
+            quotas = self._stratified_quotas(
+                {camp_id: sum(entry["support"] for entry in group) for camp_id, group in by_camp.items()},
+                {camp_id: len(group) for camp_id, group in by_camp.items()},
+                max_clusters
+            )
+            selected = [entry for camp_id, group in by_camp.items() for entry in group[:quotas[camp_id]]]
+            selected.sort(key=lambda entry: -entry["support"])
+
+        weighted = []
+        for entry in selected:
+            detail = ", ".join(f"{camp_names.get(camp_id, camp_id)} {count}" for camp_id, count in entry["breakdown"].items())
+            support = f"support {entry['support']}: {detail}" if detail else f"support {entry['support']}"
+            weighted.append({"camp_id": entry["camp_id"], "support": entry["support"], "line": f"[{support}] {entry['opinion']}"})
+        return weighted, {"clusters": len(entries), "included": len(selected), "omitted": len(entries) - len(selected)}
+
+    async def judge(self, data: Dict[str, Any], config: Optional[JudgeConfig] = None,
+                    embedding_cache: Optional[Dict[str, Any]] = None,
+                    shared_usage: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
         """
         입력 데이터를 처리하고 AI 판사 시스템에 전달
+
+        Args:
+            data: 입력 데이터 (_process_input_data 참고)
+            config: 요청 설정 (없으면 self.config). config.profile이 지정되면 프로필의 제한 시간 안에
+                    결과를 반환하도록 남은 시간에 따라 단계를 생략하거나 축소하고,
+                    적용된 축소 내역을 metadata.profile.degradations에 기록
+            embedding_cache: {의견 텍스트: 임베딩} 딕셔너리. 있는 임베딩은 다시 요청하지 않음
+            shared_usage: embedding_cache를 여러 주제가 함께 만든 경우 이 주제 몫의 사용량
+                          ({"calls", "prompt_tokens", "completion_tokens", "cost_usd"}).
+                          trace의 embedding 단계와 요청 예산에 더함 (테넌트 예산은 만든 쪽에서 차감)
+
+        단계별(embedding, dedup, web_search, scoring, summarization, final_judgment) 실행 시간,
+        LLM 호출 수, 토큰 수, 예상 비용을 metadata.trace에 기록하고 구조화된 로그로 출력
+
+        config.max_total_tokens / max_cost_usd (요청 단위)와 config.tenant의 누적 예산을 LLM 클라이언트에서 적용하며,
+        예산이 부족하면 실패 대신 웹 검색/요약/토론을 생략하는 저렴한 경로로 전환하고 사용량을 metadata.spend에 기록
         """
-        processed_data = self._process_input_data(data)
+        config = config or self.config
+        request_budget, tenant_budget = self._spend_budgets(config)
+
+        with telemetry.JUDGE_IN_FLIGHT.track(), start_trace() as trace, activate_budgets(request_budget, tenant_budget), \
+                llm_priority(config.priority):
+            if shared_usage:
+                trace.add_usage("embedding", "", shared_usage["prompt_tokens"], shared_usage["completion_tokens"],
+                                shared_usage["calls"], cost_usd=shared_usage["cost_usd"])
+                if request_budget is not None:
+                    request_budget.charge(shared_usage["prompt_tokens"] + shared_usage["completion_tokens"],
+                                          shared_usage["cost_usd"])
+            try:
+                result = await self._judge(data, config, embedding_cache, trace)
+            except BaseException:
+                telemetry.observe_judgment(None, time.monotonic() - trace.started_at, error=True)
+                raise
+        self._report_judgment(result, trace, config, request_budget, tenant_budget)
+        return result
+
+    async def judge_stream(self, header: Dict[str, Any], posts: Union[Iterable[Dict[str, Any]], AsyncIterable[Dict[str, Any]]],
+                           config: Optional[JudgeConfig] = None, batch_size: int = 256) -> Dict[str, Any]:
+        """
+        의견을 한 번에 메모리에 올리지 않고 판결 (JSONL 데이터셋 등 큰 주제용)
+
+        의견을 batch_size개씩 읽어 바로 임베딩하고 OnlineDeduplicator로 통합한 뒤,
+        대표 의견과 진영별 지지 수만으로 judge()와 같은 이후 단계를 실행합니다.
+        메모리 사용량은 전체 의견 수가 아닌 통합된 묶음 수에 비례합니다.
+
+        Args:
+            header: 주제 정보 (_process_input_data의 topic에서 posts를 뺀 형태)
+            posts: 의견 {"user_id", "camp_id", "msg"}의 iterable 또는 async iterable
+            config: 요청 설정 (없으면 self.config)
+            batch_size: 한 번에 임베딩할 의견 수
+
+        임베딩 중 예산이 부족해지면 이후 의견은 같은 텍스트끼리만 통합하고
+        metadata.degradations에 stream_dedup_exact를 기록합니다. 읽은 의견/묶음/배치 수는 metadata.stream에 기록합니다.
+        """
+        config = config or self.config
+        request_budget, tenant_budget = self._spend_budgets(config)
+
+        with telemetry.JUDGE_IN_FLIGHT.track(), start_trace() as trace, activate_budgets(request_budget, tenant_budget), \
+                llm_priority(config.priority):
+            try:
+                deduplicator = OnlineDeduplicator(DEDUP_SIMILARITY_THRESHOLD)
+                # 임베딩을 쓸 수 없게 된 뒤의 의견은 텍스트가 같은 것끼리만 통합 ({텍스트: {캠프 아이디: 지지 수}})
+                exact: Dict[str, Dict[str, int]] = {}
+                degradations = []
+                batches = streamed = 0
+                async for batch in self._iter_batches(posts, batch_size):
+                    batches += 1
+                    streamed += len(batch)
+                    texts = [str(post.get("msg", "")) for post in batch]
+                    camp_ids = [str(post.get("camp_id", "")) for post in batch]
+                    embeddings = None
+                    if not degradations:
+                        try:
+                            with trace.stage("embedding"):
+                                embeddings = await self.duplicate_checker.create_embeddings(texts)
+                        except BudgetExceeded:
+                            degradations.append("stream_dedup_exact")
+                    if embeddings is not None:
+                        with trace.stage("dedup"):
+                            # 묶음 상태를 가진 온라인 통합은 순서대로 실행해야 하므로 프로세스 풀 대신 스레드에서 실행
+                            await asyncio.to_thread(deduplicator.add, texts, camp_ids, embeddings)
+                    else:
+                        for text, camp_id in zip(texts, camp_ids):
+                            support = exact.setdefault(text, {})
+                            support[camp_id] = support.get(camp_id, 0) + 1
+
+                representatives = list(deduplicator.representatives)
+                post_support = list(deduplicator.support)
+                embedding_cache = dict(zip(deduplicator.representatives, deduplicator.embeddings))
+                positions = {text: i for i, text in enumerate(representatives)}
+                for text, support in exact.items():
+                    if text in positions:
+                        index = positions[text]
+                        for camp_id, count in support.items():
+                            post_support[index][camp_id] = post_support[index].get(camp_id, 0) + count
+                    else:
+                        representatives.append(text)
+                        post_support.append(support)
+
+                compact_posts = []
+                for text, support in zip(representatives, post_support):
+                    post = {"msg": text}
+                    camps = {camp_id: count for camp_id, count in support.items() if camp_id}
+                    if camps:
+                        # 묶음의 진영은 가장 많이 지지한 진영
+                        post["camp_id"] = max(camps, key=camps.get)
+                    compact_posts.append(post)
+                data = {"topic": {**header, "posts": compact_posts}}
+                logger.info(f"Streamed {streamed} posts into {len(compact_posts)} opinions ({batches} batches)")
+
+                state = await self._prepare_judgment(data, config, embedding_cache, trace,
+                                                     post_support=post_support, degradations=degradations)
+                result = state["result"] if "result" in state else await self._finalize_judgment(state, config, trace)
+                result.setdefault("metadata", {})["stream"] = {
+                    "posts": streamed,
+                    "clusters": len(compact_posts),
+                    "batches": batches
+                }
+            except BaseException:
+                telemetry.observe_judgment(None, time.monotonic() - trace.started_at, error=True)
+                raise
+        self._report_judgment(result, trace, config, request_budget, tenant_budget)
+        return result
+
+    async def _iter_batches(self, posts: Union[Iterable[Dict[str, Any]], AsyncIterable[Dict[str, Any]]],
+                            batch_size: int) -> AsyncIterator[List[Dict[str, Any]]]:
+        """
+        의견을 batch_size개씩 반환 (동기 iterable은 파일 읽기가 이벤트 루프를 막지 않도록 스레드에서 읽음)
+        """
+        if hasattr(posts, "__aiter__"):
+            batch = []
+            async for post in posts:
+                batch.append(post)
+                if len(batch) >= batch_size:
+                    yield batch
+                    batch = []
+            if batch:
+                yield batch
+            return
+        iterator = iter(posts)
+        while True:
+            batch = await asyncio.to_thread(lambda: list(itertools.islice(iterator, batch_size)))
+            if not batch:
+                return
+            yield batch
+
+    def _spend_budgets(self, config: JudgeConfig) -> Tuple[Optional[SpendBudget], Optional[SpendBudget]]:
+        """
+        요청 단위 예산과 테넌트 누적 예산 (설정되지 않았으면 None)
+        """
+        request_budget = None
+        if config.max_total_tokens is not None or config.max_cost_usd is not None:
+            request_budget = SpendBudget(config.max_total_tokens, config.max_cost_usd)
+        tenant_budget = None
+        if config.tenant is not None and self.tenant_budgets is not None:
+            tenant_budget = self.tenant_budgets.get(config.tenant)
+        return request_budget, tenant_budget
+
+    def _report_judgment(self, result: Dict[str, Any], trace: JudgeTrace, config: JudgeConfig,
+                         request_budget: Optional[SpendBudget], tenant_budget: Optional[SpendBudget]):
+        """
+        trace/사용량을 metadata에 기록하고 구조화된 로그와 메트릭으로 출력
+        """
+        trace_report = trace.to_dict()
+        result.setdefault("metadata", {})["trace"] = trace_report
+        result["metadata"]["spend"] = {
+            "tokens": trace_report["total"]["prompt_tokens"] + trace_report["total"]["completion_tokens"],
+            "cost_usd": trace_report["total"]["cost_usd"],
+            "request_budget": request_budget.to_dict() if request_budget else None,
+            "tenant": {"name": config.tenant, **tenant_budget.to_dict()} if tenant_budget else None
+        }
+        trace.log(topic_id=str(result.get("topic_id", "")), cache_hit=result["metadata"].get("cache_hit"))
+        telemetry.observe_judgment(result, trace_report["total"]["seconds"], trace_report)
+
+    async def judge_consistency(self, data: Dict[str, Any], n: int, config: Optional[JudgeConfig] = None,
+                                mode: str = "final",
+                                on_progress: Optional[Callable[[int, int], None]] = None) -> List[Dict[str, Any]]:
+        """
+        같은 입력을 n번 판결 (일관성 측정용, 결과 캐시는 사용하지 않음)
+
+        Args:
+            data: judge()와 같은 입력 데이터
+            n: 판결 횟수
+            config: 요청 설정 (없으면 self.config)
+            mode: "final" - 임베딩/중복 제거/신뢰도 검사/요약은 한 번만 실행하고 최종 판결 n번을 동시에 실행
+                          (최종 판결의 변동만 측정)
+                  "full" - 전체 파이프라인 n번을 스냅샷 없이 동시에 실행 (앞 단계의 변동까지 측정)
+                  두 방식 모두 chat 호출은 회차마다 따로 보내고, 같은 임베딩/웹 검색 요청은 하나로 합칩니다.
+            on_progress: 판결이 하나 끝날 때마다 on_progress(완료 수, n) 호출
+
+        Returns:
+            판결 결과 리스트 (실행 순서, 각 결과의 metadata.consistency에 mode와 회차 기록)
+        """
+        if mode not in CONSISTENCY_MODES:
+            raise ValueError(f"mode must be one of {CONSISTENCY_MODES}")
+        config = (config or self.config).replace(use_cache=False)
+        completed = 0
+
+        async def tracked(index: int, run: Awaitable[Dict[str, Any]]) -> Dict[str, Any]:
+            nonlocal completed
+            result = await run
+            result.setdefault("metadata", {})["consistency"] = {"mode": mode, "run": index + 1, "runs": n}
+            completed += 1
+            if on_progress is not None:
+                on_progress(completed, n)
+            return result
+
+        if mode == "full":
+            # 스냅샷에 저장된 임베딩/점수를 재사용하면 앞 단계의 변동을 측정할 수 없음
+            config = config.replace(use_snapshot=False)
+            # 회차마다 chat 응답을 따로 받아야 변동을 측정할 수 있음 (임베딩/웹 검색은 합침)
+            with independent_chat_calls():
+                return list(await asyncio.gather(*[
+                    tracked(i, self.judge(copy.deepcopy(data), config)) for i in range(n)
+                ]))
+
+        request_budget, tenant_budget = self._spend_budgets(config)
+        with telemetry.JUDGE_IN_FLIGHT.track(), start_trace() as upstream_trace, activate_budgets(request_budget, tenant_budget), \
+                llm_priority(config.priority):
+            state = await self._prepare_judgment(data, config, None, upstream_trace)
+            upstream_report = upstream_trace.to_dict()
+
+            async def final_run() -> Dict[str, Any]:
+                # 회차별 최종 판결 사용량은 별도 trace에 기록
+                with start_trace() as trace:
+                    try:
+                        if "result" in state:
+                            result = copy.deepcopy(state["result"])
+                        else:
+                            result = await self._finalize_judgment(state, config, trace)
+                    except BaseException:
+                        telemetry.observe_judgment(None, time.monotonic() - trace.started_at, error=True)
+                        raise
+                self._report_judgment(result, trace, config, request_budget, tenant_budget)
+                result["metadata"]["upstream_trace"] = upstream_report
+                return result
+
+            # 같은 최종 판결 요청이 n번 나가므로 합치지 않도록 함
+            with independent_chat_calls():
+                return list(await asyncio.gather(*[tracked(i, final_run()) for i in range(n)]))
+
+    async def _judge(self, data: Dict[str, Any], config: JudgeConfig, embedding_cache: Optional[Dict[str, Any]],
+                     trace: JudgeTrace) -> Dict[str, Any]:
+        state = await self._prepare_judgment(data, config, embedding_cache, trace)
+        if "result" in state:
+            return state["result"]
+        return await self._finalize_judgment(state, config, trace)
+
+    async def _prepare_judgment(self, data: Dict[str, Any], config: JudgeConfig, embedding_cache: Optional[Dict[str, Any]],
+                                trace: JudgeTrace, post_support: Optional[List[Dict[str, int]]] = None,
+                                degradations: Optional[List[str]] = None) -> Dict[str, Any]:
+        """
+        최종 판결 전 단계 (임베딩, 중복 제거, 신뢰도 검사, 요약)를 실행하고 최종 판결에 필요한 상태를 반환
+
+        의견이 없거나 캐시된 결과가 있으면 {"result": 결과}를 반환
+        post_support: 의견별 {캠프 아이디: 지지 수} (judge_stream에서 이미 통합한 대표 의견을 넘길 때)
+        degradations: 앞 단계에서 이미 적용된 축소 내역
+        """
+        profile = config.profile
+        profile_settings = get_profile(profile) if profile else None
+        deadline = Deadline(profile_settings["deadline_seconds"] if profile_settings else None)
+        reserve = profile_settings["final_reserve_seconds"] if profile_settings else 0
+        degradations = list(degradations or [])
+
+        processed_data = self._process_input_data(data, config)
+        if post_support is not None:
+            # 지지 수가 다르면 판결도 달라지므로 캐시 키에 포함
+            processed_data["post_support"] = post_support
         prompt_file = processed_data["prompt_file"]
         topic = processed_data["topic"]
         
@@ -169,8 +570,8 @@ class AiJudge:
             posts = processed_data["posts"]
             posts_with_camps = None
         
-        if not posts and self.prevent_judgement_without_opinion: 
-            return {
+        if not posts and config.prevent_judgement_without_opinion: 
+            return {"result": {
                 #백엔드 요청 파라미터
                 "topic_id": processed_data["topic_id"],
                 "win_camp_id": None,
@@ -178,60 +579,273 @@ class AiJudge:
                 "metadata": {
                     "used_prompt_uris": [prompt_file]
                 }
-            }
+            }}
         
         camps = processed_data["camps"]
         camp_ids = processed_data["camp_ids"]
+        # 의견/묶음의 캠프 아이디는 문자열이므로 캠프 아이디(ObjectId 등)도 문자열로 맞춰 이름 조회
+        camp_names = {str(camp_id): name for camp_id, name in zip(camp_ids, camps)}
+
+        prompt_yaml = self.prompt_registry.get(prompt_file)
 
-        prompt_path = Path(self.prompt_metadata_dir) / prompt_file
+        # 같은 입력의 판결 결과가 캐시에 있으면 바로 반환
+        cache_key = None
+        if self.result_cache is not None and config.use_cache:
+            cache_key = make_cache_key(processed_data, prompt_yaml.digest, config.to_dict())
+            cached = self.result_cache.get(cache_key)
+            if cached is not None:
+                cached["metadata"]["cache_hit"] = True
+                return {"result": cached}
 
-        with open(prompt_path, "r", encoding="utf-8") as f:
-            prompt_yaml = yaml.safe_load(f)
+        # 이전 판결 스냅샷 (추가/변경된 의견만 다시 처리)
+        snapshot = None
+        use_snapshot = self.snapshot_store is not None and config.use_snapshot and bool(processed_data["topic_id"])
+        if use_snapshot:
+            snapshot = await asyncio.to_thread(self.snapshot_store.load, str(processed_data["topic_id"]))
+            # 새로 만든 임베딩도 스냅샷에 저장할 수 있도록 캐시 dict 사용
+            embedding_cache = {**(snapshot or {}).get("embeddings", {}), **(embedding_cache or {})}
+        reused_embeddings = sum(1 for post in set(posts) if embedding_cache and post in embedding_cache)
 
         # 의미 비슷한 의견 통합하기
-        embeddings = await self.duplicate_checker.create_embeddings(posts)
-        
-        # 중복 의견 제거
-        deduped_opinions, deduped_embeddings, opinion_counts = self.duplicate_checker._deduplicate_opinions(
-            posts,
-            embeddings,
-            similarity_threshold=0.73
-        )
+        try:
+            with trace.stage("embedding"):
+                embeddings = await asyncio.wait_for(
+                    self.duplicate_checker.create_embeddings(posts, cache=embedding_cache),
+                    timeout=deadline.remaining(reserve)
+                )
+        except asyncio.TimeoutError:
+            embeddings = None
+            degradations.append("dedup_skipped")
+        except BudgetExceeded:
+            embeddings = None
+            degradations.append("dedup_skipped_spend")
+
+        if embeddings is not None:
+            # 중복 의견 제거
+            with trace.stage("dedup"):
+                clusters = await self.cpu_pool.cluster_opinions(posts, embeddings, similarity_threshold=DEDUP_SIMILARITY_THRESHOLD)
+        else:
+            clusters = [[i] for i in range(len(posts))]
+        deduped_opinions = [posts[cluster[0]] for cluster in clusters]
+        opinion_counts = {posts[cluster[0]]: len(cluster) for cluster in clusters}
         
-        print(f"\nAfter deduplication: {len(deduped_opinions)} unique opinions")
-        print("\nDuplicate groups found:")
-        for opinion, count in opinion_counts.items():
-            if count > 0:
-                print(f"\nOpinion appeared {count} times: {opinion[:100]}...")
+        logger.info(f"After deduplication: {len(deduped_opinions)} unique opinions")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Duplicate groups found:")
+            for opinion, count in opinion_counts.items():
+                if count > 0:
+                    logger.debug(f"Opinion appeared {count} times: {opinion[:100]}...")
         
-        # 신뢰도 검사
-        print("\nChecking credibility of unique opinions...")
-        if self.batch_credibility_check:
-            scored_opinions = await self.credibility_checker_batch.check_credibility(topic, deduped_opinions, prompt_yaml)
+        # 신뢰도 검사 (스냅샷에 같은 프롬프트/주제로 매긴 점수가 있는 대표 의견은 재사용)
+        known_scores = {}
+        if snapshot and snapshot.get("prompt_file") == prompt_file and snapshot.get("topic") == topic:
+            known_scores = snapshot.get("scored_opinions", {})
+        opinions_to_check = [opinion for opinion in deduped_opinions if opinion not in known_scores]
+
+        checked_opinions = None
+        remaining = deadline.remaining(reserve)
+        if not opinions_to_check:
+            checked_opinions = []
+        elif profile_settings and not profile_settings["web_search"]:
+            degradations.append("web_search_skipped")
+        elif remaining is not None and remaining < profile_settings["web_search_min_seconds"]:
+            degradations.append("web_search_skipped_low_budget")
+        elif not budget_allows(config.budget_reserve_fraction):
+            # 남은 토큰/비용 예산은 최종 판결에 사용
+            degradations.append("web_search_skipped_spend")
         else:
-            scored_opinions = self.credibility_checker.check_credibility(topic, deduped_opinions, prompt_yaml)
+            logger.info("Checking credibility of unique opinions...")
+            if config.batch_credibility_check:
+                credibility_check = self.credibility_checker_batch.check_credibility(topic, opinions_to_check, prompt_yaml)
+            else:
+                credibility_check = self.credibility_checker.check_credibility(topic, opinions_to_check, prompt_yaml)
+            try:
+                checked_opinions = await asyncio.wait_for(credibility_check, timeout=remaining)
+            except asyncio.TimeoutError:
+                degradations.append("web_search_timeout")
+            except BudgetExceeded:
+                degradations.append("web_search_spend_exhausted")
+
+        new_scores = {}
+        if checked_opinions is not None and len(checked_opinions) == len(opinions_to_check):
+            new_scores = dict(zip(opinions_to_check, checked_opinions))
+            scored_opinions = [known_scores.get(opinion) or new_scores[opinion] for opinion in deduped_opinions]
+        elif checked_opinions is not None:
+            # 검사 결과 수가 다르면 의견과 짝지을 수 없으므로 그대로 사용
+            scored_opinions = [known_scores[opinion] for opinion in deduped_opinions if opinion in known_scores] + checked_opinions
+        else:
+            scored_opinions = [
+                known_scores.get(opinion) or f"{opinion} (credibility score unavailable)"
+                for opinion in deduped_opinions
+            ]
+
+        incremental = None
+        if use_snapshot:
+            incremental = {
+                "reused_embeddings": reused_embeddings,
+                "new_embeddings": len(set(posts)) - reused_embeddings if embeddings is not None else 0,
+                "reused_scores": len(deduped_opinions) - len(opinions_to_check),
+                "new_scores": len(new_scores)
+            }
+            # 실패/생략된 점수는 저장하지 않음
+            saved_scores = {
+                opinion: scored for opinion, scored in {**known_scores, **new_scores}.items()
+                if opinion in opinion_counts and "(credibility score of " in scored
+            }
+            await asyncio.to_thread(self.snapshot_store.save, str(processed_data["topic_id"]), {
+                "prompt_file": prompt_file,
+                "topic": topic,
+                "embeddings": {post: embedding_cache[post] for post in posts if embedding_cache and post in embedding_cache},
+                "clusters": [{"representative": posts[cluster[0]], "members": [posts[i] for i in cluster]} for cluster in clusters],
+                "scored_opinions": saved_scores
+            })
         
-        print("\nScored opinions:")
-        for opinion in scored_opinions:
-            print(f"\n{opinion}")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Scored opinions:")
+            for opinion in scored_opinions:
+                logger.debug(opinion)
+
+        # 묶음별 지지 수/진영 분포를 붙인 한 줄 의견 (옵션)
+        weighted_opinions = None
+        support_weighting = None
+        if config.weight_opinions_by_support:
+            scored_by_opinion = dict(zip(deduped_opinions, scored_opinions)) if len(scored_opinions) == len(deduped_opinions) else {}
+            # 진영별 그룹화를 하지 않아도 의견별 캠프 아이디로 진영 분포 표시
+            post_camps = [camp_id or None for camp_id in processed_data["post_camp_ids"]]
+            weighted_opinions, support_weighting = self._weight_opinion_clusters(
+                clusters, posts, scored_by_opinion, post_camps, camp_ids, camps,
+                max_clusters=config.max_opinion_clusters, post_support=post_support
+            )
 
         # 그룹화 옵션이 켜져있고 진영 정보가 있으면 의견 그룹화
-        if self.group_opinions_by_camp and posts_with_camps:
+        if weighted_opinions is not None and config.group_opinions_by_camp and posts_with_camps:
+            weighted_by_camp = {}
+            for entry in weighted_opinions:
+                weighted_by_camp.setdefault(str(entry["camp_id"]), []).append(entry["line"])
+            opinions_list = "\n\n".join([
+                f"{camp_names.get(camp_id, 'Unassigned')} camp opinions:\n" +
+                "\n".join([f"{i+1}. {line}" for i, line in enumerate(lines)])
+                for camp_id, lines in weighted_by_camp.items()
+            ])
+        elif weighted_opinions is not None:
+            opinions_list = "\n".join([f"{i+1}. {entry['line']}" for i, entry in enumerate(weighted_opinions)])
+        elif config.group_opinions_by_camp and posts_with_camps:
             camp_opinions = self._organize_opinions_by_camp(scored_opinions, posts_with_camps, camp_ids)
             # 캠프별 의견 리스트 포맷팅
             opinions_list = "\n\n".join([
-                f"{camps[camp_ids.index(str(camp_id))]} camp opinions:\n" + 
+                f"{camp_names[camp_id]} camp opinions:\n" + 
                 "\n".join([f"{i+1}. {opinion}" for i, opinion in enumerate(opinions)])
                 for camp_id, opinions in camp_opinions.items() if opinions
             ])
         else:
             opinions_list = "\n".join([f"{i+1}. {opinion}" for i, opinion in enumerate(scored_opinions)])
+
+        # 의견이 토큰 예산을 넘으면 진영별로 요약하여 최종 판결 프롬프트 크기를 제한
+        summarization = None
+        if config.opinion_token_budget and count_tokens(opinions_list) > config.opinion_token_budget:
+            if weighted_opinions is not None:
+                # 묶음마다 진영이 정해져 있으므로 항상 진영별로 요약
+                camp_opinions = {}
+                for entry in weighted_opinions:
+                    camp_name = camp_names.get(str(entry["camp_id"]), "Unassigned")
+                    camp_opinions.setdefault(camp_name, []).append(entry["line"])
+            elif posts_with_camps:
+                camp_opinions = self._organize_opinions_by_camp(scored_opinions, posts_with_camps, camp_ids)
+                camp_opinions = {camp_names[camp_id]: opinions for camp_id, opinions in camp_opinions.items()}
+            else:
+                camp_opinions = {"All": scored_opinions}
+            summarizer = OpinionSummarizer(self.openai_client, config.opinion_token_budget,
+                                           chunk_tokens=config.summary_chunk_tokens)
+            if not budget_allows(config.budget_reserve_fraction):
+                # 요약 호출 없이 예산까지만 사용
+                summarizer.max_rounds = 0
+                degradations.append("summarization_skipped_spend")
+            with trace.stage("summarization"):
+                try:
+                    summarization = await asyncio.wait_for(
+                        summarizer.summarize(topic, camp_opinions, prompt_yaml),
+                        timeout=deadline.remaining(reserve)
+                    )
+                except asyncio.TimeoutError:
+                    degradations.append("summarization_timeout")
+                    # 요약 없이 예산까지만 사용
+                    summarizer.max_rounds = 0
+                    summarization = await summarizer.summarize(topic, camp_opinions, prompt_yaml)
+            opinions_list = "\n\n".join([
+                f"{camp} camp opinions (summarized):\n" +
+                "\n".join([f"{i+1}. {opinion}" for i, opinion in enumerate(opinions)])
+                for camp, opinions in summarization["opinions"].items() if opinions
+            ]) if "All" not in camp_opinions else "\n".join(
+                [f"{i+1}. {opinion}" for i, opinion in enumerate(summarization["opinions"].get("All", []))]
+            )
         
-        print(f"\nopinions_list:\n {opinions_list}")
+        logger.debug("opinions_list:\n %s", opinions_list)
+        return {
+            "processed_data": processed_data,
+            "prompt_yaml": prompt_yaml,
+            "opinions_list": opinions_list,
+            "profile_settings": profile_settings,
+            "deadline": deadline,
+            "degradations": degradations,
+            "cache_key": cache_key,
+            "incremental": incremental,
+            "support_weighting": support_weighting,
+            "summarization": summarization
+        }
+
+    async def _finalize_judgment(self, state: Dict[str, Any], config: JudgeConfig, trace: JudgeTrace) -> Dict[str, Any]:
+        """
+        _prepare_judgment의 상태로 최종 판결을 내리고 결과를 구성 (같은 상태로 여러 번 동시에 호출 가능)
+        """
+        processed_data = state["processed_data"]
+        prompt_file = processed_data["prompt_file"]
+        topic = processed_data["topic"]
+        camps = processed_data["camps"]
+        camp_ids = processed_data["camp_ids"]
+        prompt_yaml = state["prompt_yaml"]
+        opinions_list = state["opinions_list"]
+        profile = config.profile
+        profile_settings = state["profile_settings"]
+        deadline = state["deadline"]
+        # 동시에 실행되는 다른 최종 판결과 공유하지 않도록 복사
+        degradations = list(state["degradations"])
+        cache_key = state["cache_key"]
+        incremental = state["incremental"]
+        support_weighting = state["support_weighting"]
+        summarization = state["summarization"]
 
-        # 최종 판결
-        final_judgement = self._make_final_judgment(topic, opinions_list, prompt_yaml, camps, camp_ids)
-        print(f"\nFinal judgement: {final_judgement}")
+        # 최종 판결 (남은 시간이 부족하면 토론 대신 단일 호출)
+        max_debate_turns = None
+        if profile_settings:
+            max_debate_turns = profile_settings["max_debate_turns"]
+            remaining = deadline.remaining()
+            if config.judge_after_debate and max_debate_turns > 0 and remaining < profile_settings["debate_min_seconds"]:
+                max_debate_turns = 0
+                degradations.append("debate_skipped_low_budget")
+        if not budget_allows(config.budget_reserve_fraction) and (
+                config.final_judgement_provider == "ensemble" or config.self_consistency_samples > 1 or config.judge_after_debate):
+            # 토큰/비용 예산이 부족하면 앙상블/self-consistency/토론 대신 단일 호출
+            config = config.replace(
+                final_judgement_provider="openai" if config.final_judgement_provider == "ensemble" else config.final_judgement_provider,
+                self_consistency_samples=0,
+                judge_after_debate=False
+            )
+            degradations.append("final_judgment_single_call_spend")
+        try:
+            with trace.stage("final_judgment"):
+                final_judgement = await asyncio.wait_for(
+                    self._make_final_judgment(topic, opinions_list, prompt_yaml, camps, camp_ids, config,
+                                              max_debate_turns=max_debate_turns, deadline=deadline),
+                    timeout=deadline.remaining()
+                )
+        except asyncio.TimeoutError:
+            degradations.append("final_judgment_timeout")
+            final_judgement = self._fallback_judgment(processed_data["post_camp_ids"], camp_ids)
+        except BudgetExceeded:
+            # 예산이 모두 소진되면 LLM 호출 없이 진영별 의견 수로 판결
+            degradations.append("final_judgment_spend_fallback")
+            final_judgement = self._fallback_judgment(processed_data["post_camp_ids"], camp_ids)
+        logger.info(f"Final judgement: {final_judgement}")
 
         win_camp_id = final_judgement.get("camp_id", "")
         ai_conclusion = final_judgement.get("reason", "")
@@ -245,178 +859,392 @@ class AiJudge:
                 "used_prompt_uris": [prompt_file]
             }
         }
-        if self.output_judgement_percentage:
+        if "providers" in final_judgement:
+            result["metadata"]["ensemble"] = {
+                "votes": final_judgement["votes"],
+                "agreement": final_judgement["agreement"],
+                "providers": final_judgement["providers"],
+                "cancelled_providers": final_judgement.get("cancelled_providers", [])
+            }
+        elif "samples" in final_judgement:
+            result["metadata"]["self_consistency"] = {
+                "votes": final_judgement["votes"],
+                "agreement": final_judgement["agreement"],
+                "samples": final_judgement["samples"]
+            }
+        if "debate" in final_judgement:
+            result["metadata"]["debate"] = final_judgement["debate"]
+        if incremental is not None:
+            result["metadata"]["incremental"] = incremental
+        if support_weighting is not None:
+            result["metadata"]["support_weighting"] = support_weighting
+        if summarization is not None:
+            result["metadata"]["summarization"] = {
+                "token_budget": config.opinion_token_budget,
+                "input_tokens": summarization["input_tokens"],
+                "output_tokens": summarization["output_tokens"],
+                "rounds": summarization["rounds"]
+            }
+        if profile_settings:
+            result["metadata"]["profile"] = {
+                "name": profile,
+                "deadline_seconds": profile_settings["deadline_seconds"],
+                "elapsed_seconds": round(deadline.elapsed(), 3),
+                "degradations": degradations
+            }
+        if degradations:
+            # 시간 제한/예산으로 생략한 단계 (프로필 없이 예산만 적용한 경우에도 기록)
+            result["metadata"]["degradations"] = degradations
+        if config.output_judgement_percentage:
             result["judgement_percentage"] = percentage
+        if cache_key is not None:
+            result["metadata"]["cache_hit"] = False
+            # 시간 제한으로 축소되었거나 판결에 실패한 결과는 캐시하지 않음
+            if not degradations and not final_judgement.get("failed"):
+                self.result_cache.set(cache_key, result)
         return result
+
+    async def judge_many(self, topics: Iterable[Dict[str, Any]], config: Optional[JudgeConfig] = None,
+                         max_concurrent_topics: int = 4, embedding_window: int = 16) -> AsyncIterator[Dict[str, Any]]:
+        """
+        여러 주제를 동시에 판결하고 끝나는 순서대로 결과를 반환 (async generator)
+
+        주제를 embedding_window개씩 묶어 묶음 전체의 의견 임베딩을 배치 요청으로 한 번에 만들고,
+        판결은 최대 max_concurrent_topics개까지 동시에 진행합니다.
+        LLM 요청 수 제한은 클라이언트의 limiter가 모든 주제에 공통으로 적용합니다.
+        실패한 주제는 win_camp_id가 None이고 error가 포함된 결과로 반환됩니다.
+
+        Args:
+            topics: judge()와 같은 형식의 입력 데이터 iterable
+            config: 모든 주제에 적용할 요청 설정
+            max_concurrent_topics: 동시에 판결할 주제 수
+            embedding_window: 임베딩을 함께 요청할 주제 수
+
+        Yields:
+            주제별 판결 결과
+        """
+        config = config or self.config
+        semaphore = asyncio.Semaphore(max_concurrent_topics)
+
+        async def run(data: Dict[str, Any], cache: Dict[str, Any], usage: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+            async with semaphore:
+                try:
+                    return await self.judge(data, config, embedding_cache=cache, shared_usage=usage)
+                except Exception as e:
+                    logger.warning(f"judge_many: topic {data.get('topic', {}).get('_id', '')} failed: {e}")
+                    return {
+                        "topic_id": data.get("topic", {}).get("_id", ""),
+                        "win_camp_id": None,
+                        "error": str(e),
+                        "metadata": {}
+                    }
+
+        pending = set()
+        try:
+            topics = iter(topics)
+            while True:
+                window = list(itertools.islice(topics, embedding_window))
+                if not window:
+                    break
+                # 묶음 안의 모든 의견 임베딩을 한 번에 생성 (결과 캐시에 판결이 있는 주제는 임베딩하지 않음)
+                cache = {}
+                texts_by_topic = [
+                    [] if self._has_cached_result(data, config) else [post.get("msg", "") for post in data.get("topic", {}).get("posts", [])]
+                    for data in window
+                ]
+                texts = [text for topic_texts in texts_by_topic for text in topic_texts]
+                # 테넌트 예산은 여기서 차감하고, 사용량은 주제별 의견 길이 비율로 나눠 각 주제의 trace/요청 예산에 기록
+                _, tenant_budget = self._spend_budgets(config)
+                with start_trace() as window_trace, activate_budgets(tenant_budget), llm_priority(config.priority):
+                    try:
+                        with window_trace.stage("embedding"):
+                            await self.duplicate_checker.create_embeddings(texts, cache=cache)
+                    except Exception as e:
+                        logger.warning(f"judge_many: batch embedding failed, falling back to per-topic embeddings: {e}")
+                usages = self._split_usage(window_trace.stages.get("embedding"), texts_by_topic)
+                for data, usage in zip(window, usages):
+                    pending.add(asyncio.create_task(run(data, cache, usage)))
+
+                # 진행 중인 주제가 너무 많아지지 않도록 끝난 결과부터 반환
+                while len(pending) >= embedding_window:
+                    done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                    for task in done:
+                        yield task.result()
+
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    yield task.result()
+        finally:
+            # 소비자가 중간에 멈추면 남은 판결 취소
+            for task in pending:
+                task.cancel()
+
+    def _has_cached_result(self, data: Dict[str, Any], config: JudgeConfig) -> bool:
+        """
+        결과 캐시에 같은 입력의 판결이 있는지 확인 (적중 여부는 judge()에서 다시 조회하여 집계)
+        """
+        if self.result_cache is None or not config.use_cache:
+            return False
+        try:
+            processed_data = self._process_input_data(data, config)
+            prompt_yaml = self.prompt_registry.get(processed_data["prompt_file"])
+        except Exception:
+            # 입력 오류는 judge()에서 주제별 오류 결과로 처리
+            return False
+        return make_cache_key(processed_data, prompt_yaml.digest, config.to_dict()) in self.result_cache
+
+    def _split_usage(self, usage: Optional[Dict[str, Any]], texts_by_topic: List[List[str]]) -> List[Optional[Dict[str, Any]]]:
+        """
+        여러 주제가 함께 요청한 사용량을 주제별 의견 길이 비율로 나눔 (호출 수는 공유 요청이므로 주제마다 그대로 기록)
+        """
+        if not usage or not usage["calls"]:
+            return [None] * len(texts_by_topic)
+        lengths = [sum(len(text) for text in texts) for texts in texts_by_topic]
+        total = sum(lengths) or 1
+        return [
+            {
+                "calls": usage["calls"] if length else 0,
+                "prompt_tokens": round(usage["prompt_tokens"] * length / total),
+                "completion_tokens": round(usage["completion_tokens"] * length / total),
+                "cost_usd": usage["cost_usd"] * length / total
+            }
+            for length in lengths
+        ]
+
+    def _fallback_judgment(self, post_camp_ids: List[str], camp_ids: List[str]) -> Dict[str, Any]:
+        """
+        제한 시간 안에 최종 판결을 받지 못했을 때 사용하는 판결
+        진영별 의견 수 비율로 승리 진영과 비율을 정함 (진영 정보가 없으면 균등 분배, 첫 번째 캠프 승리)
+        """
+        camp_ids = [str(camp_id) for camp_id in camp_ids]
+        counts = {camp_id: 0 for camp_id in camp_ids}
+        for camp_id in post_camp_ids:
+            if camp_id in counts:
+                counts[camp_id] += 1
+        win_camp_id = max(camp_ids, key=lambda camp_id: counts[camp_id])
+        return {
+            "camp_id": win_camp_id,
+            "reason": "제한 시간 내에 판결을 완료하지 못해 진영별 의견 수를 기준으로 판단했습니다.",
+            "percentage": average_percentages([[{"camp_id": camp_id, "percentage": count} for camp_id, count in counts.items()]], camp_ids)
+        }
     
-    def _make_final_judgment(self, topic: str, opinions_list: str, prompt_yaml: Dict, camps: List[str], camp_ids: List[str]) -> Dict[str, str]:
+    async def _make_final_judgment(self, topic: str, opinions_list: str, prompt_yaml: PromptVersion, camps: List[str], camp_ids: List[str],
+                                   config: JudgeConfig, max_debate_turns: Optional[int] = None, deadline: Optional[Deadline] = None) -> Dict[str, str]:
         """
         최종 판결 도출
+
+        Args:
+            config: 요청 설정 (판결 모델, 토론/앙상블/샘플링 옵션)
+            max_debate_turns: 토론 최대 턴 수 (None이면 기본값, 0이면 토론 없이 단일 호출)
+            deadline: 요청 제한 시간 (토론은 제한 시간이 지나면 새 턴을 시작하지 않음)
         """
         # 프롬프트 추출
         system_content = prompt_yaml.get("final_judgment", {}).get("system", "")
-        user_template = prompt_yaml.get("final_judgment", {}).get("user", "")
         
         # 캠프 정보 포맷팅 - 각 캠프의 이름과 ID를 포함
         # camp_ids를 모두 str로 변환
         camp_ids = [str(camp_id) for camp_id in camp_ids]
         camps_info = "\n".join([f"{camp} (ID: {camp_id})" for camp, camp_id in zip(camps, camp_ids)])
-        user_template = user_template.replace("{topic}", topic).replace("{opinions}", opinions_list).replace("{camps}", camps_info)
+        user_content = prompt_yaml.render("final_judgment", "user", topic=topic, opinions=opinions_list, camps=camps_info)
         messages = [
             {"role": "system", "content": system_content},
-            {"role": "user", "content": user_template} 
+            {"role": "user", "content": user_content} 
         ]
-        print(f"\nmessages:\n {messages}")
+        logger.debug("messages:\n %s", messages)
 
         try:
-            if self.final_judgement_provider == "openai":
-                print("\n--------------------------------")
-                print("Using GPT-4o for final judgement")
-                if (self.judge_after_debate):
-                    print("\n--------------------------------")
-                    print("Using GPT-4o for final judgement with debate")
-                    response = JudgeAfterDebate().debate(messages)
-                    consensus = response.get("consensus", "")
+            if config.final_judgement_provider == "ensemble":
+                logger.info(f"Using ensemble ({', '.join(config.ensemble_providers)}) for final judgement")
+                ensemble = JudgeEnsemble(
+                    {provider: self._get_client(provider) for provider in config.ensemble_providers},
+                    quorum=config.ensemble_quorum
+                )
+                return await ensemble.judge(
+                    messages,
+                    lambda response: self._parse_final_judgment(response, camps, camp_ids, strict=True),
+                    camp_ids
+                )
+            elif config.self_consistency_samples > 1:
+                logger.info(f"Using {config.final_judgement_provider} self-consistency ({config.self_consistency_samples} samples) for final judgement")
+                sampler = JudgeSelfConsistency(
+                    self._get_client(config.final_judgement_provider),
+                    samples=config.self_consistency_samples
+                )
+                return await sampler.judge(
+                    messages,
+                    lambda response: self._parse_final_judgment(response, camps, camp_ids, strict=True),
+                    camp_ids
+                )
+            elif config.final_judgement_provider == "openai":
+                logger.info("Using GPT-4o for final judgement")
+                if config.judge_after_debate and max_debate_turns != 0:
+                    logger.info("Using GPT-4o for final judgement with debate")
+                    # 공유 클라이언트로 호출하여 요청 제한과 판결 우선순위(llm_priority)를 그대로 적용
+                    debate = JudgeAfterDebate(self.openai_client) if max_debate_turns is None else \
+                        JudgeAfterDebate(self.openai_client, max_turns=max_debate_turns)
+                    debate_deadline = deadline.expires_at if deadline else None
+                    debate_result = await debate.debate(messages, debate_deadline)
+                    consensus = debate_result.get("consensus", "")
                     response = consensus[consensus.find("{"):]
+                    judgment = self._parse_final_judgment(response, camps, camp_ids)
+                    judgment["debate"] = {
+                        "final_state": debate_result.get("final_state"),
+                        "turns": debate_result.get("turns")
+                    }
+                    return judgment
                 else:
-                    response = self.openai_client.chat(messages, temperature=0)
-            elif self.final_judgement_provider == "google":
-                print("\n--------------------------------")
-                print("Using Gemini-2.5-pro for final judgement")
-                response = self.google_client.chat(messages, temperature=0)
-            elif self.final_judgement_provider == "anthropic":
-                print("\n--------------------------------")
-                print("Using Claude-3.5-sonnet for final judgement")
-                response = self.anthropic_client.chat(messages, temperature=0)
+                    response = await self.openai_client.chat_async(messages, temperature=0)
+            elif config.final_judgement_provider == "google":
+                logger.info("Using Gemini-2.5-pro for final judgement")
+                response = await self.google_client.chat_async(messages, temperature=0)
+            elif config.final_judgement_provider == "anthropic":
+                logger.info("Using Claude-3.5-sonnet for final judgement")
+                response = await self.anthropic_client.chat_async(messages, temperature=0)
             else:
-                raise ValueError(f"Unsupported provider: {self.final_judgement_provider}")
+                raise ValueError(f"Unsupported provider: {config.final_judgement_provider}")
+
+            return self._parse_final_judgment(response, camps, camp_ids)
+        except BudgetExceeded:
+            raise
+        except Exception as e:
+            logger.error(f"최종 판결 오류: {e}")
+            return {
+                "camp_id": camp_ids[0],  # Default to first camp
+                "reason": f"판결 도출 중 오류가 발생했습니다: {str(e)}",
+                "percentage": [{"camp_id": str(cid), "percentage": 100 // len(camps) + (100 % len(camps) if i == 0 else 0)} 
+                             for i, cid in enumerate(camp_ids)],
+                "failed": True
+            }
+
+    def _parse_final_judgment(self, response: str, camps: List[str], camp_ids: List[str], strict: bool = False) -> Dict[str, Any]:
+        """
+        최종 판결 응답 문자열을 파싱하여 camp_id, reason, percentage 추출
+
+        strict가 True이면 파싱에 실패하거나 camp_id가 없거나 캠프 목록에 없을 때 첫 번째 캠프로 대체하지 않고 ValueError 발생
+        (여러 판결을 투표로 집계할 때 잘못된 응답이 첫 번째 캠프의 표로 집계되지 않도록)
+        """
+        # Clean up the response - remove any leading/trailing whitespace and quotes
+        response = response.strip().strip('"').strip("'")
+        
+        logger.debug("Response: %s", response)
+        # If the response starts with a single quote and ends with a double quote (or vice versa),
+        # remove the outer quotes
+        if (response.startswith("'") and response.endswith('"')) or \
+           (response.startswith('"') and response.endswith("'")):
+            response = response[1:-1]
+        
+        try:
+            # Try to parse the response as JSON
+            judgment = json.loads(response)
             
-            # Clean up the response - remove any leading/trailing whitespace and quotes
-            response = response.strip().strip('"').strip("'")
+            # Validate the judgment format
+            if not isinstance(judgment, dict):
+                logger.warning(f"Invalid judgment format (not a dictionary): {judgment}")
+                raise ValueError("Judgment must be a dictionary")
             
-            print(f"\nResponse: {response}")
-            # If the response starts with a single quote and ends with a double quote (or vice versa),
-            # remove the outer quotes
-            if (response.startswith("'") and response.endswith('"')) or \
-               (response.startswith('"') and response.endswith("'")):
-                response = response[1:-1]
+            # Clean up the camp_id value - remove any extra quotes and spaces
+            camp_id = judgment.get("camp_id", "")
+            camp_id = str(camp_id).strip('"').strip("'").strip()
+            reason = str(judgment.get("reason", "판결 이유가 제공되지 않았습니다.")).strip()
+            percentage = judgment.get("percentage", [])
             
-            try:
-                # Try to parse the response as JSON
-                judgment = json.loads(response)
-                
-                # Validate the judgment format
-                if not isinstance(judgment, dict):
-                    print(f"Invalid judgment format (not a dictionary): {judgment}")
-                    raise ValueError("Judgment must be a dictionary")
-                
-                # Clean up the camp_id value - remove any extra quotes and spaces
-                camp_id = judgment.get("camp_id", "")
-                camp_id = str(camp_id).strip('"').strip("'").strip()
-                reason = str(judgment.get("reason", "판결 이유가 제공되지 않았습니다.")).strip()
-                percentage = judgment.get("percentage", [])
-                
-                # Validate the camp_id
-                if not camp_id:
-                    print("Empty camp_id received")
+            # Validate the camp_id
+            if not camp_id:
+                logger.warning("Empty camp_id received")
+                if strict:
+                    raise ValueError("Judgment has no camp_id")
+                camp_id = camp_ids[0]  # Default to first camp
+            elif camp_id not in camp_ids:
+                logger.warning(f"Invalid camp_id received: {camp_id}")
+                logger.warning(f"Available camp_ids: {camp_ids}")
+                # Try to match by removing any extra quotes or spaces
+                cleaned_camp_id = camp_id.strip('"').strip("'").strip()
+                if cleaned_camp_id in camp_ids:
+                    camp_id = cleaned_camp_id
+                elif strict:
+                    raise ValueError(f"Unknown camp_id: {camp_id}")
+                else:
                     camp_id = camp_ids[0]  # Default to first camp
-                elif camp_id not in camp_ids:
-                    print(f"Invalid camp_id received: {camp_id}")
-                    print(f"Available camp_ids: {camp_ids}")
-                    # Try to match by removing any extra quotes or spaces
-                    cleaned_camp_id = camp_id.strip('"').strip("'").strip()
-                    if cleaned_camp_id in camp_ids:
-                        camp_id = cleaned_camp_id
-                    else:
-                        camp_id = camp_ids[0]  # Default to first camp
-                
-                # Validate and format percentage array
-                if not isinstance(percentage, list):
-                    print(f"Invalid percentage format (not a list): {percentage}")
+            
+            # Validate and format percentage array
+            if not isinstance(percentage, list):
+                logger.warning(f"Invalid percentage format (not a list): {percentage}")
+                percentage = [{"camp_id": str(cid), "percentage": 100 // len(camps) + (100 % len(camps) if i == 0 else 0)} 
+                            for i, cid in enumerate(camp_ids)]
+            else:
+                # Convert any simple number array to complex structure
+                if percentage and isinstance(percentage[0], (int, float)):
+                    percentage = [{"camp_id": str(cid), "percentage": pct} 
+                                for cid, pct in zip(camp_ids, percentage)]
+                # Validate each percentage entry
+                valid_percentage = True
+                for entry in percentage:
+                    if not isinstance(entry, dict) or "camp_id" not in entry or "percentage" not in entry:
+                        valid_percentage = False
+                        break
+                if not valid_percentage or len(percentage) != len(camps):
+                    logger.warning(f"Invalid percentage structure or length mismatch: {percentage}")
                     percentage = [{"camp_id": str(cid), "percentage": 100 // len(camps) + (100 % len(camps) if i == 0 else 0)} 
                                 for i, cid in enumerate(camp_ids)]
                 else:
-                    # Convert any simple number array to complex structure
-                    if percentage and isinstance(percentage[0], (int, float)):
-                        percentage = [{"camp_id": str(cid), "percentage": pct} 
-                                    for cid, pct in zip(camp_ids, percentage)]
-                    # Validate each percentage entry
-                    valid_percentage = True
+                    # camp_id를 모두 str로 변환
                     for entry in percentage:
-                        if not isinstance(entry, dict) or "camp_id" not in entry or "percentage" not in entry:
-                            valid_percentage = False
-                            break
-                    if not valid_percentage or len(percentage) != len(camps):
-                        print(f"Invalid percentage structure or length mismatch: {percentage}")
-                        percentage = [{"camp_id": str(cid), "percentage": 100 // len(camps) + (100 % len(camps) if i == 0 else 0)} 
-                                    for i, cid in enumerate(camp_ids)]
-                    else:
-                        # camp_id를 모두 str로 변환
-                        for entry in percentage:
-                            entry["camp_id"] = str(entry["camp_id"])
+                        entry["camp_id"] = str(entry["camp_id"])
+            
+            return {
+                "camp_id": camp_id,
+                "reason": reason,
+                "percentage": percentage
+            }
+            
+        except json.JSONDecodeError as e:
+            logger.warning(f"JSON 파싱 오류: {e}")
+            logger.debug(f"Raw response: {response}")
+            # Try to extract camp_id and reason using string manipulation
+            try:
+                import re
+                camp_id_match = re.search(r'"camp_id"\s*:\s*"([^\"]+)"', response)
+                reason_match = re.search(r'"reason"\s*:\s*"([^\"]+)"', response)
+                percentage_match = re.search(r'"percentage"\s*:\s*(\[[^\]]+\])', response)
                 
-                return {
-                    "camp_id": camp_id,
-                    "reason": reason,
-                    "percentage": percentage
-                }
+                camp_id = camp_id_match.group(1).strip() if camp_id_match else camp_ids[0]
+                camp_id = str(camp_id)
+                reason = reason_match.group(1).strip() if reason_match else "판결을 파싱할 수 없습니다."
                 
-            except json.JSONDecodeError as e:
-                print(f"JSON 파싱 오류: {e}")
-                print(f"Raw response: {response}")
-                # Try to extract camp_id and reason using string manipulation
                 try:
-                    import re
-                    camp_id_match = re.search(r'"camp_id"\s*:\s*"([^\"]+)"', response)
-                    reason_match = re.search(r'"reason"\s*:\s*"([^\"]+)"', response)
-                    percentage_match = re.search(r'"percentage"\s*:\s*(\[[^\]]+\])', response)
-                    
-                    camp_id = camp_id_match.group(1).strip() if camp_id_match else camp_ids[0]
-                    camp_id = str(camp_id)
-                    reason = reason_match.group(1).strip() if reason_match else "판결을 파싱할 수 없습니다."
-                    
-                    try:
-                        if percentage_match:
-                            percentage_data = json.loads(percentage_match.group(1))
-                            if percentage_data and isinstance(percentage_data[0], dict):
-                                # camp_id를 str로 변환
-                                for entry in percentage_data:
-                                    entry["camp_id"] = str(entry["camp_id"])
-                                percentage = percentage_data
-                            else:
-                                percentage = [{"camp_id": str(cid), "percentage": pct} 
-                                            for cid, pct in zip(camp_ids, percentage_data)]
+                    if percentage_match:
+                        percentage_data = json.loads(percentage_match.group(1))
+                        if percentage_data and isinstance(percentage_data[0], dict):
+                            # camp_id를 str로 변환
+                            for entry in percentage_data:
+                                entry["camp_id"] = str(entry["camp_id"])
+                            percentage = percentage_data
                         else:
-                            percentage = [{"camp_id": str(cid), "percentage": 100 // len(camps) + (100 % len(camps) if i == 0 else 0)} 
-                                        for i, cid in enumerate(camp_ids)]
-                    except:
+                            percentage = [{"camp_id": str(cid), "percentage": pct} 
+                                        for cid, pct in zip(camp_ids, percentage_data)]
+                    else:
                         percentage = [{"camp_id": str(cid), "percentage": 100 // len(camps) + (100 % len(camps) if i == 0 else 0)} 
                                     for i, cid in enumerate(camp_ids)]
-                    
-                    if camp_id in camp_ids:
-                        return {
-                            "camp_id": camp_id,
-                            "reason": reason,
-                            "percentage": percentage
-                        }
-                except Exception as e:
-                    print(f"String manipulation failed: {e}")
+                except:
+                    percentage = [{"camp_id": str(cid), "percentage": 100 // len(camps) + (100 % len(camps) if i == 0 else 0)} 
+                                for i, cid in enumerate(camp_ids)]
                 
-                return {
-                    "camp_id": camp_ids[0],  # Default to first camp
-                    "reason": "판결을 파싱할 수 없습니다.",
-                    "percentage": [{"camp_id": str(cid), "percentage": 100 // len(camps) + (100 % len(camps) if i == 0 else 0)} 
-                                 for i, cid in enumerate(camp_ids)]
-                }
-        except Exception as e:
-            print(f"최종 판결 오류: {e}")
+                if camp_id in camp_ids and (camp_id_match or not strict):
+                    return {
+                        "camp_id": camp_id,
+                        "reason": reason,
+                        "percentage": percentage
+                    }
+            except Exception as e:
+                logger.debug(f"String manipulation failed: {e}")
+
+            if strict:
+                raise ValueError(f"Unparseable judgment: {response[:100]}")
             return {
                 "camp_id": camp_ids[0],  # Default to first camp
-                "reason": f"판결 도출 중 오류가 발생했습니다: {str(e)}",
+                "reason": "판결을 파싱할 수 없습니다.",
                 "percentage": [{"camp_id": str(cid), "percentage": 100 // len(camps) + (100 % len(camps) if i == 0 else 0)} 
-                             for i, cid in enumerate(camp_ids)]
+                             for i, cid in enumerate(camp_ids)],
+                "failed": True
             }
-        
-
-        
-    
\ No newline at end of file
@@ -0,0 +1,132 @@
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, Any, Optional, Tuple, List
+
+
+class BudgetExceeded(Exception):
+    """
+    토큰/비용 예산을 모두 사용한 뒤 LLM 호출을 시도한 경우
+    """
+    pass
+
+
+class SpendBudget:
+    """
+    토큰 수 / 예상 비용(USD) 예산 (None이면 해당 항목은 제한 없음)
+
+    LLM 클라이언트가 호출 전 check_budget()으로 확인하고, 호출 후 사용량을 charge합니다.
+    요청이 이미 시작된 호출은 중단하지 않으므로 마지막 호출만큼 예산을 넘을 수 있습니다.
+    """
+    def __init__(self, max_tokens: Optional[int] = None, max_cost_usd: Optional[float] = None, name: str = "request"):
+        self.name = name
+        self.max_tokens = max_tokens
+        self.max_cost_usd = max_cost_usd
+        self.spent_tokens = 0
+        self.spent_cost_usd = 0.0
+        # to_thread로 실행되는 동기 호출에서도 기록되므로 잠금 사용
+        self._lock = threading.Lock()
+
+    def charge(self, tokens: int, cost_usd: float):
+        with self._lock:
+            self.spent_tokens += tokens
+            self.spent_cost_usd += cost_usd
+
+    def remaining_fraction(self) -> float:
+        """
+        남은 예산 비율 (토큰/비용 중 더 적게 남은 쪽, 제한이 없으면 1.0)
+        """
+        fractions = [1.0]
+        if self.max_tokens is not None:
+            fractions.append(1 - self.spent_tokens / self.max_tokens if self.max_tokens else 0.0)
+        if self.max_cost_usd is not None:
+            fractions.append(1 - self.spent_cost_usd / self.max_cost_usd if self.max_cost_usd else 0.0)
+        return max(0.0, min(fractions))
+
+    @property
+    def exhausted(self) -> bool:
+        return self.remaining_fraction() <= 0
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "max_tokens": self.max_tokens,
+            "max_cost_usd": self.max_cost_usd,
+            "spent_tokens": self.spent_tokens,
+            "spent_cost_usd": round(self.spent_cost_usd, 6),
+            "exhausted": self.exhausted
+        }
+
+
+class TenantBudgets:
+    """
+    테넌트별 누적 예산 (window_seconds마다 초기화, 프로세스 메모리에 보관)
+
+    limits에 없는 테넌트는 default_limits를 사용하고, default_limits도 없으면 제한하지 않습니다.
+    """
+    def __init__(self, limits: Optional[Dict[str, Tuple[Optional[int], Optional[float]]]] = None,
+                 default_limits: Optional[Tuple[Optional[int], Optional[float]]] = None,
+                 window_seconds: float = 86400):
+        """
+        Args:
+            limits: {테넌트: (최대 토큰 수, 최대 비용 USD)}
+            default_limits: 그 외 테넌트의 (최대 토큰 수, 최대 비용 USD)
+            window_seconds: 누적 사용량 초기화 주기
+        """
+        self.limits = dict(limits or {})
+        self.default_limits = default_limits
+        self.window_seconds = window_seconds
+        self._budgets: Dict[str, Tuple[float, SpendBudget]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, tenant: str) -> Optional[SpendBudget]:
+        limits = self.limits.get(tenant, self.default_limits)
+        if limits is None:
+            return None
+        now = time.monotonic()
+        with self._lock:
+            entry = self._budgets.get(tenant)
+            if entry is None or now - entry[0] >= self.window_seconds:
+                entry = (now, SpendBudget(limits[0], limits[1], name=f"tenant:{tenant}"))
+                self._budgets[tenant] = entry
+            return entry[1]
+
+
+_current_budgets: ContextVar[Tuple[SpendBudget, ...]] = ContextVar("oracle_spend_budgets", default=())
+
+
+@contextmanager
+def activate_budgets(*budgets: Optional[SpendBudget]):
+    """
+    블록 안(자식 task, to_thread 포함)의 LLM 호출에 예산 적용
+    """
+    token = _current_budgets.set(_current_budgets.get() + tuple(budget for budget in budgets if budget is not None))
+    try:
+        yield
+    finally:
+        _current_budgets.reset(token)
+
+
+def active_budgets() -> List[SpendBudget]:
+    return list(_current_budgets.get())
+
+
+def check_budget():
+    """
+    LLM 클라이언트에서 호출 전에 확인: 적용 중인 예산 중 하나라도 소진되었으면 BudgetExceeded
+    """
+    for budget in _current_budgets.get():
+        if budget.exhausted:
+            raise BudgetExceeded(f"{budget.name} budget exhausted")
+
+
+def budget_allows(reserve_fraction: float = 0.0) -> bool:
+    """
+    적용 중인 모든 예산이 reserve_fraction보다 많이 남아 있는지 (선택 단계 실행 여부 판단)
+    """
+    return all(budget.remaining_fraction() > reserve_fraction for budget in _current_budgets.get())
+
+
+def charge_budgets(tokens: int, cost_usd: float):
+    for budget in _current_budgets.get():
+        budget.charge(tokens, cost_usd)
@@ -1,27 +1,33 @@
 import asyncio
-from typing import List, Dict, Any
+import logging
+from typing import List, Any
+from ..prompt_registry import PromptVersion
 import aiohttp
 from openai import AsyncOpenAI
 from ..llm_clients.openai_client import OpenAIClient
 import yaml
+from ..tracing import stage
+from ..budget import BudgetExceeded
+
+logger = logging.getLogger(__name__)
 
 class CredibilityChecker:
     def __init__(self, openai_client: OpenAIClient):
         self.client = openai_client
 
-    async def get_factual_info(self, topic_title: str, opinions: List[str], prompt_yaml: Dict) -> List[str]:
+    async def get_factual_info(self, topic_title: str, opinions: List[str], prompt_yaml: PromptVersion) -> List[str]:
         """
         Get factual information for all opinions using web search
         """
         try:
             # Create tasks for all web searches with topic context using prompt template
             system_prompt = prompt_yaml['web_search']['system']
-            user_prompt = prompt_yaml['web_search']['user']
             cors = [
                 self.client.web_search_mini_chat(
                     messages=[
                         {"role": "system", "content": system_prompt},
-                        {"role": "user", "content": user_prompt.format(
+                        {"role": "user", "content": prompt_yaml.render(
+                            'web_search', 'user',
                             topic_title=topic_title,
                             opinion=opinion
                         )}
@@ -32,28 +38,30 @@ class CredibilityChecker:
             # Run all web searches concurrently
             factual_info = await asyncio.gather(*cors)
             for info in factual_info:
-                print(info)
+                logger.debug(info)
             return factual_info
             
+        except BudgetExceeded:
+            raise
         except Exception as e:
-            print(f"Error gathering factual information: {e}")
+            logger.warning(f"Error gathering factual information: {e}")
             return []
 
-    async def get_credibility_score(self, topic_title: str, factual_info: List[str], opinions: List[str], prompt_yaml: Dict) -> List[str]:
+    async def get_credibility_score(self, topic_title: str, factual_info: List[str], opinions: List[str], prompt_yaml: PromptVersion) -> List[str]:
         """
         Process each opinion-fact pair and return formatted strings with credibility scores
         """
         try:
             # Get prompt templates
             system_prompt = prompt_yaml['credibility_scoring']['system']
-            user_prompt = prompt_yaml['credibility_scoring']['user']
             
             # Create tasks for all credibility scoring requests
             cors = []
             for info, opinion in zip(factual_info, opinions):
                 messages = [
                     {"role": "system", "content": system_prompt},
-                    {"role": "user", "content": user_prompt.format(
+                    {"role": "user", "content": prompt_yaml.render(
+                        'credibility_scoring', 'user',
                         topic_title=topic_title,
                         opinion=opinion,
                         factual_info=info
@@ -63,7 +71,7 @@ class CredibilityChecker:
             
             # Run all scoring requests concurrently
             scores = await asyncio.gather(*cors)
-            print(scores)
+            logger.debug(scores)
             # Process responses and format results
             scored_opinions = []
             for score_text, opinion in zip(scores, opinions):
@@ -78,11 +86,13 @@ class CredibilityChecker:
             
             return scored_opinions
             
+        except BudgetExceeded:
+            raise
         except Exception as e:
-            print(f"Error getting credibility scores: {e}")
+            logger.warning(f"Error getting credibility scores: {e}")
             return [f"{op} (scoring failed)" for op in opinions]
 
-    async def check_credibility(self, topic_title: str, opinions: List[str], prompt_yaml: Dict) -> List[str]:
+    async def check_credibility(self, topic_title: str, opinions: List[str], prompt_yaml: PromptVersion) -> List[str]:
         """
         Main function to process opinions and return scored results
         """
@@ -91,10 +101,12 @@ class CredibilityChecker:
             return []
         
         # First get factual information for all opinions
-        factual_info = await self.get_factual_info(topic_title, opinions, prompt_yaml)
+        with stage("web_search"):
+            factual_info = await self.get_factual_info(topic_title, opinions, prompt_yaml)
         
         if not factual_info:
             return [f"{op} (fact-checking failed)" for op in opinions]
         
         # Then get credibility scores and format results
-        return await self.get_credibility_score(topic_title, factual_info, opinions, prompt_yaml)
+        with stage("scoring"):
+            return await self.get_credibility_score(topic_title, factual_info, opinions, prompt_yaml)
@@ -1,9 +1,15 @@
 import asyncio
-from typing import List, Dict, Any
+import logging
+from typing import List, Any
+from ..prompt_registry import PromptVersion
 import aiohttp
 from openai import AsyncOpenAI
 from ..llm_clients.openai_client import OpenAIClient
 import yaml
+from ..tracing import stage
+from ..budget import BudgetExceeded
+
+logger = logging.getLogger(__name__)
 
 class CredibilityCheckerBatch:
     def __init__(self, openai_client: OpenAIClient, batch_size: int = 5):
@@ -21,14 +27,13 @@ class CredibilityCheckerBatch:
         """Helper function to split a list into chunks of specified size"""
         return [lst[i:i + chunk_size] for i in range(0, len(lst), chunk_size)]
 
-    async def get_factual_info_batch(self, topic_title: str, opinions_batch: List[str], prompt_yaml: Dict) -> str:
+    async def get_factual_info_batch(self, topic_title: str, opinions_batch: List[str], prompt_yaml: PromptVersion) -> str:
         """
         Get factual information for a batch of opinions using a single web search
         """
         try:
             # Create a combined prompt for all opinions in the batch
             system_prompt = prompt_yaml['web_search']['system']
-            user_prompt = prompt_yaml['web_search']['user']
             
             # Combine all opinions into a single query
             combined_opinions = "\n".join([f"Opinion {i+1}: {opinion}" for i, opinion in enumerate(opinions_batch)])
@@ -36,28 +41,30 @@ class CredibilityCheckerBatch:
             # Make a single web search call for the batch
             messages = [
                 {"role": "system", "content": system_prompt},
-                {"role": "user", "content": user_prompt.format(
+                {"role": "user", "content": prompt_yaml.render(
+                    'web_search', 'user',
                     topic_title=topic_title,
                     opinion=combined_opinions  # Pass all opinions as one string
                 )}
             ]
             
             factual_info = await self.client.web_search_mini_chat(messages=messages)
-            print(f"Batch factual info: {factual_info}")
+            logger.debug(f"Batch factual info: {factual_info}")
             return factual_info
             
+        except BudgetExceeded:
+            raise
         except Exception as e:
-            print(f"Error gathering factual information for batch: {e}")
+            logger.warning(f"Error gathering factual information for batch: {e}")
             return ""
 
-    async def get_credibility_scores_batch(self, topic_title: str, factual_info: str, opinions: List[str], prompt_yaml: Dict) -> List[str]:
+    async def get_credibility_scores_batch(self, topic_title: str, factual_info: str, opinions: List[str], prompt_yaml: PromptVersion) -> List[str]:
         """
         Process all opinions in the batch against the factual info in a single LLM call
         """
         try:
             # Get prompt templates
             system_prompt = prompt_yaml['credibility_scoring']['system']
-            user_prompt = prompt_yaml['credibility_scoring']['user']
             
             # Combine all opinions into numbered list
             combined_opinions = "\n".join([f"{i+1}. {opinion}" for i, opinion in enumerate(opinions)])
@@ -65,7 +72,8 @@ class CredibilityCheckerBatch:
             # Make a single LLM call for all opinions
             messages = [
                 {"role": "system", "content": system_prompt},
-                {"role": "user", "content": user_prompt.format(
+                {"role": "user", "content": prompt_yaml.render(
+                    'credibility_scoring', 'user',
                     topic_title=topic_title,
                     opinion=combined_opinions,
                     factual_info=factual_info
@@ -74,7 +82,7 @@ class CredibilityCheckerBatch:
             
             # Get scores for all opinions in one call
             response = await self.client.chat_async(messages=messages)
-            print(f"Batch scoring response: {response}")
+            logger.debug(f"Batch scoring response: {response}")
             
             try:
                 # Clean up response if it's wrapped in markdown code block
@@ -104,15 +112,17 @@ class CredibilityCheckerBatch:
                 return scored_opinions
                 
             except (json.JSONDecodeError, KeyError, TypeError) as e:
-                print(f"Error parsing scoring response: {e}")
-                print(f"Cleaned response was: {cleaned_response}")
+                logger.warning(f"Error parsing scoring response: {e}")
+                logger.debug(f"Cleaned response was: {cleaned_response}")
                 return [f"{op} (scoring failed - invalid response format)" for op in opinions]
             
+        except BudgetExceeded:
+            raise
         except Exception as e:
-            print(f"Error getting credibility scores for batch: {e}")
+            logger.warning(f"Error getting credibility scores for batch: {e}")
             return [f"{op} (scoring failed)" for op in opinions]
 
-    async def check_credibility(self, topic_title: str, opinions: List[str], prompt_yaml: Dict) -> List[str]:
+    async def check_credibility(self, topic_title: str, opinions: List[str], prompt_yaml: PromptVersion) -> List[str]:
         """
         Main function to process opinions in batches and return scored results
         """
@@ -127,14 +137,16 @@ class CredibilityCheckerBatch:
         # Process each batch
         for batch in opinion_batches:
             # Get factual information for the batch
-            factual_info = await self.get_factual_info_batch(topic_title, batch, prompt_yaml)
+            with stage("web_search"):
+                factual_info = await self.get_factual_info_batch(topic_title, batch, prompt_yaml)
             
             if not factual_info:
                 all_scored_opinions.extend([f"{op} (fact-checking failed)" for op in batch])
                 continue
             
             # Get credibility scores for the batch
-            scored_batch = await self.get_credibility_scores_batch(topic_title, factual_info, batch, prompt_yaml)
+            with stage("scoring"):
+                scored_batch = await self.get_credibility_scores_batch(topic_title, factual_info, batch, prompt_yaml)
             all_scored_opinions.extend(scored_batch)
         
         return all_scored_opinions
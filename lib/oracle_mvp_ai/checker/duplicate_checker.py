@@ -1,27 +1,96 @@
 import numpy as np
 from typing import List, Dict, Any, Optional, Tuple
 from ..llm_clients.openai_client import OpenAIClient
-import asyncio
+import logging
+
+logger = logging.getLogger(__name__)
+
+def cluster_embeddings(embeddings: np.ndarray, lengths: List[int], similarity_threshold: float = 0.8) -> List[List[int]]:
+    """
+    코사인 유사도로 매우 유사한 임베딩들을 묶음 (텍스트 없이 길이만 사용하므로 작업 프로세스에서도 실행 가능)
+
+    Args:
+        embeddings: 의견들의 임베딩 벡터
+        lengths: 의견별 텍스트 길이 (대표 의견 선택용)
+        similarity_threshold: 유사도 임계값
+
+    Returns:
+        묶음별 의견 인덱스 리스트 (각 묶음의 첫 번째 원소는 대표 의견 = 제일 긴 의견)
+    """
+    # 유사도 매트릭스
+    norms = np.linalg.norm(embeddings, axis=1)[:, np.newaxis]
+    normalized = embeddings / norms
+    similarities = np.dot(normalized, normalized.T)
+
+    used = np.zeros(len(lengths), dtype=bool)
+    clusters = []
+
+    for i in range(len(lengths)):
+        if used[i]:
+            continue
+
+        # i번째 의견과 유사한 의견 찾기 (아직 묶이지 않은 뒤쪽 의견만)
+        similar = np.flatnonzero((similarities[i, i + 1:] >= similarity_threshold) & ~used[i + 1:]) + i + 1
+        similar_indices = [i] + similar.tolist()
+
+        # 제일 긴 의견 기준으로 통합
+        representative_idx = max(similar_indices, key=lambda idx: lengths[idx])
+        clusters.append([representative_idx] + sorted(set(similar_indices) - {representative_idx}))
+
+        # 사용된 인덱스 기록
+        used[similar_indices] = True
+
+    return clusters
+
 
 class DuplicateChecker:
     def __init__(self, openai_client: OpenAIClient):
         self.openai_client = openai_client
 
-    async def create_embeddings(self, texts: List[str]) -> np.ndarray:
+    async def create_embeddings(self, texts: List[str], cache: Optional[Dict[str, Any]] = None) -> np.ndarray:
         """
         OpenAI API를 사용하여 텍스트 임베딩 생성
+
+        Args:
+            texts: 임베딩을 생성할 텍스트 리스트
+            cache: {텍스트: 임베딩} 딕셔너리. 여기에 있는 텍스트는 다시 요청하지 않고,
+                   새로 만든 임베딩은 여기에 추가됨 (여러 주제에 걸쳐 공유 가능)
         """
         try:
-            # Create tasks for all embedding requests
-            cors = [self.openai_client.create_embedding_async(text) for text in texts]
-            
-            # Run all embedding requests concurrently
-            embeddings = await asyncio.gather(*cors)
-            return np.array(embeddings)
+            if cache is None:
+                cache = {}
+            # 중복 텍스트와 이미 임베딩이 있는 텍스트는 제외하고 배치 요청
+            missing = list(dict.fromkeys(text for text in texts if text not in cache))
+            if missing:
+                embeddings = await self.openai_client.create_embeddings_async(missing)
+                cache.update(zip(missing, embeddings))
+            return np.array([cache[text] for text in texts])
         except Exception as e:
-            print(f"임베딩 생성 중 오류 발생: {e}")
+            logger.error(f"임베딩 생성 중 오류 발생: {e}")
             raise e
     
+    def _cluster_opinions(
+        self,
+        opinions: List[str],
+        embeddings: np.ndarray,
+        similarity_threshold: float = 0.8
+    ) -> List[List[int]]:
+        """
+        코사인 유사도로 매우 유사한 의견들을 묶음
+
+        Args:
+            opinions: 원본 의견 목록
+            embeddings: 의견들의 임베딩 벡터
+            similarity_threshold: 유사도 임계값
+
+        Returns:
+            묶음별 의견 인덱스 리스트 (각 묶음의 첫 번째 원소는 대표 의견 = 제일 긴 의견)
+        """
+        # opinions 가 없을 경우
+        if not opinions or len(opinions) == 0:
+            return []
+        return cluster_embeddings(embeddings, [len(opinion) for opinion in opinions], similarity_threshold)
+
     def _deduplicate_opinions(
         self, 
         opinions: List[str], 
@@ -43,33 +112,73 @@ class DuplicateChecker:
         if not opinions or len(opinions) == 0:
             return [], np.array([]), {}
 
-        # 유사도 매트릭스
-        norms = np.linalg.norm(embeddings, axis=1)[:, np.newaxis]
-        normalized = embeddings / norms
-        similarities = np.dot(normalized, normalized.T)
-        
-        used_indices = set()
-        deduped_opinions = []
-        deduped_embeddings = []
-        opinion_counts = {}
-        
-        for i in range(len(opinions)):
-            if i in used_indices:
-                continue
-                
-            # i번째 의견과 유사한 의견 찾기
-            similar_indices = set([i])
-            for j in range(i + 1, len(opinions)):
-                if j not in used_indices and similarities[i, j] >= similarity_threshold:
-                    similar_indices.add(j)
-            
-            # 제일 긴 의견 기준으로 통합
-            representative_idx = max(similar_indices, key=lambda idx: len(opinions[idx]))
-            deduped_opinions.append(opinions[representative_idx])
-            deduped_embeddings.append(embeddings[representative_idx])
-            opinion_counts[opinions[representative_idx]] = len(similar_indices)
-            
-            # 사용된 인덱스 기록
-            used_indices.update(similar_indices)
+        clusters = self._cluster_opinions(opinions, embeddings, similarity_threshold)
+        deduped_opinions = [opinions[cluster[0]] for cluster in clusters]
+        deduped_embeddings = [embeddings[cluster[0]] for cluster in clusters]
+        opinion_counts = {opinions[cluster[0]]: len(cluster) for cluster in clusters}
         
         return deduped_opinions, np.array(deduped_embeddings), opinion_counts
+
+
+class OnlineDeduplicator:
+    """
+    의견을 묶음 단위로 받아 바로 통합하는 중복 제거 (스트리밍 데이터셋용)
+
+    원본 의견은 보관하지 않고 묶음별 기준 임베딩, 대표 의견(제일 긴 의견)과 그 임베딩,
+    진영별 지지 수만 보관하므로 메모리 사용량은 의견 수가 아닌 묶음 수에 비례합니다.
+    새 의견은 기존 묶음의 기준 임베딩(첫 의견)과 비교하여 similarity_threshold 이상이면 그 묶음에 합칩니다.
+    """
+    def __init__(self, similarity_threshold: float = 0.8):
+        self.similarity_threshold = similarity_threshold
+        self._anchors: Optional[np.ndarray] = None
+        self._size = 0
+        self.representatives: List[str] = []
+        self.embeddings: List[np.ndarray] = []
+        self.support: List[Dict[str, int]] = []
+        self.seen = 0
+
+    def _append_anchor(self, vector: np.ndarray):
+        if self._anchors is None:
+            self._anchors = np.empty((16, vector.shape[0]), dtype=vector.dtype)
+        elif self._size == self._anchors.shape[0]:
+            # 용량을 두 배로 늘려 추가 비용을 상각
+            self._anchors = np.concatenate([self._anchors, np.empty_like(self._anchors)])
+        self._anchors[self._size] = vector
+        self._size += 1
+
+    def add(self, texts: List[str], camp_ids: List[str], embeddings: np.ndarray):
+        """
+        의견 묶음 추가
+
+        Args:
+            texts: 의견 리스트
+            camp_ids: 의견별 캠프 아이디 (없으면 "")
+            embeddings: 의견별 임베딩
+        """
+        if not texts:
+            return
+        embeddings = np.asarray(embeddings, dtype=np.float32)
+        norms = np.linalg.norm(embeddings, axis=1, keepdims=True)
+        normalized = embeddings / np.where(norms == 0, 1, norms)
+        for text, camp_id, vector, embedding in zip(texts, camp_ids, normalized, embeddings):
+            self.seen += 1
+            index = -1
+            if self._size:
+                similarities = self._anchors[:self._size] @ vector
+                best = int(np.argmax(similarities))
+                if similarities[best] >= self.similarity_threshold:
+                    index = best
+            if index < 0:
+                self._append_anchor(vector)
+                self.representatives.append(text)
+                self.embeddings.append(embedding)
+                self.support.append({})
+                index = self._size - 1
+            elif len(text) > len(self.representatives[index]):
+                self.representatives[index] = text
+                self.embeddings[index] = embedding
+            support = self.support[index]
+            support[camp_id] = support.get(camp_id, 0) + 1
+
+    def __len__(self) -> int:
+        return self._size
@@ -0,0 +1,109 @@
+import asyncio
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from .checker.duplicate_checker import cluster_embeddings
+from . import metrics
+
+
+def _attach(name: str) -> shared_memory.SharedMemory:
+    # 만든 쪽(부모 프로세스)이 해제하므로 작업 프로세스에서는 resource tracker에 등록하지 않음 (Python 3.13+)
+    try:
+        return shared_memory.SharedMemory(name=name, track=False)
+    except TypeError:
+        return shared_memory.SharedMemory(name=name)
+
+
+def _cluster_shared(name: str, shape: Tuple[int, ...], dtype: str, lengths: List[int],
+                    similarity_threshold: float) -> List[List[int]]:
+    """
+    공유 메모리의 임베딩 행렬로 의견 묶기 (작업 프로세스에서 실행)
+    """
+    shm = _attach(name)
+    try:
+        embeddings = np.ndarray(shape, dtype=dtype, buffer=shm.buf)
+        clusters = cluster_embeddings(embeddings, lengths, similarity_threshold)
+        del embeddings
+        return clusters
+    finally:
+        shm.close()
+
+
+def _ping() -> int:
+    return os.getpid()
+
+
+class CpuPool:
+    """
+    CPU 작업(중복 의견 묶기, 일관성 지표 계산)을 작업 프로세스에서 실행
+
+    async 엔드포인트에서 이벤트 루프를 막지 않도록 계산을 프로세스 풀로 보냅니다.
+    임베딩 행렬은 pickle로 복사하지 않고 공유 메모리로 전달합니다.
+    workers가 0이면 프로세스 풀 없이 스레드에서 실행합니다 (GIL을 잡는 계산은 다른 요청과 번갈아 실행됨).
+    작업 프로세스는 spawn으로 시작하며 첫 작업(또는 start()) 때 만들어집니다.
+    """
+    def __init__(self, workers: Optional[int] = None):
+        self.workers = (os.cpu_count() or 1) if workers is None else workers
+        self._executor: Optional[ProcessPoolExecutor] = None
+
+    def _get_executor(self) -> Optional[ProcessPoolExecutor]:
+        if self.workers <= 0:
+            return None
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(self.workers, mp_context=multiprocessing.get_context("spawn"))
+        return self._executor
+
+    async def run(self, fn: Callable[..., Any], *args) -> Any:
+        """
+        fn(*args)를 작업 프로세스에서 실행 (fn과 인자, 반환값은 pickle 가능해야 함)
+        """
+        executor = self._get_executor()
+        if executor is None:
+            return await asyncio.to_thread(fn, *args)
+        return await asyncio.get_running_loop().run_in_executor(executor, fn, *args)
+
+    async def start(self):
+        """
+        작업 프로세스를 미리 모두 띄움 (warm-up용, 첫 요청이 프로세스 시작/모듈 import 비용을 내지 않도록)
+        """
+        executor = self._get_executor()
+        if executor is not None:
+            loop = asyncio.get_running_loop()
+            await asyncio.gather(*[loop.run_in_executor(executor, _ping) for _ in range(self.workers)])
+
+    async def cluster_opinions(self, opinions: List[str], embeddings: np.ndarray,
+                               similarity_threshold: float = 0.8) -> List[List[int]]:
+        """
+        DuplicateChecker._cluster_opinions와 같은 결과 (임베딩은 공유 메모리로 전달)
+        """
+        if not opinions:
+            return []
+        lengths = [len(opinion) for opinion in opinions]
+        embeddings = np.ascontiguousarray(embeddings)
+        if self._get_executor() is None or embeddings.nbytes == 0:
+            return await asyncio.to_thread(cluster_embeddings, embeddings, lengths, similarity_threshold)
+        shm = shared_memory.SharedMemory(create=True, size=embeddings.nbytes)
+        try:
+            np.ndarray(embeddings.shape, dtype=embeddings.dtype, buffer=shm.buf)[:] = embeddings
+            return await self.run(
+                _cluster_shared, shm.name, embeddings.shape, embeddings.dtype.str, lengths, similarity_threshold
+            )
+        finally:
+            shm.close()
+            shm.unlink()
+
+    async def consistency_metrics(self, results: List[Dict]) -> Dict:
+        """
+        metrics.calculate_consistency_metrics (CountVectorizer, 쌍별 유사도 계산)를 작업 프로세스에서 실행
+        """
+        return await self.run(metrics.calculate_consistency_metrics, results)
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
@@ -0,0 +1,109 @@
+import dataclasses
+from dataclasses import dataclass
+from typing import Dict, Any, Optional, Tuple
+from .profiles import JUDGE_PROFILES
+from .llm_clients.limiter import LLM_PRIORITIES
+
+
+FINAL_JUDGEMENT_PROVIDERS = ("openai", "google", "anthropic", "ensemble")
+
+# 배치 신뢰도 검사용 프롬프트 (나머지 프롬프트는 의견 단위 검사용)
+BATCH_PROMPT_FILES = ("v_2_1_1.yaml",)
+
+
+@dataclass(frozen=True)
+class JudgeConfig:
+    """
+    judge() 호출 단위 설정 (불변)
+
+    AiJudge 인스턴스에 옵션을 저장하지 않고 호출마다 전달하므로,
+    하나의 AiJudge가 서로 다른 설정의 요청을 동시에 처리할 수 있습니다.
+    일부만 바꿀 때는 config.replace(...)를 사용합니다.
+    """
+    # 의견이 없을 경우 판결 방지 옵션
+    prevent_judgement_without_opinion: bool = False
+    output_judgement_percentage: bool = True
+    group_opinions_by_camp: bool = False
+    # 최종 판결 모델 선택 (openai, google, anthropic, ensemble)
+    final_judgement_provider: str = "openai"
+    # 앙상블 옵션 (final_judgement_provider가 ensemble일 때 사용)
+    ensemble_providers: Tuple[str, ...] = ("openai", "google", "anthropic")
+    # 같은 진영에 이 수만큼 표가 모이면 나머지 모델 응답을 기다리지 않음 (None이면 전부 대기)
+    ensemble_quorum: Optional[int] = None
+    # 토론 옵션 (openai 사용)
+    judge_after_debate: bool = True
+    # self-consistency 샘플 수 (2 이상이면 토론 대신 한 번의 요청으로 k개 판결을 샘플링하여 다수결)
+    self_consistency_samples: int = 0
+    # 신뢰도 점수 배치 처리 옵션
+    batch_credibility_check: bool = True
+    # 실행 프로필 (fast, standard, thorough / None이면 제한 시간 없음)
+    profile: Optional[str] = None
+    # 프롬프트 파일 (None이면 batch_credibility_check에 따라 자동 선택)
+    prompt_file: Optional[str] = None
+    # 주제 스냅샷 사용 여부 (AiJudge에 snapshot_store가 있을 때만 적용)
+    use_snapshot: bool = True
+    # 판결 결과 캐시 사용 여부 (AiJudge에 result_cache가 있을 때만 적용, 일관성 측정 시 False)
+    use_cache: bool = True
+    # 중복 제거 묶음마다 지지 수와 진영별 분포를 붙여 한 줄로 전달
+    weight_opinions_by_support: bool = False
+    # 최종 판결에 넣을 최대 묶음 수 (weight_opinions_by_support일 때, 진영별 지지 수 비율대로 선택)
+    max_opinion_clusters: Optional[int] = None
+    # 최종 판결에 넣을 의견의 최대 토큰 수 (넘으면 진영별 계층 요약, None이면 요약하지 않음)
+    opinion_token_budget: Optional[int] = None
+    # 한 번의 요약 요청에 넣을 최대 토큰 수
+    summary_chunk_tokens: int = 3000
+    # 요청 단위 토큰/비용(USD) 예산 (None이면 제한 없음)
+    max_total_tokens: Optional[int] = None
+    max_cost_usd: Optional[float] = None
+    # 누적 예산을 적용할 테넌트 (AiJudge에 tenant_budgets가 있을 때만 적용)
+    tenant: Optional[str] = None
+    # 남은 예산 비율이 이 값 이하이면 웹 검색/요약/토론 등 선택 단계를 생략하고 최종 판결에 사용
+    budget_reserve_fraction: float = 0.25
+    # LLM 호출 우선순위 ("interactive" 또는 "bulk", 클라이언트 limiter에 자리가 없을 때 interactive를 먼저 실행)
+    priority: str = "interactive"
+
+    def __post_init__(self):
+        if self.final_judgement_provider not in FINAL_JUDGEMENT_PROVIDERS:
+            raise ValueError(f"Unsupported provider: {self.final_judgement_provider}")
+        for provider in self.ensemble_providers:
+            if provider not in FINAL_JUDGEMENT_PROVIDERS or provider == "ensemble":
+                raise ValueError(f"Unsupported ensemble provider: {provider}")
+        if self.profile is not None and self.profile not in JUDGE_PROFILES:
+            raise ValueError(f"Unknown judge profile: {self.profile}")
+        if self.opinion_token_budget is not None and self.opinion_token_budget <= 0:
+            raise ValueError("opinion_token_budget must be positive")
+        if self.max_opinion_clusters is not None and self.max_opinion_clusters <= 0:
+            raise ValueError("max_opinion_clusters must be positive")
+        if self.max_total_tokens is not None and self.max_total_tokens < 0:
+            raise ValueError("max_total_tokens must not be negative")
+        if self.max_cost_usd is not None and self.max_cost_usd < 0:
+            raise ValueError("max_cost_usd must not be negative")
+        if not 0 <= self.budget_reserve_fraction < 1:
+            raise ValueError("budget_reserve_fraction must be in [0, 1)")
+        if self.priority not in LLM_PRIORITIES:
+            raise ValueError(f"priority must be one of {LLM_PRIORITIES}")
+        if self.summary_chunk_tokens <= 0:
+            raise ValueError("summary_chunk_tokens must be positive")
+        # 리스트로 전달되어도 불변 튜플로 보관
+        object.__setattr__(self, "ensemble_providers", tuple(self.ensemble_providers))
+
+    def replace(self, **changes: Any) -> "JudgeConfig":
+        """
+        일부 옵션만 바꾼 새 설정 반환
+        """
+        return dataclasses.replace(self, **changes)
+
+    @classmethod
+    def from_dict(cls, data: Optional[Dict[str, Any]]) -> "JudgeConfig":
+        """
+        dict(API 요청 등)에서 설정 생성 (알 수 없는 키는 ValueError)
+        """
+        data = data or {}
+        field_names = {field.name for field in dataclasses.fields(cls)}
+        unknown = set(data) - field_names
+        if unknown:
+            raise ValueError(f"Unknown config options: {', '.join(sorted(unknown))}")
+        return cls(**data)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return dataclasses.asdict(self)
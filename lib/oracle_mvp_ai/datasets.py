@@ -0,0 +1,224 @@
+import argparse
+import json
+import re
+from typing import Dict, Any, Iterator, List, Tuple, IO
+
+
+# JSONL 데이터셋 형식
+# 첫 줄: 주제 정보 (posts 제외) {"topic": {"_id", "title", "description", "camps": [...]}}
+# 둘째 줄부터: 의견 하나씩 {"user_id", "camp_id", "msg"}
+JSONL_EXTENSION = ".jsonl"
+
+
+# 아이디는 _process_input_data가 문자열로만 읽으므로 형식을 제한하지 않음
+# (ObjectId 형식은 playground에서 판결할 때 ObjectId로 감싸는 단계에서 확인)
+_ID = {"type": "string"}
+
+# AiJudge._process_input_data가 읽는 입력 형식의 JSON schema
+# (title 외의 주제 필드와 의견 목록은 없으면 빈 값으로 처리되므로 필수가 아님)
+DATASET_SCHEMA = {
+    "$schema": "https://json-schema.org/draft/2020-12/schema",
+    "title": "AiJudge dataset",
+    "type": "object",
+    "required": ["topic"],
+    "properties": {
+        "topic": {
+            "type": "object",
+            "required": ["_id", "title", "camps"],
+            "properties": {
+                "_id": _ID,
+                "title": {"type": "string"},
+                "description": {"type": "string"},
+                "camps": {
+                    "type": "array",
+                    "items": {
+                        "type": "object",
+                        "required": ["id", "name"],
+                        "properties": {"id": _ID, "name": {"type": "string"}}
+                    }
+                },
+                "posts": {
+                    "type": "array",
+                    "items": {
+                        "type": "object",
+                        "required": ["msg"],
+                        "properties": {
+                            "user_id": _ID,
+                            "camp_id": _ID,
+                            "topic_id": _ID,
+                            "msg": {"type": "string"}
+                        }
+                    }
+                }
+            }
+        }
+    }
+}
+
+_JSON_TYPES = {
+    "object": dict, "array": list, "string": str, "number": (int, float), "integer": int, "boolean": bool
+}
+
+
+def _validate(value: Any, schema: Dict[str, Any], pointer: str, errors: List[str], max_errors: int):
+    if len(errors) >= max_errors:
+        return
+    expected = schema.get("type")
+    if expected is not None:
+        python_type = _JSON_TYPES[expected]
+        if not isinstance(value, python_type) or (expected != "boolean" and isinstance(value, bool)):
+            errors.append(f"{pointer or '/'}: expected {expected}, got {type(value).__name__}")
+            return
+    if "pattern" in schema and not re.search(schema["pattern"], value):
+        errors.append(f"{pointer}: {value!r} does not match {schema['pattern']}")
+    if isinstance(value, dict):
+        for key in schema.get("required", []):
+            if key not in value:
+                errors.append(f"{pointer or '/'}: missing required field {key!r}")
+        for key, subschema in schema.get("properties", {}).items():
+            if key in value:
+                _validate(value[key], subschema, f"{pointer}/{key}", errors, max_errors)
+    elif isinstance(value, list) and "items" in schema:
+        for i, item in enumerate(value):
+            _validate(item, schema["items"], f"{pointer}/{i}", errors, max_errors)
+
+
+def validate_dataset(data: Any, max_errors: int = 20) -> List[str]:
+    """
+    DATASET_SCHEMA 기준으로 데이터셋 검사
+
+    jsonschema 패키지 없이 type, required, properties, items, pattern 키워드만 지원합니다.
+
+    Returns:
+        오류 메시지 리스트 ("JSON pointer: 내용", 최대 max_errors개, 비어 있으면 통과)
+    """
+    errors: List[str] = []
+    _validate(data, DATASET_SCHEMA, "", errors, max_errors)
+    return errors
+
+
+def schema_signature(data: Any) -> Tuple[str, ...]:
+    """
+    같은 버전 폴더의 데이터셋끼리 비교할 키 구조 (최상위 키, 리스트면 첫 항목의 키)
+    """
+    if isinstance(data, list):
+        data = data[0] if data else {}
+    return tuple(sorted(data)) if isinstance(data, dict) else ()
+
+
+class DatasetFormatError(ValueError):
+    """
+    JSONL 데이터셋의 형식이 잘못된 경우 (줄 번호 포함)
+    """
+    pass
+
+
+def _parse_line(line: str, line_number: int) -> Dict[str, Any]:
+    try:
+        record = json.loads(line)
+    except ValueError as e:
+        raise DatasetFormatError(f"line {line_number}: invalid JSON ({e})")
+    if not isinstance(record, dict):
+        raise DatasetFormatError(f"line {line_number}: expected a JSON object")
+    return record
+
+
+def read_jsonl_header(f: IO[str]) -> Dict[str, Any]:
+    """
+    파일의 첫 레코드(주제 정보)를 읽어 반환 (파일 위치는 첫 의견 앞으로 이동)
+    """
+    for line_number, line in enumerate(f, start=1):
+        if not line.strip():
+            continue
+        record = _parse_line(line, line_number)
+        topic = record.get("topic")
+        if not isinstance(topic, dict):
+            raise DatasetFormatError(f"line {line_number}: first record must be {{\"topic\": {{...}}}}")
+        if "posts" in topic:
+            raise DatasetFormatError(f"line {line_number}: posts must be written one per line, not in the header")
+        return topic
+    raise DatasetFormatError("empty dataset")
+
+
+def iter_jsonl_posts(f: IO[str]) -> Iterator[Dict[str, Any]]:
+    """
+    헤더 다음의 의견을 한 줄씩 반환 (read_jsonl_header 다음에 호출)
+    """
+    for line_number, line in enumerate(f, start=2):
+        if not line.strip():
+            continue
+        record = _parse_line(line, line_number)
+        if "msg" not in record:
+            raise DatasetFormatError(f"line {line_number}: post record must have \"msg\"")
+        yield record
+
+
+class JsonlPosts:
+    """
+    JSONL 데이터셋의 의견 iterator (한 줄씩 읽고, 모두 읽거나 close()하면 파일을 닫음)
+
+    with 문으로 사용하면 중간에 멈춰도 파일이 닫힙니다.
+    """
+    def __init__(self, f: IO[str]):
+        self._f = f
+        self._posts = iter_jsonl_posts(f)
+
+    def __iter__(self) -> "JsonlPosts":
+        return self
+
+    def __next__(self) -> Dict[str, Any]:
+        try:
+            return next(self._posts)
+        except BaseException:
+            self.close()
+            raise
+
+    def close(self):
+        self._f.close()
+
+    def __enter__(self) -> "JsonlPosts":
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def open_jsonl_dataset(path: str) -> Tuple[Dict[str, Any], JsonlPosts]:
+    """
+    JSONL 데이터셋을 (주제 정보, 의견 iterator)로 열기
+
+    의견은 iterator를 소비하는 동안 한 줄씩 읽습니다.
+    """
+    f = open(path, encoding="utf-8")
+    try:
+        header = read_jsonl_header(f)
+    except BaseException:
+        f.close()
+        raise
+    return header, JsonlPosts(f)
+
+
+def convert_json_to_jsonl(src: str, dst: str) -> int:
+    """
+    기존 JSON 데이터셋({"topic": {..., "posts": [...]}})을 JSONL 형식으로 변환
+
+    Returns:
+        변환한 의견 수
+    """
+    with open(src, encoding="utf-8") as f:
+        data = json.load(f)
+    topic = dict(data["topic"])
+    posts = topic.pop("posts", [])
+    with open(dst, "w", encoding="utf-8") as f:
+        f.write(json.dumps({"topic": topic}, ensure_ascii=False) + "\n")
+        for post in posts:
+            f.write(json.dumps(post, ensure_ascii=False) + "\n")
+    return len(posts)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="JSON 데이터셋을 스트리밍용 JSONL 형식으로 변환")
+    parser.add_argument("src", help="JSON 데이터셋 경로")
+    parser.add_argument("dst", help="저장할 JSONL 경로")
+    args = parser.parse_args()
+    print(f"{convert_json_to_jsonl(args.src, args.dst)} posts written to {args.dst}")
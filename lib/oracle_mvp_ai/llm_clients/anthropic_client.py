@@ -1,9 +1,28 @@
-from anthropic import Anthropic
-from typing import List, Dict
+from anthropic import Anthropic, AsyncAnthropic, DefaultHttpxClient, DefaultAsyncHttpxClient
+from typing import List, Dict, Optional
+from .limiter import RequestLimiter
+from .coalescer import RequestCoalescer, chat_coalescing_allowed
+from ..tracing import record_usage
+from ..budget import check_budget
+from ..telemetry import observe_llm_call, http_event_hooks, async_http_event_hooks
 
 class AnthropicClient:
-    def __init__(self, api_key: str):
-        self.client = Anthropic(api_key=api_key)
+    def __init__(self, api_key: str, max_concurrency: Optional[int] = None, requests_per_minute: Optional[float] = None):
+        # 429 응답 / SDK 재시도 횟수 집계용 http 훅
+        self.client = Anthropic(api_key=api_key, http_client=DefaultHttpxClient(event_hooks=http_event_hooks("anthropic")))
+        self.async_client = AsyncAnthropic(
+            api_key=api_key, http_client=DefaultAsyncHttpxClient(event_hooks=async_http_event_hooks("anthropic"))
+        )
+        # 비동기 요청 전체에 적용되는 동시 요청 수 / 분당 요청 수 제한
+        self.limiter = RequestLimiter(max_concurrency, requests_per_minute)
+        # 동시에 들어온 같은 요청은 한 번만 보냄 (temperature > 0인 호출은 제외)
+        self.coalescer = RequestCoalescer("anthropic")
+
+    async def warm_up(self):
+        """
+        연결 풀 준비 (모델 목록 조회로 TLS 연결을 미리 열어 둠, 토큰 사용 없음)
+        """
+        await self.async_client.models.list(limit=1)
 
     def chat(self, messages, model="claude-3-5-sonnet-20240620", temperature=0):
         """
@@ -13,18 +32,51 @@ class AnthropicClient:
             모델의 응답 내용
         """
         messages, system_prompt = self._convert_openai_messages_to_anthropic_messages(messages)
-        response = self.client.messages.create(
-            model=model,
-            messages=messages,
-            system=system_prompt,
-            temperature=temperature,
-            max_tokens= 8000# required
-        )
+        check_budget()
+        with observe_llm_call("anthropic", model):
+            response = self.client.messages.create(
+                model=model,
+                messages=messages,
+                system=system_prompt,
+                temperature=temperature,
+                max_tokens= 8000# required
+            )
+        record_usage(model, response.usage)
         #[{"type": "text", "text": "Hi, I'm Claude."}]
         for content_block in response.content:
             if content_block.type == "text":
                 return content_block.text
         return ""
+
+    async def chat_async(self, messages, model="claude-3-5-sonnet-20240620", temperature=0):
+        """
+        Anthropic Claude API 호출 (비동기 버전)
+
+        Returns:
+            모델의 응답 내용
+        """
+        messages, system_prompt = self._convert_openai_messages_to_anthropic_messages(messages)
+
+        async def call():
+            async with self.limiter:
+                check_budget()
+                with observe_llm_call("anthropic", model):
+                    response = await self.async_client.messages.create(
+                        model=model,
+                        messages=messages,
+                        system=system_prompt,
+                        temperature=temperature,
+                        max_tokens= 8000# required
+                    )
+            for content_block in response.content:
+                if content_block.type == "text":
+                    return content_block.text, response.usage
+            return "", response.usage
+
+        return await self.coalescer.run(
+            "chat", model, {"model": model, "messages": messages, "system": system_prompt, "temperature": temperature}, call,
+            coalesce=chat_coalescing_allowed(temperature)
+        )
     
     def _convert_openai_messages_to_anthropic_messages(self, messages) -> List[Dict]:
         """
@@ -0,0 +1,124 @@
+import asyncio
+import contextvars
+import hashlib
+import json
+import weakref
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Awaitable, Callable, Dict, Tuple
+from .limiter import current_priority, llm_priority
+from .. import telemetry
+from ..budget import check_budget
+from ..tracing import record_usage
+
+
+_independent_chat: ContextVar[bool] = ContextVar("oracle_independent_chat", default=False)
+
+
+@contextmanager
+def independent_chat_calls():
+    """
+    블록 안의 chat 호출은 합치지 않음 (일관성 측정처럼 같은 요청의 응답을 각각 받아야 할 때)
+
+    임베딩/웹 검색은 계속 합칩니다.
+    """
+    token = _independent_chat.set(True)
+    try:
+        yield
+    finally:
+        _independent_chat.reset(token)
+
+
+def chat_coalescing_allowed(temperature: float) -> bool:
+    """
+    chat 호출을 합쳐도 되는지 (temperature > 0은 샘플을 여러 개 받으려는 호출이므로 합치지 않음)
+    """
+    return temperature == 0 and not _independent_chat.get()
+
+
+def request_key(method: str, payload: Dict[str, Any]) -> str:
+    """
+    요청의 정규화된 해시 (메서드, 모델, 메시지, 옵션)
+    """
+    canonical = json.dumps({"method": method, **payload}, ensure_ascii=False, sort_keys=True,
+                           separators=(",", ":"), default=str)
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+class _Flight:
+    def __init__(self, task: asyncio.Task):
+        self.task = task
+        self.waiters = 0
+
+
+class RequestCoalescer:
+    """
+    진행 중인 같은 요청을 하나로 합침 (single-flight)
+
+    같은 요청이 끝나기 전에 다시 들어오면 새로 보내지 않고 진행 중인 요청의 결과를 함께 받습니다.
+    공유 요청은 어떤 호출의 context(trace, 예산)에도 속하지 않게 실행하고, 예산 확인과 사용량 기록(예산 차감, trace)은
+    기다리는 호출마다 각자의 context에서 합니다. 우선순위가 다른 호출은 합치지 않습니다.
+    합쳐진 호출 수는 oracle_llm_coalesced_total 메트릭에 기록합니다.
+    기다리는 호출이 모두 취소되면 요청도 취소하며, 요청의 예외는 기다리는 모든 호출에 전달됩니다.
+    반환값은 공유되므로 호출하는 쪽에서 수정하면 안 됩니다.
+    """
+    def __init__(self, provider: str):
+        self.provider = provider
+        # asyncio task는 이벤트 루프에 묶이므로 루프별로 관리
+        self._flights = weakref.WeakKeyDictionary()
+
+    def _loop_flights(self) -> Dict[str, _Flight]:
+        loop = asyncio.get_running_loop()
+        flights = self._flights.get(loop)
+        if flights is None:
+            flights = {}
+            self._flights[loop] = flights
+        return flights
+
+    async def run(self, method: str, model: str, payload: Dict[str, Any], call: Callable[[], Awaitable[Tuple[Any, Any]]],
+                  coalesce: bool = True) -> Any:
+        """
+        Args:
+            method: 요청 종류 (chat, embeddings, web_search 등, 메트릭 라벨)
+            model: 사용량 기록에 쓸 모델 이름
+            payload: 요청을 구분하는 값 (모델, 메시지, 옵션)
+            call: 실제 요청 코루틴 함수 ((반환값, 응답의 usage 객체) 반환)
+            coalesce: False이면 합치지 않고 바로 요청 (temperature > 0인 chat 등)
+        """
+        # 호출마다 자신의 예산으로 확인 (다른 테넌트의 예산 소진이 전달되지 않도록)
+        check_budget()
+        if coalesce:
+            value, usage = await self._join(method, payload, call)
+        else:
+            value, usage = await call()
+        record_usage(model, usage)
+        return value
+
+    async def _join(self, method: str, payload: Dict[str, Any], call: Callable[[], Awaitable[Tuple[Any, Any]]]) -> Tuple[Any, Any]:
+        flights = self._loop_flights()
+        priority = current_priority()
+        key = (priority, request_key(method, payload))
+        flight = flights.get(key)
+        if flight is not None:
+            telemetry.LLM_COALESCED.inc(provider=self.provider, method=method)
+        else:
+            async def isolated():
+                with llm_priority(priority):
+                    return await call()
+
+            # 빈 context에서 실행하여 처음 호출한 쪽의 trace/예산이 적용되지 않도록 함
+            flight = _Flight(contextvars.Context().run(asyncio.create_task, isolated()))
+            flights[key] = flight
+
+            def forget(_task: asyncio.Task, flight: _Flight = flight):
+                if flights.get(key) is flight:
+                    del flights[key]
+
+            flight.task.add_done_callback(forget)
+        flight.waiters += 1
+        try:
+            return await asyncio.shield(flight.task)
+        finally:
+            flight.waiters -= 1
+            if flight.waiters == 0 and not flight.task.done():
+                flight.task.cancel()
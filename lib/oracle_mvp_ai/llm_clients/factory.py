@@ -4,6 +4,17 @@ from .google_client import GoogleClient
 import os
 import dotenv
 
+def _limits(prefix: str) -> dict:
+    """
+    {PREFIX}_MAX_CONCURRENCY / {PREFIX}_REQUESTS_PER_MINUTE 환경변수 (설정하지 않으면 제한 없음)
+    """
+    max_concurrency = os.getenv(f"{prefix}_MAX_CONCURRENCY")
+    requests_per_minute = os.getenv(f"{prefix}_REQUESTS_PER_MINUTE")
+    return {
+        "max_concurrency": int(max_concurrency) if max_concurrency else None,
+        "requests_per_minute": float(requests_per_minute) if requests_per_minute else None
+    }
+
 class LLMClientFactory:
 
     @staticmethod
@@ -13,11 +24,12 @@ class LLMClientFactory:
         anthropic_api_key = os.getenv("CLAUDE_API_KEY")
         google_api_key = os.getenv("GEMINI_API_KEY")
         
+        # 동시 요청 수 / 분당 요청 수 제한 (interactive 요청을 우선 실행하는 limiter에 적용)
         if provider == "openai":
-            return OpenAIClient(openai_api_key)
+            return OpenAIClient(openai_api_key, **_limits("OPENAI"))
         elif provider == "anthropic":
-           return AnthropicClient(anthropic_api_key)
+           return AnthropicClient(anthropic_api_key, **_limits("ANTHROPIC"))
         elif provider == "google":
-            return GoogleClient(google_api_key)
+            return GoogleClient(google_api_key, **_limits("GOOGLE"))
         else:
             raise ValueError(f"Unsupported provider: {provider}")
\ No newline at end of file
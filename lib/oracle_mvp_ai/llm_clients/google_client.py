@@ -1,10 +1,26 @@
+import asyncio
 import google.generativeai as genai
-from typing import List, Dict
+from typing import List, Dict, Optional
+from .limiter import RequestLimiter
+from .coalescer import RequestCoalescer, chat_coalescing_allowed
+from ..tracing import record_usage
+from ..budget import check_budget
+from ..telemetry import observe_llm_call
 
 class GoogleClient:
-    def __init__(self, api_key: str):
+    def __init__(self, api_key: str, max_concurrency: Optional[int] = None, requests_per_minute: Optional[float] = None):
         genai.configure(api_key=api_key)
+        # 비동기 요청 전체에 적용되는 동시 요청 수 / 분당 요청 수 제한
+        self.limiter = RequestLimiter(max_concurrency, requests_per_minute)
+        # 동시에 들어온 같은 요청은 한 번만 보냄 (temperature > 0인 호출은 제외)
+        self.coalescer = RequestCoalescer("google")
     
+    async def warm_up(self):
+        """
+        SDK 초기화와 연결 준비 (모델 목록 첫 항목 조회, 토큰 사용 없음)
+        """
+        await asyncio.to_thread(lambda: next(iter(genai.list_models(page_size=1)), None))
+
     def chat(self, messages, model="gemini-2.5-pro", temperature=0):
         """
         Google Gemini API 호출
@@ -19,10 +35,41 @@ class GoogleClient:
                 temperature=temperature
             )
         )
-        response = genai_model.generate_content(
-            contents=contents
-        )
+        check_budget()
+        with observe_llm_call("google", model):
+            response = genai_model.generate_content(
+                contents=contents
+            )
+        record_usage(model, getattr(response, "usage_metadata", None))
         return response.text
+
+    async def chat_async(self, messages, model="gemini-2.5-pro", temperature=0):
+        """
+        Google Gemini API 호출 (비동기 버전)
+
+        Returns:
+            모델의 응답 내용
+        """
+        contents = self._convert_openai_messages_to_gemini_contents(messages)
+        genai_model = genai.GenerativeModel(
+            model_name=model,
+            generation_config=genai.GenerationConfig(
+                temperature=temperature
+            )
+        )
+        async def call():
+            async with self.limiter:
+                check_budget()
+                with observe_llm_call("google", model):
+                    response = await genai_model.generate_content_async(
+                        contents=contents
+                    )
+            return response.text, getattr(response, "usage_metadata", None)
+
+        return await self.coalescer.run(
+            "chat", model, {"model": model, "contents": contents, "temperature": temperature}, call,
+            coalesce=chat_coalescing_allowed(temperature)
+        )
     
     def _convert_openai_messages_to_gemini_contents(self, messages) -> List[Dict]:
         """
@@ -0,0 +1,164 @@
+import asyncio
+import time
+import weakref
+from collections import deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Deque, Dict, Optional
+from .. import telemetry
+
+
+# LLM 호출 우선순위 (interactive: 사용자가 기다리는 판결, bulk: 일관성 측정 등 대량 판결)
+LLM_PRIORITIES = ("interactive", "bulk")
+
+_current_priority: ContextVar[str] = ContextVar("oracle_llm_priority", default="interactive")
+
+
+@contextmanager
+def llm_priority(priority: str):
+    """
+    블록 안(자식 task, to_thread 포함)의 LLM 호출 우선순위 지정
+    """
+    if priority not in LLM_PRIORITIES:
+        raise ValueError(f"priority must be one of {LLM_PRIORITIES}")
+    token = _current_priority.set(priority)
+    try:
+        yield
+    finally:
+        _current_priority.reset(token)
+
+
+def current_priority() -> str:
+    return _current_priority.get()
+
+
+class _LoopState:
+    """
+    이벤트 루프별 실행 중인 요청 수와 우선순위별 대기열
+    """
+    def __init__(self):
+        self.active = 0
+        self.waiters: Dict[str, Deque[asyncio.Future]] = {priority: deque() for priority in LLM_PRIORITIES}
+        # 분당 요청 수 제한으로 다음 허용 시각에 대기열을 다시 확인하는 타이머
+        self.timer: Optional[asyncio.TimerHandle] = None
+
+
+class RequestLimiter:
+    """
+    클라이언트 단위 동시 요청 수 / 분당 요청 수 제한 (우선순위 스케줄링)
+
+    하나의 클라이언트를 공유하는 모든 단계(임베딩, 웹 검색, 점수, 최종 판결)와
+    여러 주제에 걸쳐 같은 한도를 적용합니다. 값이 None이면 제한하지 않습니다.
+
+    자리가 없을 때는 호출 단위로 interactive 요청을 bulk 요청보다 먼저 실행하되,
+    두 우선순위가 함께 기다리는 동안에도 bulk 요청이 전체의 bulk_min_share 이상은 실행되도록 보장합니다.
+    호출 우선순위는 llm_priority()로 지정합니다 (기본 interactive).
+    """
+    def __init__(self, max_concurrency: Optional[int] = None, requests_per_minute: Optional[float] = None,
+                 bulk_min_share: float = 0.2):
+        if not 0 <= bulk_min_share <= 1:
+            raise ValueError("bulk_min_share must be in [0, 1]")
+        self.max_concurrency = max_concurrency
+        self.requests_per_minute = requests_per_minute
+        self.bulk_min_share = bulk_min_share
+        # asyncio 객체는 이벤트 루프에 묶이므로 루프별로 생성
+        self._states = weakref.WeakKeyDictionary()
+        self._next_slot = 0.0
+        # 두 우선순위가 함께 기다릴 때 허용한 요청 수 (bulk 최소 비율 계산용)
+        self._contended_total = 0
+        self._contended_bulk = 0
+
+    def _state(self) -> _LoopState:
+        loop = asyncio.get_running_loop()
+        state = self._states.get(loop)
+        if state is None:
+            state = _LoopState()
+            self._states[loop] = state
+        return state
+
+    def _has_capacity(self, state: _LoopState) -> bool:
+        return not self.max_concurrency or state.active < self.max_concurrency
+
+    def _rate_wait(self) -> float:
+        """
+        분당 요청 수 제한으로 다음 요청까지 기다려야 하는 시간 (초)
+        """
+        if not self.requests_per_minute:
+            return 0.0
+        return max(0.0, self._next_slot - time.monotonic())
+
+    def _grant(self, state: _LoopState):
+        state.active += 1
+        if self.requests_per_minute:
+            # 요청 간 최소 간격을 두어 분당 요청 수를 맞춤
+            self._next_slot = max(time.monotonic(), self._next_slot) + 60.0 / self.requests_per_minute
+
+    def _discard_cancelled(self, state: _LoopState):
+        for waiters in state.waiters.values():
+            while waiters and waiters[0].done():
+                # 대기 중에 취소된 요청
+                waiters.popleft()
+
+    def _next_priority(self, state: _LoopState) -> Optional[str]:
+        # 취소된 요청이 남아 있으면 함께 기다리는 것으로 잘못 세어 bulk 최소 비율 계산이 틀어짐
+        self._discard_cancelled(state)
+        interactive, bulk = state.waiters["interactive"], state.waiters["bulk"]
+        if not bulk:
+            return "interactive" if interactive else None
+        if not interactive:
+            return "bulk"
+        # 둘 다 기다리면 bulk가 최소 비율보다 적게 실행된 경우에만 bulk
+        self._contended_total += 1
+        if self._contended_bulk < self.bulk_min_share * self._contended_total:
+            self._contended_bulk += 1
+            return "bulk"
+        return "interactive"
+
+    def _dispatch(self, state: _LoopState):
+        """
+        자리가 있는 만큼 대기열에서 우선순위 순으로 요청 허용
+        """
+        while self._has_capacity(state):
+            self._discard_cancelled(state)
+            if not any(state.waiters.values()):
+                return
+            wait = self._rate_wait()
+            if wait > 0:
+                if state.timer is None:
+                    state.timer = asyncio.get_running_loop().call_later(wait, self._on_timer, state)
+                return
+            priority = self._next_priority(state)
+            future = state.waiters[priority].popleft()
+            self._grant(state)
+            future.set_result(None)
+
+    def _on_timer(self, state: _LoopState):
+        state.timer = None
+        self._dispatch(state)
+
+    async def __aenter__(self):
+        state = self._state()
+        priority = current_priority()
+        if self._has_capacity(state) and self._rate_wait() == 0 and not any(state.waiters.values()):
+            self._grant(state)
+            return self
+        future = asyncio.get_running_loop().create_future()
+        state.waiters[priority].append(future)
+        started = time.monotonic()
+        self._dispatch(state)
+        try:
+            await future
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                # 허용된 직후 취소되면 자리를 돌려줌
+                state.active -= 1
+                self._dispatch(state)
+            raise
+        telemetry.LLM_SCHEDULER_WAIT.observe(time.monotonic() - started, priority=priority)
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        state = self._state()
+        state.active -= 1
+        self._dispatch(state)
+        return False
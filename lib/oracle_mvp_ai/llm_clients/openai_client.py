@@ -1,12 +1,34 @@
 import openai
-from openai import OpenAI, AsyncOpenAI
-from typing import List, Dict
+from openai import OpenAI, AsyncOpenAI, DefaultHttpxClient, DefaultAsyncHttpxClient
+from typing import List, Dict, Optional
+import asyncio
+import logging
 import os
+from .limiter import RequestLimiter
+from .coalescer import RequestCoalescer, chat_coalescing_allowed
+from ..tracing import record_usage
+from ..budget import check_budget
+from ..telemetry import observe_llm_call, http_event_hooks, async_http_event_hooks
+
+logger = logging.getLogger(__name__)
 
 class OpenAIClient:
-    def __init__(self, api_key: str):
-        self.client = OpenAI(api_key=api_key)
-        self.async_client = AsyncOpenAI(api_key=api_key)
+    def __init__(self, api_key: str, max_concurrency: Optional[int] = None, requests_per_minute: Optional[float] = None):
+        # 429 응답 / SDK 재시도 횟수 집계용 http 훅
+        self.client = OpenAI(api_key=api_key, http_client=DefaultHttpxClient(event_hooks=http_event_hooks("openai")))
+        self.async_client = AsyncOpenAI(
+            api_key=api_key, http_client=DefaultAsyncHttpxClient(event_hooks=async_http_event_hooks("openai"))
+        )
+        # 비동기 요청 전체에 적용되는 동시 요청 수 / 분당 요청 수 제한
+        self.limiter = RequestLimiter(max_concurrency, requests_per_minute)
+        # 동시에 들어온 같은 요청은 한 번만 보냄 (temperature > 0인 chat은 제외)
+        self.coalescer = RequestCoalescer("openai")
+
+    async def warm_up(self):
+        """
+        연결 풀 준비 (모델 목록 조회로 TLS 연결을 미리 열어 둠, 토큰 사용 없음)
+        """
+        await self.async_client.models.list()
 
     def chat(self, messages, model="gpt-4o", temperature=0, seed=42):
         """
@@ -15,22 +37,53 @@ class OpenAIClient:
         Returns:
             모델의 응답 내용
         """
-        response = self.client.chat.completions.create(
-            model=model,
-            messages=messages,
-            temperature=temperature,
-            seed=seed
-        )
+        check_budget()
+        with observe_llm_call("openai", model):
+            response = self.client.chat.completions.create(
+                model=model,
+                messages=messages,
+                temperature=temperature,
+                seed=seed
+            )
+        record_usage(model, response.usage)
         return response.choices[0].message.content 
 
     async def chat_async(self, messages, model="gpt-4o", temperature=0, seed=42):
-        response = await self.async_client.chat.completions.create(
-            model=model,
-            messages=messages,
-            temperature=temperature,
-            seed=seed
+        async def call():
+            async with self.limiter:
+                check_budget()
+                with observe_llm_call("openai", model):
+                    response = await self.async_client.chat.completions.create(
+                        model=model,
+                        messages=messages,
+                        temperature=temperature,
+                        seed=seed
+                    )
+            return response.choices[0].message.content, response.usage
+
+        return await self.coalescer.run(
+            "chat", model, {"model": model, "messages": messages, "temperature": temperature, "seed": seed}, call,
+            coalesce=chat_coalescing_allowed(temperature)
         )
-        return response.choices[0].message.content 
+
+    async def chat_samples_async(self, messages, n: int, model="gpt-4o", temperature=0.7) -> List[str]:
+        """
+        한 번의 요청으로 n개의 응답 샘플 생성 (n 파라미터 사용)
+
+        Returns:
+            응답 내용 리스트
+        """
+        async with self.limiter:
+            check_budget()
+            with observe_llm_call("openai", model):
+                response = await self.async_client.chat.completions.create(
+                    model=model,
+                    messages=messages,
+                    temperature=temperature,
+                    n=n
+                )
+        record_usage(model, response.usage)
+        return [choice.message.content for choice in response.choices]
 
     def create_embedding(self, text: str, model: str = "text-embedding-3-small") -> list:
         """
@@ -43,11 +96,14 @@ class OpenAIClient:
         Returns:
             임베딩 벡터
         """
-        response = self.client.embeddings.create(
-            model=model,
-            input=text,
-            encoding_format="float"
-        )
+        check_budget()
+        with observe_llm_call("openai", model):
+            response = self.client.embeddings.create(
+                model=model,
+                input=text,
+                encoding_format="float"
+            )
+        record_usage(model, response.usage)
         return response.data[0].embedding 
 
     async def create_embedding_async(self, text: str, model: str = "text-embedding-3-small") -> list:
@@ -61,33 +117,83 @@ class OpenAIClient:
         Returns:
             임베딩 벡터
         """
-        response = await self.async_client.embeddings.create(
-            model=model,
-            input=text,
-            encoding_format="float"
-        )
-        return response.data[0].embedding 
+        async def call():
+            async with self.limiter:
+                check_budget()
+                with observe_llm_call("openai", model):
+                    response = await self.async_client.embeddings.create(
+                        model=model,
+                        input=text,
+                        encoding_format="float"
+                    )
+            return response.data[0].embedding, response.usage
+
+        return await self.coalescer.run("embedding", model, {"model": model, "input": text}, call)
+
+    async def create_embeddings_async(self, texts: List[str], model: str = "text-embedding-3-small", batch_size: int = 512) -> List[list]:
+        """
+        여러 텍스트의 임베딩 벡터를 배치 요청으로 생성 (요청당 최대 batch_size개)
+        
+        Args:
+            texts: 임베딩을 생성할 텍스트 리스트
+            model: 사용할 임베딩 모델
+            batch_size: 한 요청에 담을 텍스트 수
+            
+        Returns:
+            texts 순서와 같은 임베딩 벡터 리스트
+        """
+        async def embed_batch(batch: List[str]) -> List[list]:
+            async def call():
+                async with self.limiter:
+                    check_budget()
+                    with observe_llm_call("openai", model):
+                        response = await self.async_client.embeddings.create(
+                            model=model,
+                            input=batch,
+                            encoding_format="float"
+                        )
+                return [item.embedding for item in sorted(response.data, key=lambda item: item.index)], response.usage
+
+            return await self.coalescer.run("embeddings", model, {"model": model, "input": batch}, call)
+
+        batches = [texts[i:i + batch_size] for i in range(0, len(texts), batch_size)]
+        results = await asyncio.gather(*[embed_batch(batch) for batch in batches])
+        return [embedding for batch_result in results for embedding in batch_result]
 
     async def web_search_chat(self, messages, model: str = "gpt-4o-search-preview"):
+        async def call():
+            async with self.limiter:
+                check_budget()
+                with observe_llm_call("openai", model):
+                    response = await self.async_client.chat.completions.create(
+                        model=model,
+                        messages=messages,
+                        web_search_options={}
+                    )
+            return response.choices[0].message.content, response.usage
+
         try:
-            response = await self.async_client.chat.completions.create(
-                model=model,
-                messages=messages,
-                web_search_options={}
-            )
-            return response.choices[0].message.content
+            # 같은 주제를 동시에 판결하거나 일관성 측정 회차가 같은 검색을 하면 한 번만 요청
+            return await self.coalescer.run("web_search", model, {"model": model, "messages": messages}, call)
         except Exception as e:
-            print(f"Web search error: {e}")
+            logger.warning(f"Web search error: {e}")
             raise e
 
     async def web_search_mini_chat(self, messages, model: str = "gpt-4o-mini-search-preview"):
+        async def call():
+            async with self.limiter:
+                check_budget()
+                with observe_llm_call("openai", model):
+                    response = await self.async_client.chat.completions.create(
+                        model=model,
+                        messages=messages,
+                        web_search_options={}
+                    )
+            return response.choices[0].message.content, response.usage
+
         try:
-            response = await self.async_client.chat.completions.create(
-                model=model,
-                messages=messages,
-                web_search_options={}
-            )
-            return response.choices[0].message.content
+            # 같은 주제를 동시에 판결하거나 일관성 측정 회차가 같은 검색을 하면 한 번만 요청
+            return await self.coalescer.run("web_search", model, {"model": model, "messages": messages}, call)
         except Exception as e:
-            print(f"Web search error: {e}")
+            logger.warning(f"Web search error: {e}")
             raise e
\ No newline at end of file
@@ -0,0 +1,67 @@
+import time
+from typing import Dict, Any, Optional
+
+
+# 실행 프로필
+# - deadline_seconds: judge() 전체 제한 시간
+# - web_search: 웹 검색 기반 신뢰도 검사 실행 여부
+# - web_search_min_seconds: 남은 시간이 이보다 적으면 신뢰도 검사 생략
+# - max_debate_turns: 토론 최대 턴 수 (0이면 토론 없이 단일 호출로 판결)
+# - debate_min_seconds: 남은 시간이 이보다 적으면 토론 대신 단일 호출로 판결
+# - final_reserve_seconds: 최종 판결을 위해 남겨두는 시간 (이전 단계는 이 시간을 침범하지 않음)
+JUDGE_PROFILES: Dict[str, Dict[str, Any]] = {
+    "fast": {
+        "deadline_seconds": 20,
+        "web_search": False,
+        "web_search_min_seconds": 0,
+        "max_debate_turns": 0,
+        "debate_min_seconds": 0,
+        "final_reserve_seconds": 15,
+    },
+    "standard": {
+        "deadline_seconds": 60,
+        "web_search": True,
+        "web_search_min_seconds": 15,
+        "max_debate_turns": 3,
+        "debate_min_seconds": 40,
+        "final_reserve_seconds": 20,
+    },
+    "thorough": {
+        "deadline_seconds": 300,
+        "web_search": True,
+        "web_search_min_seconds": 30,
+        "max_debate_turns": 20,
+        "debate_min_seconds": 90,
+        "final_reserve_seconds": 60,
+    },
+}
+
+
+def get_profile(name: str) -> Dict[str, Any]:
+    """
+    이름으로 실행 프로필 조회
+    """
+    if name not in JUDGE_PROFILES:
+        raise ValueError(f"Unknown judge profile: {name} (available: {', '.join(JUDGE_PROFILES)})")
+    return JUDGE_PROFILES[name]
+
+
+class Deadline:
+    """
+    요청 단위 제한 시간 추적 (seconds가 None이면 제한 없음)
+    """
+    def __init__(self, seconds: Optional[float] = None):
+        self.seconds = seconds
+        self.started_at = time.monotonic()
+        self.expires_at = None if seconds is None else self.started_at + seconds
+
+    def remaining(self, reserve: float = 0.0) -> Optional[float]:
+        """
+        reserve 초를 남겨둔 상태에서 사용할 수 있는 시간 (제한이 없으면 None)
+        """
+        if self.expires_at is None:
+            return None
+        return max(0.0, self.expires_at - reserve - time.monotonic())
+
+    def elapsed(self) -> float:
+        return time.monotonic() - self.started_at
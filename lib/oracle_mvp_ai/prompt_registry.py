@@ -0,0 +1,168 @@
+import asyncio
+import hashlib
+import logging
+import os
+import re
+import string
+from pathlib import Path
+from typing import List, Dict, Any, Optional, Tuple
+import yaml
+
+logger = logging.getLogger(__name__)
+
+
+# str.format 대신 지정된 필드만 치환하는 섹션 (템플릿 안의 JSON 예시 중괄호를 그대로 두기 위함)
+REPLACE_FIELDS = {
+    "final_judgment": ("topic", "opinions", "camps"),
+}
+
+
+class PromptTemplate:
+    """
+    미리 분해(컴파일)해 둔 프롬프트 템플릿
+
+    fields를 지정하면 해당 {field}만 치환하고 나머지 중괄호는 그대로 둡니다 (str.replace 방식).
+    지정하지 않으면 str.format 문법({{ }} 이스케이프 포함)으로 해석합니다.
+    """
+    def __init__(self, template: str, fields: Optional[Tuple[str, ...]] = None):
+        self.template = template
+        self._parts: List[Tuple[str, Optional[str]]] = []
+        self._use_format = False
+
+        if fields is not None:
+            pattern = re.compile("|".join(re.escape("{" + field + "}") for field in fields))
+            position = 0
+            for match in pattern.finditer(template):
+                self._parts.append((template[position:match.start()], match.group(0)[1:-1]))
+                position = match.end()
+            self._parts.append((template[position:], None))
+            return
+
+        for literal, field_name, format_spec, conversion in string.Formatter().parse(template):
+            # 서식 지정자나 속성 접근이 있는 템플릿은 str.format에 맡김
+            if field_name is not None and (format_spec or conversion or not field_name.isidentifier()):
+                self._use_format = True
+                self._parts = []
+                return
+            self._parts.append((literal, field_name))
+
+    def render(self, **values: Any) -> str:
+        if self._use_format:
+            return self.template.format(**values)
+        return "".join(
+            literal + (str(values[field]) if field is not None else "")
+            for literal, field in self._parts
+        )
+
+
+class PromptVersion(dict):
+    """
+    파싱된 프롬프트 yaml (dict)과 컴파일된 템플릿
+    기존처럼 prompt_yaml["web_search"]["system"] 형태로 접근할 수 있습니다.
+    """
+    def __init__(self, filename: str, text: str, data: Dict[str, Any], mtime: float):
+        super().__init__(data if isinstance(data, dict) else {})
+        self.filename = filename
+        self.text = text
+        self.mtime = mtime
+        # 프롬프트 내용 해시 (같은 파일명이라도 내용이 바뀌면 다른 버전)
+        self.digest = hashlib.sha256(text.encode("utf-8")).hexdigest()
+        self.templates: Dict[Tuple[str, str], PromptTemplate] = {}
+        for section, content in self.items():
+            if not isinstance(content, dict):
+                continue
+            for role, template in content.items():
+                if isinstance(template, str):
+                    self.templates[(section, role)] = PromptTemplate(template, REPLACE_FIELDS.get(section))
+
+    def render(self, section: str, role: str, **values: Any) -> str:
+        """
+        섹션/역할의 템플릿에 값을 채워 반환
+        """
+        return self.templates[(section, role)].render(**values)
+
+
+class PromptRegistry:
+    """
+    prompt_metadata 폴더의 프롬프트 버전을 한 번만 파싱해 메모리에 보관
+    watch()를 실행하면 파일이 바뀔 때 해당 버전을 다시 읽음
+    """
+    def __init__(self, prompt_dir: Path):
+        self.prompt_dir = Path(prompt_dir)
+        self._versions: Dict[str, PromptVersion] = {}
+
+    def _load(self, filename: str) -> PromptVersion:
+        path = self.prompt_dir / filename
+        with open(path, "r", encoding="utf-8") as f:
+            text = f.read()
+        version = PromptVersion(filename, text, yaml.safe_load(text), os.path.getmtime(path))
+        self._versions[filename] = version
+        return version
+
+    def list(self) -> List[str]:
+        """
+        프롬프트 파일(.yaml) 목록
+        """
+        return sorted(f for f in os.listdir(self.prompt_dir) if f.endswith(".yaml"))
+
+    def exists(self, filename: str) -> bool:
+        return filename in self._versions or (self.prompt_dir / filename).is_file()
+
+    def get(self, filename: str) -> PromptVersion:
+        """
+        파싱된 프롬프트 버전 반환 (처음 요청할 때만 파일을 읽음)
+        """
+        version = self._versions.get(filename)
+        if version is None:
+            version = self._load(filename)
+        return version
+
+    def get_text(self, filename: str) -> str:
+        """
+        프롬프트 파일 원문 반환
+        """
+        try:
+            return self.get(filename).text
+        except yaml.YAMLError:
+            with open(self.prompt_dir / filename, "r", encoding="utf-8") as f:
+                return f.read()
+
+    def invalidate(self, filename: Optional[str] = None):
+        """
+        캐시 무효화 (filename이 없으면 전체)
+        """
+        if filename is None:
+            self._versions.clear()
+        else:
+            self._versions.pop(filename, None)
+
+    def preload(self) -> List[str]:
+        """
+        모든 프롬프트 버전을 미리 파싱
+        """
+        loaded = []
+        for filename in self.list():
+            try:
+                self._load(filename)
+                loaded.append(filename)
+            except Exception as e:
+                logger.warning(f"Prompt preload failed ({filename}): {e}")
+        return loaded
+
+    async def watch(self, stop_event: Optional[asyncio.Event] = None):
+        """
+        프롬프트 폴더를 감시하며 바뀐 파일을 다시 읽음 (watchfiles 필요)
+        """
+        from watchfiles import awatch
+
+        async for changes in awatch(self.prompt_dir, stop_event=stop_event):
+            for _, path in changes:
+                filename = Path(path).name
+                self.invalidate(filename)
+                if not (filename.endswith(".yaml") or filename.endswith(".json")) or not os.path.exists(path):
+                    continue
+                try:
+                    self._load(filename)
+                    logger.info(f"Prompt reloaded: {filename}")
+                except Exception as e:
+                    logger.warning(f"Prompt reload failed ({filename}): {e}")
@@ -0,0 +1,102 @@
+import copy
+import hashlib
+import json
+import time
+from collections import OrderedDict
+from typing import Dict, Any, Optional, Tuple
+
+
+# 판결 결과에 영향을 주지 않아 캐시 키에서 제외하는 설정
+# (예산 옵션은 축소된 결과만 바꾸는데, 축소된 결과는 캐시하지 않음)
+NON_RESULT_CONFIG_FIELDS = ("use_cache", "use_snapshot", "max_total_tokens", "max_cost_usd", "tenant", "budget_reserve_fraction",
+                            "priority")
+
+
+def make_cache_key(processed_data: Dict[str, Any], prompt_digest: str, config_dict: Dict[str, Any]) -> str:
+    """
+    판결 입력의 정규화된 해시
+
+    주제 아이디, 주제, 진영, (진영별) 의견, 프롬프트 버전(내용 해시), 판결 모델과 결과에 영향을 주는 옵션으로 만듭니다.
+    결과에 topic_id가 들어가므로 내용이 같아도 다른 주제는 캐시를 공유하지 않습니다.
+    """
+    if "posts_with_camps" in processed_data:
+        posts = [[post, camp_id] for post, camp_id in processed_data["posts_with_camps"]]
+    else:
+        posts = list(processed_data["posts"])
+    payload = {
+        "topic_id": str(processed_data.get("topic_id", "")),
+        "topic": processed_data["topic"],
+        "camps": processed_data["camps"],
+        "camp_ids": processed_data["camp_ids"],
+        "posts": posts,
+        "post_camp_ids": processed_data.get("post_camp_ids", []),
+        "post_support": processed_data.get("post_support"),
+        "prompt_file": processed_data["prompt_file"],
+        "prompt_digest": prompt_digest,
+        "config": {key: value for key, value in config_dict.items() if key not in NON_RESULT_CONFIG_FIELDS},
+    }
+    canonical = json.dumps(payload, ensure_ascii=False, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+class JudgeResultCache:
+    """
+    판결 결과 메모리 캐시 (TTL + LRU)
+
+    같은 입력을 반복 판결할 때(플레이그라운드 재실행, 백엔드 재시도) 저장된 결과를 바로 반환합니다.
+    - ttl_seconds: 결과 보관 시간 (None이면 만료 없음)
+    - max_entries: 최대 보관 개수, 넘으면 가장 오래 사용하지 않은 결과부터 제거
+    """
+    def __init__(self, ttl_seconds: Optional[float] = 3600, max_entries: int = 256):
+        if max_entries <= 0:
+            raise ValueError("max_entries must be positive")
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """
+        저장된 결과의 복사본 반환 (없거나 만료되었으면 None)
+        """
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        stored_at, result = entry
+        if self.ttl_seconds is not None and time.monotonic() - stored_at > self.ttl_seconds:
+            del self._entries[key]
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return copy.deepcopy(result)
+
+    def __contains__(self, key: str) -> bool:
+        """
+        만료되지 않은 결과가 있는지 확인 (적중/실패 수와 LRU 순서는 바꾸지 않음)
+        """
+        entry = self._entries.get(key)
+        return entry is not None and (self.ttl_seconds is None or time.monotonic() - entry[0] <= self.ttl_seconds)
+
+    def set(self, key: str, result: Dict[str, Any]):
+        self._entries[key] = (time.monotonic(), copy.deepcopy(result))
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def clear(self):
+        self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "ttl_seconds": self.ttl_seconds,
+            "hits": self.hits,
+            "misses": self.misses,
+        }
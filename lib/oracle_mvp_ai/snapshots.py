@@ -0,0 +1,78 @@
+import json
+import logging
+import os
+import re
+from pathlib import Path
+from typing import Dict, Any, Optional
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+
+class TopicSnapshotStore:
+    """
+    주제별 중간 결과 스냅샷 저장소
+
+    topic_id마다 다음 정보를 저장해 두고, 같은 주제를 다시 판결할 때
+    추가/변경된 의견만 임베딩하고 신뢰도 검사를 하도록 합니다.
+    - embeddings: {의견 텍스트: 임베딩}  ({topic_id}.npy + 텍스트 순서는 json에 저장)
+    - clusters: 중복 제거 결과 [{"representative": 대표 의견, "members": [의견, ...]}, ...]
+    - scored_opinions: {대표 의견: 신뢰도 점수가 붙은 의견}
+    - prompt_file, topic: 점수를 만들 때 사용한 프롬프트와 주제 (다르면 점수는 재사용하지 않음)
+    """
+    def __init__(self, snapshot_dir: Path):
+        self.snapshot_dir = Path(snapshot_dir)
+        self.snapshot_dir.mkdir(parents=True, exist_ok=True)
+
+    def _paths(self, topic_id: str):
+        # topic_id를 파일명으로 안전하게 변환
+        name = re.sub(r"[^0-9A-Za-z_.-]", "_", str(topic_id))
+        return self.snapshot_dir / f"{name}.json", self.snapshot_dir / f"{name}.npy"
+
+    def load(self, topic_id: str) -> Optional[Dict[str, Any]]:
+        """
+        스냅샷 조회 (없거나 읽을 수 없으면 None)
+        """
+        meta_path, embeddings_path = self._paths(topic_id)
+        if not meta_path.exists():
+            return None
+        try:
+            with open(meta_path, "r", encoding="utf-8") as f:
+                snapshot = json.load(f)
+            texts = snapshot.pop("embedding_texts", [])
+            embeddings = {}
+            if texts and embeddings_path.exists():
+                matrix = np.load(embeddings_path)
+                if len(matrix) == len(texts):
+                    embeddings = dict(zip(texts, matrix))
+            snapshot["embeddings"] = embeddings
+            return snapshot
+        except Exception as e:
+            logger.warning(f"Snapshot load failed ({topic_id}): {e}")
+            return None
+
+    def save(self, topic_id: str, snapshot: Dict[str, Any]):
+        """
+        스냅샷 저장 (임시 파일에 쓴 뒤 교체)
+        """
+        meta_path, embeddings_path = self._paths(topic_id)
+        embeddings = snapshot.get("embeddings", {})
+        texts = list(embeddings)
+        meta = {key: value for key, value in snapshot.items() if key != "embeddings"}
+        meta["topic_id"] = str(topic_id)
+        meta["embedding_texts"] = texts
+
+        if texts:
+            matrix = np.asarray([embeddings[text] for text in texts], dtype=np.float32)
+            tmp_embeddings_path = embeddings_path.with_suffix(".tmp.npy")
+            np.save(tmp_embeddings_path, matrix)
+            os.replace(tmp_embeddings_path, embeddings_path)
+        tmp_meta_path = meta_path.with_suffix(".json.tmp")
+        with open(tmp_meta_path, "w", encoding="utf-8") as f:
+            json.dump(meta, f, ensure_ascii=False)
+        os.replace(tmp_meta_path, meta_path)
+
+    def delete(self, topic_id: str):
+        for path in self._paths(topic_id):
+            if path.exists():
+                path.unlink()
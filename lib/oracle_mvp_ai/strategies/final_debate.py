@@ -1,17 +1,26 @@
-from typing import List, Dict, Any
-from ..llm_clients.factory import LLMClientFactory
+from typing import List, Dict, Any, Optional
+from ..budget import BudgetExceeded, budget_allows
+import asyncio
 import time
+import logging
 import yaml
 import json
 
+logger = logging.getLogger(__name__)
+
 
 class JudgeAfterDebate:
     # for now I will just use openai client only
-    def __init__(self):
-        self.openai_client = LLMClientFactory.create_client("openai")
-        self.max_turns = 20
+    def __init__(self, client, max_turns: int = 20):
+        """
+        Args:
+            client: AiJudge의 OpenAI 클라이언트 (chat_async 사용, 같은 요청 제한과 우선순위를 적용)
+            max_turns: 토론 최대 턴 수
+        """
+        self.openai_client = client
+        self.max_turns = max_turns
 
-    def debate(self, messages):
+    async def debate(self, messages, deadline: Optional[float] = None):
         """
         Make final judgement through debate between two AI agents.
         Process:
@@ -19,16 +28,17 @@ class JudgeAfterDebate:
         2. Compare and discuss differences
         3. Reach consensus through debate
         4. Return final consensus in required JSON format
+
+        Args:
+            messages: final judgment messages
+            deadline: time.monotonic() value; no new turn is started after it
         """
         # Get independent initial judgments from both judges
-        response_a = self.openai_client.chat(messages, temperature=0.1)
-        response_b = self.openai_client.chat(messages, temperature=0.1)
+        response_a = await self.openai_client.chat_async(messages, temperature=0.1)
+        response_b = await self.openai_client.chat_async(messages, temperature=0.1)
         
-        print("\n--------------------------------")
-        print(f"AI Judge A initial judgment:\n{response_a}")
-        print("\n--------------------------------")
-        print(f"AI Judge B initial judgment:\n{response_b}")
-        print("\n--------------------------------")
+        logger.debug(f"AI Judge A initial judgment:\n{response_a}")
+        logger.debug(f"AI Judge B initial judgment:\n{response_b}")
 
         # Initialize message histories for debate
         messages_a = messages.copy()
@@ -99,32 +109,61 @@ class JudgeAfterDebate:
         messages_b.append({"role": "user", "content": f"판사 A의 의견입니다:\n{response_a}"})
 
         turn_count = 0
-        last_response = None
+        last_response = response_a  # 턴이 진행되지 않은 경우 초기 판결 사용
         previous_response = None  # Track previous response to check for repetition
-        while turn_count < self.max_turns:
-            response_a = self.openai_client.chat(messages_a, temperature=0.1)
-            print("\n--------------------------------")
-            print(f"AI Judge A: {response_a}")
-            print("--------------------------------")
-
-            # Check if we're in a loop
-            if response_a == previous_response:
-                print("✅ 토론 종료 - 판사들이 같은 결론에 도달했습니다")
-                return {
-                    "final_state": "agreement",
-                    "consensus": response_a
-                }
-
-            if response_a.startswith("[동의]"):
-                last_response = response_a
-                messages_b.append({"role": "user", "content": f"판사 A가 다음과 같이 응답했습니다:\n{response_a}\n이 의견에 동의하시나요?"})
-                response_b = self.openai_client.chat(messages_b, temperature=0.1)
-                print("\n--------------------------------")
-                print(f"AI Judge B: {response_b}")
-                print("--------------------------------")
+        try:
+            while turn_count < self.max_turns:
+                if deadline is not None and time.monotonic() >= deadline:
+                    logger.info("⚠️ 토론 종료 - 제한 시간 도달")
+                    json_start = last_response.find("{")
+                    return {
+                        "final_state": "deadline_reached",
+                        "consensus": last_response[json_start:] if json_start != -1 else last_response,
+                        "turns": turn_count
+                    }
+                if not budget_allows():
+                    return self._budget_exhausted(last_response, turn_count)
+
+                response_a = await self.openai_client.chat_async(messages_a, temperature=0.1)
+                logger.debug(f"AI Judge A: {response_a}")
+
+                # Check if we're in a loop
+                if response_a == previous_response:
+                    logger.info("✅ 토론 종료 - 판사들이 같은 결론에 도달했습니다")
+                    return {
+                        "final_state": "agreement",
+                        "consensus": response_a,
+                        "turns": turn_count
+                    }
+
+                if response_a.startswith("[동의]"):
+                    last_response = response_a
+                    messages_b.append({"role": "user", "content": f"판사 A가 다음과 같이 응답했습니다:\n{response_a}\n이 의견에 동의하시나요?"})
+                    response_b = await self.openai_client.chat_async(messages_b, temperature=0.1)
+                    logger.debug(f"AI Judge B: {response_b}")
                 
+                    if response_b.startswith("[동의]"):
+                        logger.info("✅ 토론 종료 - 판사들이 합의에 도달했습니다")
+                        # Extract JSON from the response by finding the first '{'
+                        json_start = response_b.find("{")
+                        if json_start != -1:
+                            consensus = response_b[json_start:]
+                        else:
+                            consensus = response_b.replace("[동의] ", "")
+                        return {
+                            "final_state": "agreement",
+                            "consensus": consensus,
+                            "turns": turn_count
+                        }
+                else:
+                    last_response = response_a
+
+                messages_b.append({"role": "user", "content": f"판사 A의 의견입니다:\n{response_a}"})
+                response_b = await self.openai_client.chat_async(messages_b, temperature=0.1)
+                logger.debug(f"AI Judge B: {response_b}")
+
                 if response_b.startswith("[동의]"):
-                    print("✅ 토론 종료 - 판사들이 합의에 도달했습니다")
+                    logger.info("✅ 토론 종료 - 판사들이 합의에 도달했습니다")
                     # Extract JSON from the response by finding the first '{'
                     json_start = response_b.find("{")
                     if json_start != -1:
@@ -133,37 +172,20 @@ class JudgeAfterDebate:
                         consensus = response_b.replace("[동의] ", "")
                     return {
                         "final_state": "agreement",
-                        "consensus": consensus
+                        "consensus": consensus,
+                        "turns": turn_count
                     }
-            else:
-                last_response = response_a
-
-            messages_b.append({"role": "user", "content": f"판사 A의 의견입니다:\n{response_a}"})
-            response_b = self.openai_client.chat(messages_b, temperature=0.1)
-            print("\n--------------------------------")
-            print(f"AI Judge B: {response_b}")
-            print("--------------------------------")
-
-            if response_b.startswith("[동의]"):
-                print("✅ 토론 종료 - 판사들이 합의에 도달했습니다")
-                # Extract JSON from the response by finding the first '{'
-                json_start = response_b.find("{")
-                if json_start != -1:
-                    consensus = response_b[json_start:]
-                else:
-                    consensus = response_b.replace("[동의] ", "")
-                return {
-                    "final_state": "agreement",
-                    "consensus": consensus
-                }
             
-            previous_response = response_b  # Update previous response
-            last_response = response_b
-            messages_a.append({"role": "user", "content": f"판사 B의 의견입니다:\n{response_b}"})
-            turn_count += 1
-            time.sleep(1)
-
-        print("⚠️ 토론 종료 - 최대 턴수 도달")
+                previous_response = response_b  # Update previous response
+                last_response = response_b
+                messages_a.append({"role": "user", "content": f"판사 B의 의견입니다:\n{response_b}"})
+                turn_count += 1
+                await asyncio.sleep(1)
+        except BudgetExceeded:
+            # 토큰/비용 예산 소진: 마지막 판결로 종료
+            return self._budget_exhausted(last_response, turn_count)
+
+        logger.info("⚠️ 토론 종료 - 최대 턴수 도달")
         # Extract JSON from the last response
         json_start = last_response.find("{")
         if json_start != -1:
@@ -172,5 +194,15 @@ class JudgeAfterDebate:
             consensus = last_response
         return {
             "final_state": "max_turns_reached",
-            "consensus": consensus
-        }
\ No newline at end of file
+            "consensus": consensus,
+            "turns": turn_count
+        }
+
+    def _budget_exhausted(self, last_response: str, turn_count: int) -> Dict[str, Any]:
+        logger.info("⚠️ 토론 종료 - 토큰/비용 예산 소진")
+        json_start = last_response.find("{")
+        return {
+            "final_state": "budget_exhausted",
+            "consensus": last_response[json_start:] if json_start != -1 else last_response,
+            "turns": turn_count
+        }
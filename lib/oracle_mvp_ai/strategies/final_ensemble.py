@@ -0,0 +1,151 @@
+import asyncio
+import logging
+from collections import Counter
+from typing import List, Dict, Any, Callable, Optional
+from ..budget import BudgetExceeded
+
+logger = logging.getLogger(__name__)
+
+
+def average_percentages(percentages: List[List[Dict[str, Any]]], camp_ids: List[str]) -> List[Dict[str, Any]]:
+    """
+    여러 판결의 진영별 비율을 평균내어 합이 100이 되는 정수 비율로 변환
+
+    Args:
+        percentages: 판결별 [{"camp_id": ..., "percentage": ...}, ...] 리스트
+        camp_ids: 캠프 아이디 리스트 (str)
+
+    Returns:
+        평균 비율 리스트 (camp_ids 순서)
+    """
+    totals = {camp_id: 0.0 for camp_id in camp_ids}
+    for percentage in percentages:
+        for entry in percentage:
+            camp_id = str(entry.get("camp_id", ""))
+            if camp_id in totals:
+                try:
+                    totals[camp_id] += float(entry.get("percentage", 0))
+                except (TypeError, ValueError):
+                    continue
+
+    total = sum(totals.values())
+    if total <= 0:
+        averages = {camp_id: 100 / len(camp_ids) for camp_id in camp_ids}
+    else:
+        averages = {camp_id: value * 100 / total for camp_id, value in totals.items()}
+
+    # 최대 잔여 방식으로 합계를 100으로 맞춤
+    rounded = {camp_id: int(value) for camp_id, value in averages.items()}
+    remainder = 100 - sum(rounded.values())
+    by_fraction = sorted(camp_ids, key=lambda cid: averages[cid] - rounded[cid], reverse=True)
+    for camp_id in by_fraction[:remainder]:
+        rounded[camp_id] += 1
+    return [{"camp_id": camp_id, "percentage": rounded[camp_id]} for camp_id in camp_ids]
+
+
+def aggregate_judgments(judgments: List[Dict[str, Any]], camp_ids: List[str]) -> Dict[str, Any]:
+    """
+    여러 판결을 투표로 집계
+
+    승리 진영은 다수결로 정하고, 동률이면 해당 진영 평균 비율이 높은 쪽을 선택합니다.
+    비율은 승리 진영에 투표한 판결들의 평균을 사용하여 판결 이유와 비율이 어긋나지 않도록 합니다.
+
+    Args:
+        judgments: {"camp_id", "reason", "percentage"} 형식의 판결 리스트
+        camp_ids: 캠프 아이디 리스트 (str)
+
+    Returns:
+        집계된 판결 (votes, agreement 포함)
+    """
+    votes = Counter(judgment["camp_id"] for judgment in judgments)
+
+    def camp_share(camp_id: str) -> float:
+        shares = [
+            float(entry.get("percentage", 0))
+            for judgment in judgments
+            for entry in judgment.get("percentage", [])
+            if str(entry.get("camp_id")) == camp_id
+        ]
+        return sum(shares) / len(shares) if shares else 0.0
+
+    win_camp_id = max(votes, key=lambda camp_id: (votes[camp_id], camp_share(camp_id)))
+    winners = [judgment for judgment in judgments if judgment["camp_id"] == win_camp_id]
+
+    return {
+        "camp_id": win_camp_id,
+        "reason": winners[0].get("reason", ""),
+        "percentage": average_percentages([judgment.get("percentage", []) for judgment in winners], camp_ids),
+        "votes": {camp_id: votes.get(camp_id, 0) for camp_id in camp_ids},
+        "agreement": votes[win_camp_id] / len(judgments),
+    }
+
+
+class JudgeEnsemble:
+    """
+    여러 모델(openai, google, anthropic)에 같은 최종 판결 프롬프트를 동시에 보내고 투표로 집계
+    """
+    def __init__(self, clients: Dict[str, Any], quorum: Optional[int] = None):
+        """
+        Args:
+            clients: {provider: client} 딕셔너리 (각 client는 chat_async를 제공해야 함)
+            quorum: 같은 진영에 이 수만큼 표가 모이면 나머지 호출을 취소하고 즉시 반환 (None이면 전부 대기)
+        """
+        self.clients = clients
+        self.quorum = quorum
+
+    async def _ask(self, client, messages: List[Dict[str, str]], parse: Callable[[str], Dict[str, Any]]) -> Dict[str, Any]:
+        response = await client.chat_async(messages, temperature=0)
+        return parse(response)
+
+    async def judge(self, messages: List[Dict[str, str]], parse: Callable[[str], Dict[str, Any]], camp_ids: List[str]) -> Dict[str, Any]:
+        """
+        앙상블 판결
+
+        Args:
+            messages: 최종 판결 메시지
+            parse: 모델 응답 문자열을 {"camp_id", "reason", "percentage"}로 변환하는 함수
+            camp_ids: 캠프 아이디 리스트 (str)
+
+        Returns:
+            집계된 판결과 앙상블 정보 (providers, cancelled_providers)
+        """
+        tasks = {
+            asyncio.create_task(self._ask(client, messages, parse)): provider
+            for provider, client in self.clients.items()
+        }
+        pending = set(tasks)
+        judgments = []
+        try:
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    provider = tasks[task]
+                    try:
+                        judgment = task.result()
+                    except BudgetExceeded:
+                        # 예산 소진은 공급자 실패가 아니므로 판결 단계로 전달 (저렴한 경로로 전환)
+                        raise
+                    except Exception as e:
+                        logger.warning(f"Ensemble provider {provider} failed: {e}")
+                        continue
+                    judgment["provider"] = provider
+                    judgments.append(judgment)
+
+                # 정족수에 도달하면 남은 호출은 기다리지 않음
+                if self.quorum and judgments:
+                    _, count = Counter(judgment["camp_id"] for judgment in judgments).most_common(1)[0]
+                    if count >= self.quorum:
+                        break
+        finally:
+            for task in pending:
+                task.cancel()
+            if pending:
+                await asyncio.gather(*pending, return_exceptions=True)
+
+        if not judgments:
+            raise RuntimeError("All ensemble providers failed")
+
+        result = aggregate_judgments(judgments, camp_ids)
+        result["providers"] = [judgment["provider"] for judgment in judgments]
+        result["cancelled_providers"] = [tasks[task] for task in pending]
+        return result
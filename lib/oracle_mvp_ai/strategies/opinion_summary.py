@@ -0,0 +1,180 @@
+import asyncio
+import logging
+from functools import lru_cache
+from typing import List, Dict, Any, Optional, Tuple
+from ..prompt_registry import PromptTemplate, PromptVersion
+
+logger = logging.getLogger(__name__)
+
+
+# 프롬프트 yaml에 opinion_summary 섹션이 없을 때 사용하는 기본 요약 프롬프트
+DEFAULT_SUMMARY_PROMPT = {
+    "system": (
+        "You summarize debate opinions for an impartial judge.\n"
+        "Keep every distinct argument and piece of evidence, merge repeated points, "
+        "and keep the credibility score next to the argument it belongs to.\n"
+        "Never add arguments that are not in the opinions."
+    ),
+    "user": (
+        "Topic: {topic}\n"
+        "Camp: {camp}\n"
+        "Opinions:\n{opinions}\n\n"
+        "Summarize these opinions as a numbered list of distinct arguments in at most {max_tokens} tokens.\n"
+        "Write in the language of the opinions and return only the list."
+    ),
+}
+
+
+@lru_cache(maxsize=None)
+def _encoding(model: str):
+    """
+    모델의 tiktoken 인코딩 (불러올 수 없으면 None, 실패도 캐시하여 다시 시도하지 않음)
+    """
+    try:
+        # tiktoken은 요약 기능을 사용할 때만 필요
+        import tiktoken
+        try:
+            return tiktoken.encoding_for_model(model)
+        except KeyError:
+            return tiktoken.get_encoding("o200k_base")
+    except Exception as e:
+        logger.warning(f"tiktoken unavailable, estimating token counts: {e}")
+        return None
+
+
+def count_tokens(text: str, model: str = "gpt-4o") -> int:
+    """
+    tiktoken으로 토큰 수 계산 (tiktoken을 사용할 수 없으면 글자 수로 추정)
+    """
+    encoding = _encoding(model)
+    if encoding is None:
+        return len(text) // 2 + 1
+    return len(encoding.encode(text))
+
+
+def truncate_to_tokens(text: str, max_tokens: int, model: str = "gpt-4o") -> str:
+    """
+    max_tokens 이하가 되도록 텍스트 뒷부분을 자름
+    """
+    if count_tokens(text, model) <= max_tokens:
+        return text
+    encoding = _encoding(model)
+    if encoding is None:
+        return text[:max(0, (max_tokens - 1) * 2)]
+    return encoding.decode(encoding.encode(text)[:max_tokens])
+
+
+class OpinionSummarizer:
+    """
+    토큰 예산 기반 계층적 의견 요약 (map-reduce)
+
+    진영별로 의견을 chunk_tokens 크기로 나눠 동시에 요약(map)하고,
+    요약 결과가 아직 예산을 넘으면 요약들을 다시 묶어 요약(reduce)하는 과정을 반복합니다.
+    max_rounds 안에 예산에 맞추지 못하면 마지막 결과를 잘라서라도 예산 안으로 맞춥니다.
+    """
+    def __init__(self, client, token_budget: int, chunk_tokens: int = 3000,
+                 model: str = "gpt-4o-mini", max_rounds: int = 4):
+        """
+        Args:
+            client: LLM 클라이언트 (chat_async 사용)
+            token_budget: 모든 진영 의견을 합친 최대 토큰 수
+            chunk_tokens: 한 번의 요약 요청에 넣을 최대 토큰 수
+            model: 요약 모델
+            max_rounds: 최대 요약 단계 수
+        """
+        self.client = client
+        self.token_budget = token_budget
+        self.chunk_tokens = chunk_tokens
+        self.model = model
+        self.max_rounds = max_rounds
+
+    def _chunk(self, items: List[str]) -> List[List[str]]:
+        chunks, current, current_tokens = [], [], 0
+        for item in items:
+            item = truncate_to_tokens(item, self.chunk_tokens)
+            tokens = count_tokens(item)
+            if current and current_tokens + tokens > self.chunk_tokens:
+                chunks.append(current)
+                current, current_tokens = [], 0
+            current.append(item)
+            current_tokens += tokens
+        if current:
+            chunks.append(current)
+        return chunks
+
+    async def _summarize_chunk(self, topic: str, camp: str, chunk: List[str], max_tokens: int,
+                               templates: Tuple[PromptTemplate, PromptTemplate]) -> str:
+        system_template, user_template = templates
+        opinions = "\n".join(f"{i+1}. {opinion}" for i, opinion in enumerate(chunk))
+        messages = [
+            {"role": "system", "content": system_template.render()},
+            {"role": "user", "content": user_template.render(topic=topic, camp=camp, opinions=opinions, max_tokens=max_tokens)}
+        ]
+        try:
+            summary = await self.client.chat_async(messages, model=self.model)
+        except Exception as e:
+            # 요약에 실패한 묶음은 원문을 잘라서 사용
+            logger.warning(f"Opinion summary failed ({camp}): {e}")
+            summary = opinions
+        return truncate_to_tokens(summary.strip(), max_tokens)
+
+    async def _reduce(self, topic: str, camp: str, items: List[str], budget: int,
+                      templates: Tuple[PromptTemplate, PromptTemplate]) -> Tuple[List[str], int]:
+        rounds = 0
+        while sum(count_tokens(item) for item in items) > budget and rounds < self.max_rounds:
+            chunks = self._chunk(items)
+            # 묶음별 요약 길이: 합쳐서 예산에 맞고, 한 단계마다 확실히 줄어들도록 제한
+            max_tokens = max(64, min(self.chunk_tokens // 4, budget // len(chunks)))
+            items = list(await asyncio.gather(*[
+                self._summarize_chunk(topic, camp, chunk, max_tokens, templates) for chunk in chunks
+            ]))
+            rounds += 1
+
+        # 그래도 넘으면 앞에서부터 예산까지만 사용
+        bounded, used = [], 0
+        for item in items:
+            tokens = count_tokens(item)
+            if used + tokens > budget:
+                if budget - used > 0:
+                    bounded.append(truncate_to_tokens(item, budget - used))
+                break
+            bounded.append(item)
+            used += tokens
+        return bounded, rounds
+
+    async def summarize(self, topic: str, camp_opinions: Dict[str, List[str]],
+                        prompt_yaml: Optional[PromptVersion] = None) -> Dict[str, Any]:
+        """
+        진영별 의견을 예산 안으로 요약
+
+        Args:
+            topic: 주제
+            camp_opinions: {진영 이름: 점수가 붙은 의견 리스트}
+            prompt_yaml: opinion_summary 섹션이 있으면 기본 요약 프롬프트 대신 사용
+
+        Returns:
+            {"opinions": {진영 이름: 요약된 의견 리스트}, "rounds": 최대 요약 단계 수,
+             "input_tokens": 요약 전 토큰 수, "output_tokens": 요약 후 토큰 수}
+        """
+        if prompt_yaml is not None and ("opinion_summary", "user") in prompt_yaml.templates:
+            templates = (
+                prompt_yaml.templates.get(("opinion_summary", "system"), PromptTemplate(DEFAULT_SUMMARY_PROMPT["system"])),
+                prompt_yaml.templates[("opinion_summary", "user")]
+            )
+        else:
+            templates = (PromptTemplate(DEFAULT_SUMMARY_PROMPT["system"]), PromptTemplate(DEFAULT_SUMMARY_PROMPT["user"]))
+
+        camps = [camp for camp, opinions in camp_opinions.items() if opinions]
+        input_tokens = sum(count_tokens(opinion) for camp in camps for opinion in camp_opinions[camp])
+        # 진영마다 같은 몫의 예산을 사용
+        camp_budget = max(1, self.token_budget // max(1, len(camps)))
+        reduced = await asyncio.gather(*[
+            self._reduce(topic, camp, camp_opinions[camp], camp_budget, templates) for camp in camps
+        ])
+        summarized = {camp: items for camp, (items, _) in zip(camps, reduced)}
+        return {
+            "opinions": summarized,
+            "rounds": max((rounds for _, rounds in reduced), default=0),
+            "input_tokens": input_tokens,
+            "output_tokens": sum(count_tokens(item) for items in summarized.values() for item in items)
+        }
@@ -0,0 +1,69 @@
+import asyncio
+import logging
+from typing import List, Dict, Any, Callable
+from .final_ensemble import aggregate_judgments
+from ..budget import BudgetExceeded
+
+logger = logging.getLogger(__name__)
+
+
+class JudgeSelfConsistency:
+    """
+    한 모델에서 여러 개의 판결 샘플을 받아 다수결로 최종 판결 도출 (self-consistency)
+    """
+    def __init__(self, client, samples: int = 5, temperature: float = 0.7):
+        """
+        Args:
+            client: LLM 클라이언트 (chat_samples_async가 있으면 한 번의 요청으로 샘플링)
+            samples: 샘플 수 (k)
+            temperature: 샘플링 온도
+        """
+        self.client = client
+        self.samples = samples
+        self.temperature = temperature
+
+    async def _sample(self, messages: List[Dict[str, str]]) -> List[str]:
+        # n 파라미터를 지원하는 클라이언트는 한 번의 요청으로 k개 샘플 생성
+        if hasattr(self.client, "chat_samples_async"):
+            return await self.client.chat_samples_async(messages, n=self.samples, temperature=self.temperature)
+        # 지원하지 않으면 k개의 요청을 동시에 보냄
+        responses = await asyncio.gather(
+            *[self.client.chat_async(messages, temperature=self.temperature) for _ in range(self.samples)],
+            return_exceptions=True
+        )
+        samples = []
+        for response in responses:
+            if isinstance(response, BudgetExceeded):
+                # 예산 소진은 샘플 실패가 아니므로 판결 단계로 전달
+                raise response
+            if isinstance(response, Exception):
+                logger.warning(f"Self-consistency sample failed: {response}")
+                continue
+            samples.append(response)
+        return samples
+
+    async def judge(self, messages: List[Dict[str, str]], parse: Callable[[str], Dict[str, Any]], camp_ids: List[str]) -> Dict[str, Any]:
+        """
+        샘플링 판결
+
+        Args:
+            messages: 최종 판결 메시지
+            parse: 모델 응답 문자열을 {"camp_id", "reason", "percentage"}로 변환하는 함수
+            camp_ids: 캠프 아이디 리스트 (str)
+
+        Returns:
+            집계된 판결 (votes, agreement, samples 포함)
+        """
+        judgments = []
+        for response in await self._sample(messages):
+            try:
+                judgments.append(parse(response))
+            except Exception as e:
+                logger.warning(f"Self-consistency sample parsing failed: {e}")
+
+        if not judgments:
+            raise RuntimeError("No valid self-consistency samples")
+
+        result = aggregate_judgments(judgments, camp_ids)
+        result["samples"] = len(judgments)
+        return result
@@ -0,0 +1,299 @@
+import bisect
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, List, Tuple, Optional, Sequence
+
+
+# 지연 시간 버킷 (초) - 판결 전체는 30~90초가 걸리므로 긴 구간까지 포함
+LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 20, 30, 60, 90, 120, 300)
+DEBATE_TURN_BUCKETS = (0, 1, 2, 3, 5, 10, 20)
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+
+class _Metric:
+    type_name = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+
+    def _key(self, labels: Dict[str, str]) -> Tuple[str, ...]:
+        if set(labels) != set(self.labelnames):
+            raise ValueError(f"{self.name}: expected labels {self.labelnames}, got {tuple(labels)}")
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def _samples(self) -> List[str]:
+        raise NotImplementedError
+
+    def render(self) -> str:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.type_name}"]
+        with self._lock:
+            lines.extend(self._samples())
+        return "\n".join(lines)
+
+
+class Counter(_Metric):
+    type_name = "counter"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        super().__init__(name, documentation, labelnames)
+        self._values: Dict[Tuple[str, ...], float] = {}
+
+    def inc(self, amount: float = 1, **labels: str):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def value(self, **labels: str) -> float:
+        return self._values.get(self._key(labels), 0)
+
+    def _samples(self) -> List[str]:
+        return [f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}"
+                for key, value in sorted(self._values.items())]
+
+
+class Gauge(_Metric):
+    type_name = "gauge"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        super().__init__(name, documentation, labelnames)
+        self._values: Dict[Tuple[str, ...], float] = {}
+
+    def inc(self, amount: float = 1, **labels: str):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def dec(self, amount: float = 1, **labels: str):
+        self.inc(-amount, **labels)
+
+    def set(self, value: float, **labels: str):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = value
+
+    def value(self, **labels: str) -> float:
+        return self._values.get(self._key(labels), 0)
+
+    @contextmanager
+    def track(self, **labels: str):
+        """
+        블록 실행 중에만 1 증가 (진행 중 요청 수)
+        """
+        self.inc(**labels)
+        try:
+            yield
+        finally:
+            self.dec(**labels)
+
+    def _samples(self) -> List[str]:
+        return [f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}"
+                for key, value in sorted(self._values.items())]
+
+
+class Histogram(_Metric):
+    type_name = "histogram"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                 buckets: Sequence[float] = LATENCY_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets)) + (float("inf"),)
+        # {labels: (버킷별 개수, 합계, 개수)}
+        self._values: Dict[Tuple[str, ...], list] = {}
+
+    def observe(self, value: float, **labels: str):
+        key = self._key(labels)
+        with self._lock:
+            entry = self._values.get(key)
+            if entry is None:
+                entry = self._values[key] = [[0] * len(self.buckets), 0.0, 0]
+            entry[0][bisect.bisect_left(self.buckets, value)] += 1
+            entry[1] += value
+            entry[2] += 1
+
+    @contextmanager
+    def time(self, **labels: str):
+        started_at = time.monotonic()
+        try:
+            yield
+        finally:
+            self.observe(time.monotonic() - started_at, **labels)
+
+    def count(self, **labels: str) -> int:
+        entry = self._values.get(self._key(labels))
+        return entry[2] if entry else 0
+
+    def _samples(self) -> List[str]:
+        lines = []
+        for key, (bucket_counts, total, count) in sorted(self._values.items()):
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets, bucket_counts):
+                cumulative += bucket_count
+                le = f'le="{_format_value(bound)}"'
+                lines.append(f"{self.name}_bucket{_format_labels(self.labelnames, key, le)} {cumulative}")
+            lines.append(f"{self.name}_sum{_format_labels(self.labelnames, key)} {_format_value(total)}")
+            lines.append(f"{self.name}_count{_format_labels(self.labelnames, key)} {count}")
+        return lines
+
+
+class MetricsRegistry:
+    """
+    Prometheus 텍스트 형식(0.0.4)으로 내보내는 최소 메트릭 저장소 (프로세스 단위)
+    """
+    def __init__(self):
+        self._metrics: Dict[str, _Metric] = {}
+
+    def register(self, metric: _Metric) -> _Metric:
+        if metric.name in self._metrics:
+            raise ValueError(f"Metric already registered: {metric.name}")
+        self._metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self.register(Counter(name, documentation, labelnames))
+
+    def gauge(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Gauge:
+        return self.register(Gauge(name, documentation, labelnames))
+
+    def histogram(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                  buckets: Sequence[float] = LATENCY_BUCKETS) -> Histogram:
+        return self.register(Histogram(name, documentation, labelnames, buckets))
+
+    def render(self) -> str:
+        return "\n".join(metric.render() for metric in self._metrics.values()) + "\n"
+
+
+REGISTRY = MetricsRegistry()
+
+# 판결 단위
+JUDGE_IN_FLIGHT = REGISTRY.gauge("oracle_judge_in_flight", "Judgments currently running")
+JUDGE_REQUESTS = REGISTRY.counter("oracle_judge_requests_total", "Judgments by outcome", ("status",))
+JUDGE_DURATION = REGISTRY.histogram("oracle_judge_duration_seconds", "End-to-end judge() latency")
+STAGE_DURATION = REGISTRY.histogram("oracle_judge_stage_duration_seconds", "judge() latency per pipeline stage", ("stage",))
+JUDGE_CACHE = REGISTRY.counter("oracle_judge_cache_total", "Judgment result cache lookups", ("result",))
+JUDGE_CACHE_ENTRIES = REGISTRY.gauge("oracle_judge_cache_entries", "Judgments held in the result cache")
+JUDGE_DEGRADATIONS = REGISTRY.counter("oracle_judge_degradations_total", "Stages skipped or cut short by a profile deadline or spend budget", ("reason",))
+DEBATE_TURNS = REGISTRY.histogram("oracle_judge_debate_turns", "Debate turns per judgment", buckets=DEBATE_TURN_BUCKETS)
+
+# LLM 호출 단위
+LLM_IN_FLIGHT = REGISTRY.gauge("oracle_llm_in_flight", "LLM requests currently running", ("provider",))
+LLM_REQUESTS = REGISTRY.counter("oracle_llm_requests_total", "LLM requests by outcome", ("provider", "model", "status"))
+LLM_DURATION = REGISTRY.histogram("oracle_llm_request_duration_seconds", "LLM request latency", ("provider", "model"))
+LLM_RATE_LIMITED = REGISTRY.counter("oracle_llm_rate_limited_total", "HTTP 429 responses from LLM providers", ("provider",))
+LLM_RETRIES = REGISTRY.counter("oracle_llm_retries_total", "LLM HTTP requests retried by the provider SDK", ("provider",))
+LLM_SCHEDULER_WAIT = REGISTRY.histogram("oracle_llm_scheduler_wait_seconds", "Time LLM requests wait for a limiter slot", ("priority",))
+LLM_COALESCED = REGISTRY.counter("oracle_llm_coalesced_total", "LLM calls served by an identical in-flight request instead of a new one", ("provider", "method"))
+
+# HTTP API 단위
+HTTP_IN_FLIGHT = REGISTRY.gauge("oracle_http_in_flight", "HTTP requests currently being served")
+HTTP_DURATION = REGISTRY.histogram("oracle_http_request_duration_seconds", "HTTP request latency", ("path", "method", "status"))
+
+# 판결 작업 큐 단위
+JOB_QUEUE_DEPTH = REGISTRY.gauge("oracle_job_queue_depth", "Judge jobs waiting for a worker", ("priority",))
+JOB_QUEUE_WAIT = REGISTRY.histogram("oracle_job_queue_wait_seconds", "Time judge jobs wait before a worker starts them", ("priority",))
+JOB_REJECTED = REGISTRY.counter("oracle_job_rejected_total", "Judge jobs rejected by admission control", ("reason",))
+
+
+def _is_rate_limit_error(error: BaseException) -> bool:
+    # openai/anthropic RateLimitError, google ResourceExhausted
+    return type(error).__name__ in ("RateLimitError", "ResourceExhausted") or getattr(error, "status_code", None) == 429
+
+
+@contextmanager
+def observe_llm_call(provider: str, model: str):
+    """
+    LLM 호출 한 번의 지연 시간/결과 기록 (limiter 대기 시간은 제외하도록 limiter 안에서 사용)
+    """
+    started_at = time.monotonic()
+    status = "ok"
+    LLM_IN_FLIGHT.inc(provider=provider)
+    try:
+        yield
+    except BaseException as e:
+        status = "rate_limited" if _is_rate_limit_error(e) else "error"
+        if status == "rate_limited" and provider == "google":
+            # google 클라이언트는 http 훅이 없으므로 예외로 집계
+            LLM_RATE_LIMITED.inc(provider=provider)
+        raise
+    finally:
+        LLM_IN_FLIGHT.dec(provider=provider)
+        LLM_DURATION.observe(time.monotonic() - started_at, provider=provider, model=model)
+        LLM_REQUESTS.inc(provider=provider, model=model, status=status)
+
+
+def _on_http_request(provider: str, request):
+    # openai/anthropic SDK는 재시도 요청에 x-stainless-retry-count 헤더를 붙임
+    try:
+        if int(request.headers.get("x-stainless-retry-count", "0")) > 0:
+            LLM_RETRIES.inc(provider=provider)
+    except ValueError:
+        pass
+
+
+def _on_http_response(provider: str, response):
+    if response.status_code == 429:
+        LLM_RATE_LIMITED.inc(provider=provider)
+
+
+def http_event_hooks(provider: str) -> Dict[str, list]:
+    """
+    httpx.Client(event_hooks=...)용 훅 (429 응답과 SDK 재시도 집계)
+    """
+    return {
+        "request": [lambda request: _on_http_request(provider, request)],
+        "response": [lambda response: _on_http_response(provider, response)],
+    }
+
+
+def async_http_event_hooks(provider: str) -> Dict[str, list]:
+    """
+    httpx.AsyncClient(event_hooks=...)용 훅
+    """
+    async def on_request(request):
+        _on_http_request(provider, request)
+
+    async def on_response(response):
+        _on_http_response(provider, response)
+
+    return {"request": [on_request], "response": [on_response]}
+
+
+def observe_judgment(result: Optional[dict], seconds: float, trace: Optional[dict] = None, error: bool = False):
+    """
+    판결 한 번의 결과를 메트릭에 반영 (AiJudge.judge에서 호출)
+    """
+    JUDGE_DURATION.observe(seconds)
+    if error or result is None:
+        JUDGE_REQUESTS.inc(status="error")
+        return
+    metadata = result.get("metadata", {})
+    JUDGE_REQUESTS.inc(status="ok" if result.get("win_camp_id") is not None else "no_judgment")
+    if "cache_hit" in metadata:
+        JUDGE_CACHE.inc(result="hit" if metadata["cache_hit"] else "miss")
+    if metadata.get("cache_hit"):
+        return
+    for stage, values in (trace or {}).get("stages", {}).items():
+        STAGE_DURATION.observe(values["seconds"], stage=stage)
+    for reason in metadata.get("degradations", []):
+        JUDGE_DEGRADATIONS.inc(reason=reason)
+    if "debate" in metadata:
+        DEBATE_TURNS.observe(metadata["debate"].get("turns", 0))
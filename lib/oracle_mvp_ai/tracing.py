@@ -0,0 +1,158 @@
+import json
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, Any, Optional
+from .budget import charge_budgets
+
+logger = logging.getLogger(__name__)
+
+
+# 모델별 예상 비용 (USD / 1M 토큰, (입력, 출력))
+# 목록에 없는 모델은 비용 0으로 집계
+MODEL_PRICES: Dict[str, tuple] = {
+    "gpt-4o": (2.50, 10.00),
+    "gpt-4o-mini": (0.15, 0.60),
+    "gpt-4o-search-preview": (2.50, 10.00),
+    "gpt-4o-mini-search-preview": (0.15, 0.60),
+    "text-embedding-3-small": (0.02, 0.0),
+    "text-embedding-3-large": (0.13, 0.0),
+    "claude-3-5-sonnet-20240620": (3.00, 15.00),
+    "gemini-2.5-pro": (1.25, 10.00),
+}
+
+
+def estimate_cost(model: str, prompt_tokens: int, completion_tokens: int) -> float:
+    """
+    토큰 수로 예상 비용(USD) 계산
+    """
+    input_price, output_price = MODEL_PRICES.get(model, (0.0, 0.0))
+    return (prompt_tokens * input_price + completion_tokens * output_price) / 1_000_000
+
+
+def _empty_stage() -> Dict[str, Any]:
+    return {"seconds": 0.0, "calls": 0, "prompt_tokens": 0, "completion_tokens": 0, "cost_usd": 0.0}
+
+
+class JudgeTrace:
+    """
+    judge() 한 번의 단계별 실행 시간 / LLM 호출 수 / 토큰 / 예상 비용 기록
+
+    judge()가 trace를 contextvar에 설정하면, 같은 컨텍스트(자식 task, to_thread 포함)에서
+    실행되는 LLM 클라이언트가 record_usage()로 현재 단계에 사용량을 더합니다.
+    """
+    def __init__(self):
+        self.stages: Dict[str, Dict[str, Any]] = {}
+        self.started_at = time.monotonic()
+        # to_thread로 실행되는 동기 호출에서도 기록되므로 잠금 사용
+        self._lock = threading.Lock()
+
+    def _stage(self, name: str) -> Dict[str, Any]:
+        stage = self.stages.get(name)
+        if stage is None:
+            stage = self.stages[name] = _empty_stage()
+        return stage
+
+    @contextmanager
+    def stage(self, name: str):
+        """
+        with trace.stage("embedding"): 블록의 실행 시간을 기록하고, 블록 안의 LLM 호출을 해당 단계로 집계
+        """
+        token = _current_stage.set(name)
+        started_at = time.monotonic()
+        try:
+            yield
+        finally:
+            elapsed = time.monotonic() - started_at
+            _current_stage.reset(token)
+            with self._lock:
+                self._stage(name)["seconds"] += elapsed
+
+    def add_usage(self, stage: str, model: str, prompt_tokens: int = 0, completion_tokens: int = 0, calls: int = 1,
+                  cost_usd: Optional[float] = None):
+        """
+        cost_usd를 지정하면 model 가격 대신 그 값을 비용으로 더함 (다른 trace에서 나눠 받은 사용량)
+        """
+        with self._lock:
+            entry = self._stage(stage)
+            entry["calls"] += calls
+            entry["prompt_tokens"] += prompt_tokens
+            entry["completion_tokens"] += completion_tokens
+            entry["cost_usd"] += estimate_cost(model, prompt_tokens, completion_tokens) if cost_usd is None else cost_usd
+
+    def to_dict(self) -> Dict[str, Any]:
+        with self._lock:
+            stages = {
+                name: {**stage, "seconds": round(stage["seconds"], 3), "cost_usd": round(stage["cost_usd"], 6)}
+                for name, stage in self.stages.items()
+            }
+        total = _empty_stage()
+        for stage in stages.values():
+            for key in ("calls", "prompt_tokens", "completion_tokens", "cost_usd"):
+                total[key] += stage[key]
+        total["seconds"] = round(time.monotonic() - self.started_at, 3)
+        total["cost_usd"] = round(total["cost_usd"], 6)
+        return {"stages": stages, "total": total}
+
+    def log(self, **fields: Any):
+        """
+        단계별 기록을 구조화된 로그(JSON 한 줄)로 출력
+        """
+        logger.info(json.dumps({"event": "judge_trace", **fields, **self.to_dict()}, ensure_ascii=False, default=str))
+
+
+_current_trace: ContextVar[Optional[JudgeTrace]] = ContextVar("oracle_judge_trace", default=None)
+_current_stage: ContextVar[Optional[str]] = ContextVar("oracle_judge_stage", default=None)
+
+
+def current_trace() -> Optional[JudgeTrace]:
+    return _current_trace.get()
+
+
+@contextmanager
+def start_trace():
+    """
+    새 trace를 현재 컨텍스트에 설정 (블록이 끝나면 이전 trace로 복원)
+    """
+    trace = JudgeTrace()
+    token = _current_trace.set(trace)
+    try:
+        yield trace
+    finally:
+        _current_trace.reset(token)
+
+
+@contextmanager
+def stage(name: str):
+    """
+    현재 trace가 있으면 trace.stage(name), 없으면 아무것도 하지 않음 (checker 등에서 사용)
+    """
+    trace = _current_trace.get()
+    if trace is None:
+        yield
+        return
+    with trace.stage(name):
+        yield
+
+
+def record_usage(model: str, usage: Any = None, calls: int = 1):
+    """
+    LLM 클라이언트에서 호출: 현재 trace의 현재 단계에 호출 수와 토큰 사용량을 더하고 예산에서 차감
+
+    usage는 OpenAI(prompt_tokens/completion_tokens), Anthropic(input_tokens/output_tokens),
+    Gemini(prompt_token_count/candidates_token_count) 응답의 usage 객체 또는 None
+    """
+    prompt_tokens = completion_tokens = 0
+    if usage is not None:
+        prompt_tokens = (getattr(usage, "prompt_tokens", None) or getattr(usage, "input_tokens", None)
+                         or getattr(usage, "prompt_token_count", None) or 0)
+        completion_tokens = (getattr(usage, "completion_tokens", None) or getattr(usage, "output_tokens", None)
+                             or getattr(usage, "candidates_token_count", None) or 0)
+    # 적용 중인 토큰/비용 예산에서 차감
+    charge_budgets(prompt_tokens + completion_tokens, estimate_cost(model, prompt_tokens, completion_tokens))
+    trace = _current_trace.get()
+    if trace is None:
+        return
+    trace.add_usage(_current_stage.get() or "other", model, prompt_tokens, completion_tokens, calls)
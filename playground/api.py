@@ -1,28 +1,119 @@
 from fastapi import FastAPI, Body
 from pydantic import BaseModel
-from lib.oracle_mvp_ai.ai_judge import AiJudge
+from lib.oracle_mvp_ai.ai_judge import AiJudge, CONSISTENCY_MODES
+from lib.oracle_mvp_ai.config import JudgeConfig, BATCH_PROMPT_FILES
 from lib.oracle_mvp_ai.llm_clients.openai_client import OpenAIClient
+from lib.oracle_mvp_ai.result_cache import JudgeResultCache
+from lib.oracle_mvp_ai.budget import TenantBudgets
+from lib.oracle_mvp_ai.compute import CpuPool
+from lib.oracle_mvp_ai.datasets import (
+    DATASET_SCHEMA, JSONL_EXTENSION, DatasetFormatError, open_jsonl_dataset, schema_signature, validate_dataset
+)
+from playground.jobs import PRIORITIES, SUCCEEDED, CANCELLED, JobQueue, JobQueueFull
+from playground.store import ExperimentStore
+from playground.documents import DatasetSchemaIndex, PointerError, SummaryCache, page_items, page_iter, project
+from playground.warmup import WarmUp
+from playground.serialization import ApiJSONResponse, JsonFileCache, dumps, loads, write_json, wrap_object_ids
 import os
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, PlainTextResponse, StreamingResponse
 from fastapi import HTTPException
 import glob
-import json
+from bson.errors import InvalidId
 import yaml
-from fastapi import Request
+from fastapi import Request, Query
 import asyncio
+import logging
 from dotenv import load_dotenv
-from bson import ObjectId
 from fastapi import UploadFile, File, Form
 from lib.oracle_mvp_ai import metrics
+from lib.oracle_mvp_ai import telemetry
+from lib.oracle_mvp_ai.strategies.opinion_summary import count_tokens
+import time
+import math
 
 app = FastAPI()
 
 # .env 파일을 프로젝트 루트에서 로드
 load_dotenv()
 
+# 판결 과정 로그 (LOG_LEVEL=DEBUG이면 프롬프트/응답 전체 출력)
+logging.basicConfig(level=os.getenv("LOG_LEVEL", "INFO").upper(), format="%(asctime)s %(levelname)s %(name)s: %(message)s")
+logger = logging.getLogger(__name__)
+
 # 환경변수에서 OPENAI_API_KEY를 읽어옴
 OPENAI_API_KEY = os.getenv("OPENAI_API_KEY", "sk-...your-key...")
-ai_judge = AiJudge(OPENAI_API_KEY)
+# 요청별 옵션은 JudgeConfig로 전달하므로 하나의 인스턴스를 동시 요청에서 공유
+# 같은 데이터셋/프롬프트/옵션의 반복 판결은 캐시된 결과를 반환 (JUDGE_CACHE_TTL_SECONDS=0이면 캐시 사용 안 함)
+JUDGE_CACHE_TTL_SECONDS = float(os.getenv("JUDGE_CACHE_TTL_SECONDS", "3600"))
+JUDGE_CACHE_MAX_ENTRIES = int(os.getenv("JUDGE_CACHE_MAX_ENTRIES", "256"))
+result_cache = JudgeResultCache(JUDGE_CACHE_TTL_SECONDS, JUDGE_CACHE_MAX_ENTRIES) if JUDGE_CACHE_TTL_SECONDS > 0 else None
+# config.tenant별 하루 누적 토큰/비용 한도 (둘 다 비어 있으면 테넌트 한도 없음)
+TENANT_DAILY_MAX_TOKENS = os.getenv("TENANT_DAILY_MAX_TOKENS")
+TENANT_DAILY_MAX_COST_USD = os.getenv("TENANT_DAILY_MAX_COST_USD")
+tenant_budgets = None
+if TENANT_DAILY_MAX_TOKENS or TENANT_DAILY_MAX_COST_USD:
+    tenant_budgets = TenantBudgets(default_limits=(
+        int(TENANT_DAILY_MAX_TOKENS) if TENANT_DAILY_MAX_TOKENS else None,
+        float(TENANT_DAILY_MAX_COST_USD) if TENANT_DAILY_MAX_COST_USD else None
+    ))
+# 중복 의견 묶기/일관성 지표 계산을 이벤트 루프 밖의 작업 프로세스에서 실행 (CPU_POOL_WORKERS=0이면 스레드에서 실행)
+CPU_POOL_WORKERS = os.getenv("CPU_POOL_WORKERS")
+cpu_pool = CpuPool(int(CPU_POOL_WORKERS) if CPU_POOL_WORKERS else None)
+ai_judge = AiJudge(OPENAI_API_KEY, result_cache=result_cache, tenant_budgets=tenant_budgets, cpu_pool=cpu_pool)
+# 실행/결과/일관성 지표 인덱스 (결과 JSON 파일과 함께 기록)
+EXPERIMENT_DB_PATH = os.getenv("EXPERIMENT_DB_PATH", os.path.join(os.path.dirname(__file__), 'results', 'experiments.db'))
+experiment_store = ExperimentStore(EXPERIMENT_DB_PATH)
+# 데이터셋/결과 파일 디코딩 캐시 (파일 수정 시각 기준)
+json_files = JsonFileCache(int(os.getenv("JSON_FILE_CACHE_ENTRIES", "64")))
+
+@app.middleware("http")
+async def track_http_metrics(request: Request, call_next):
+    """
+    요청 처리 중 수와 경로별 지연 시간 기록 (경로는 라우트 템플릿으로 집계)
+    """
+    started_at = time.monotonic()
+    status = 500
+    with telemetry.HTTP_IN_FLIGHT.track():
+        try:
+            response = await call_next(request)
+            status = response.status_code
+            return response
+        finally:
+            route = request.scope.get("route")
+            path = getattr(route, "path", "unmatched")
+            telemetry.HTTP_DURATION.observe(time.monotonic() - started_at, path=path, method=request.method, status=str(status))
+
+@app.get("/metrics")
+def get_metrics():
+    """
+    Prometheus 형식 메트릭 (단계/모델별 지연 시간, 진행 중 요청 수, 캐시 적중, 429/재시도, 토론 턴 수)
+    """
+    if result_cache is not None:
+        telemetry.JUDGE_CACHE_ENTRIES.set(len(result_cache))
+    return PlainTextResponse(telemetry.REGISTRY.render(), media_type="text/plain; version=0.0.4; charset=utf-8")
+
+def build_judge_config(prompt_filename: str, options: dict = None) -> JudgeConfig:
+    """
+    요청의 프롬프트 파일명과 config 옵션으로 JudgeConfig 생성
+    배치 신뢰도 검사 여부는 따로 지정하지 않으면 프롬프트 파일에 맞춤
+    """
+    options = dict(options or {})
+    options.setdefault("prompt_file", prompt_filename)
+    options.setdefault("batch_credibility_check", options["prompt_file"] in BATCH_PROMPT_FILES)
+    try:
+        return JudgeConfig.from_dict(options)
+    except (TypeError, ValueError) as e:
+        raise HTTPException(status_code=400, detail=f"잘못된 config 옵션: {e}")
+
+def with_llm_priority(config: JudgeConfig, request: dict, default_priority: str) -> JudgeConfig:
+    """
+    작업 우선순위(request의 priority)에 맞춰 LLM 호출 우선순위 지정
+    bulk 작업의 LLM 호출은 interactive 판결의 호출보다 나중에 실행 (config에 priority를 직접 지정하면 그 값 사용)
+    """
+    if 'priority' in (request.get('config') or {}):
+        return config
+    priority = request.get('priority') or default_priority
+    return config.replace(priority="bulk" if priority == "bulk" else "interactive")
 
 class AskRequest(BaseModel):
     topic: str
@@ -40,23 +131,22 @@ def ask(request: AskRequest):
     )
     return {"result": result}
 
+# 프롬프트 파일 변경 감시 (judge와 같은 메모리 캐시를 사용)
+@app.on_event("startup")
+async def watch_prompts():
+    asyncio.create_task(ai_judge.prompt_registry.watch())
+
 # 프롬프트 파일 리스트 조회
 @app.get("/prompts")
 def list_prompts():
-    prompt_dir = os.path.join(os.path.dirname(__file__), '../lib/oracle_mvp_ai/prompt_metadata')
-    files = [f for f in os.listdir(prompt_dir) if f.endswith('.yaml')]
-    return {"prompts": files}
+    return {"prompts": ai_judge.prompt_registry.list()}
 
 # 프롬프트 파일 내용 조회
 @app.get("/prompts/{filename}")
 def get_prompt(filename: str):
-    prompt_dir = os.path.join(os.path.dirname(__file__), '../lib/oracle_mvp_ai/prompt_metadata')
-    file_path = os.path.join(prompt_dir, filename)
-    if not os.path.exists(file_path):
+    if not ai_judge.prompt_registry.exists(filename):
         raise HTTPException(status_code=404, detail="Prompt file not found")
-    with open(file_path, encoding='utf-8') as f:
-        content = f.read()
-    return {"content": content}
+    return {"content": ai_judge.prompt_registry.get_text(filename)}
 
 # 프롬프트 추가
 @app.post("/prompts")
@@ -71,34 +161,146 @@ def add_prompt(filename: str = Form(...), content: str = Form(...)):
         raise HTTPException(status_code=409, detail="이미 존재하는 파일명입니다.")
     with open(file_path, 'w', encoding='utf-8') as f:
         f.write(content)
+    ai_judge.prompt_registry.invalidate(filename)
     return {"success": True, "filename": filename}
 
 # 데이터셋 버전/파일 리스트 조회
+def summarize_dataset(path: str) -> dict:
+    if path.endswith(JSONL_EXTENSION):
+        # JSONL은 헤더만 해석하고 의견은 줄 수만 셈
+        header, posts = open_jsonl_dataset(path)
+        return {
+            "title": header.get('title'),
+            "camps": len(header.get('camps') or []),
+            "posts": sum(1 for _ in posts),
+            "format": "jsonl"
+        }
+    content = json_files.load(path)
+    topic = content.get('topic', content) if isinstance(content, dict) else {}
+    return {
+        "title": topic.get('title'),
+        "camps": len(topic.get('camps') or []),
+        "posts": len(topic.get('posts') or [])
+    }
+
+def summarize_result(path: str) -> dict:
+    content = json_files.load(path)
+    metadata = content.get('metadata') or {}
+    return {
+        "topic_id": content.get('topic_id'),
+        "win_camp_id": content.get('win_camp_id'),
+        "used_prompt_uris": metadata.get('used_prompt_uris'),
+        "seconds": ((metadata.get('trace') or {}).get('total') or {}).get('seconds'),
+        "cost_usd": (metadata.get('spend') or {}).get('cost_usd')
+    }
+
+dataset_summaries = SummaryCache(summarize_dataset)
+# 업로드 검사용 버전 폴더별 키 구조 색인
+dataset_schemas = DatasetSchemaIndex(json_files.load, schema_signature)
+result_summaries = SummaryCache(summarize_result)
+
+def load_document(file_path: str, not_found: str):
+    """
+    JSON 문서 로드 (파일이 바뀌지 않았으면 캐시 사용, 반환값은 수정하지 않음)
+    """
+    if not os.path.exists(file_path):
+        raise HTTPException(status_code=404, detail=not_found)
+    return json_files.load(file_path)
+
+def query_document(content, path: str = None, fields: str = None, filters: list = None, q: str = None,
+                   offset: int = 0, limit: int = 50):
+    """
+    문서 조회 옵션 적용
+    - 옵션이 없으면 문서 전체
+    - path가 있으면 해당 리스트를 필터링(filter=pointer=value, q=검색어) 후 offset/limit 페이지로 반환
+    - path 없이 fields만 있으면 문서에서 해당 경로의 값만 반환 ({pointer: 값})
+    fields는 쉼표로 구분한 JSON pointer 목록
+    """
+    pointers = [field for field in (fields or '').split(',') if field] or None
+    if not 1 <= limit <= 1000 or offset < 0:
+        raise HTTPException(status_code=400, detail="limit은 1~1000, offset은 0 이상이어야 합니다.")
+    try:
+        if path is not None:
+            return page_items(content, path, offset=offset, limit=limit, fields=pointers, filters=filters, query=q)
+        if filters or q:
+            raise PointerError("filter/q에는 path가 필요합니다.")
+        if pointers:
+            return project(content, pointers)
+    except PointerError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return content
+
+def paginate_listing(entries: list, offset: int, limit: int) -> list:
+    if not 1 <= limit <= 1000 or offset < 0:
+        raise HTTPException(status_code=400, detail="limit은 1~1000, offset은 0 이상이어야 합니다.")
+    return entries[offset:offset + limit]
+
 @app.get("/datasets")
-def list_datasets():
+def list_datasets(summary: bool = False):
+    """
+    데이터셋 버전/파일 목록 (summary=true이면 파일별 제목/진영 수/의견 수/크기 포함, 파일이 바뀔 때만 다시 읽음)
+    """
     dataset_dir = os.path.join(os.path.dirname(__file__), '../dataset')
     result = []
     for version in sorted(os.listdir(dataset_dir)):
         version_path = os.path.join(dataset_dir, version)
         if os.path.isdir(version_path):
-            files = [f for f in os.listdir(version_path) if f.endswith('.json')]
-            result.append({"version": version, "files": files})
+            files = sorted(f for f in os.listdir(version_path) if f.endswith(('.json', JSONL_EXTENSION)))
+            entry = {"version": version, "files": files}
+            if summary:
+                entry["summaries"] = {f: dataset_summaries.get(os.path.join(version_path, f)) for f in files}
+            result.append(entry)
     return {"datasets": result}
 
 # 데이터셋 파일 내용 조회
 @app.get("/datasets/{version}/{filename}")
-def get_dataset(version: str, filename: str):
+def get_dataset(version: str, filename: str, path: str = None, fields: str = None,
+                filter: list[str] = Query(None), q: str = None, offset: int = 0, limit: int = 50):
+    """
+    데이터셋 파일 조회 (옵션은 query_document 참고)
+    예) ?fields=/topic/title,/topic/camps  ?path=/topic/posts&filter=/camp_id=...&limit=20
+    JSONL 데이터셋은 의견을 포함하지 않은 헤더({"topic": ...})를 반환하며, 의견은 path=/topic/posts로 줄 단위로 읽어 페이지 조회
+    """
     dataset_dir = os.path.join(os.path.dirname(__file__), f'../dataset/{version}')
     file_path = os.path.join(dataset_dir, filename)
+    if filename.endswith(JSONL_EXTENSION):
+        return ApiJSONResponse(query_jsonl_dataset(file_path, path, fields, filter, q, offset, limit))
+    content = load_document(file_path, "Dataset file not found")
+    return ApiJSONResponse(query_document(content, path, fields, filter, q, offset, limit))
+
+def query_jsonl_dataset(file_path: str, path: str = None, fields: str = None, filters: list = None, q: str = None,
+                        offset: int = 0, limit: int = 50):
+    """
+    JSONL 데이터셋 조회 (파일 전체를 읽지 않고 헤더 또는 의견 페이지만 반환)
+    """
     if not os.path.exists(file_path):
         raise HTTPException(status_code=404, detail="Dataset file not found")
-    with open(file_path, encoding='utf-8') as f:
-        content = json.load(f)
-    return content
+    try:
+        header, posts = open_jsonl_dataset(file_path)
+        if path != '/topic/posts':
+            posts.close()
+            return query_document({"topic": header}, path, fields, filters, q, offset, limit)
+        if not 1 <= limit <= 1000 or offset < 0:
+            raise HTTPException(status_code=400, detail="limit은 1~1000, offset은 0 이상이어야 합니다.")
+        pointers = [field for field in (fields or '').split(',') if field] or None
+        with posts:
+            return page_iter(posts, path, offset=offset, limit=limit, fields=pointers, filters=filters, query=q)
+    except (DatasetFormatError, PointerError) as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+# 데이터셋 입력 형식 (JSON schema)
+@app.get("/datasets/schema")
+def get_dataset_schema():
+    return DATASET_SCHEMA
 
 # 데이터셋 추가
 @app.post("/datasets/{version}")
 def add_dataset(version: str, filename: str = Form(...), content: str = Form(...)):
+    """
+    데이터셋 업로드
+    - DATASET_SCHEMA (AiJudge 입력 형식) 검사
+    - 같은 버전 폴더의 다른 파일과 최상위 키 구조 비교 (폴더별 색인 사용, 파일을 다시 읽지 않음)
+    """
     if not filename.endswith('.json'):
         raise HTTPException(status_code=400, detail="파일명은 .json으로 끝나야 합니다.")
     dataset_dir = os.path.join(os.path.dirname(__file__), f'../dataset/{version}')
@@ -107,55 +309,60 @@ def add_dataset(version: str, filename: str = Form(...), content: str = Form(...
     file_path = os.path.join(dataset_dir, filename)
     if os.path.exists(file_path):
         raise HTTPException(status_code=409, detail="이미 존재하는 파일명입니다.")
+    try:
+        new_data = loads(content)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=f"JSON 형식이 아닙니다: {e}")
+    errors = validate_dataset(new_data)
+    if errors:
+        raise HTTPException(status_code=400, detail={"message": "데이터셋 형식이 올바르지 않습니다.", "errors": errors})
     # 스키마 검사: 같은 폴더 내 다른 파일과 키 구조 비교
-    import json
-    new_data = json.loads(content)
-    for f in os.listdir(dataset_dir):
-        if f.endswith('.json') and f != filename:
-            with open(os.path.join(dataset_dir, f), encoding='utf-8') as ref:
-                try:
-                    ref_data = json.load(ref)
-                    if isinstance(ref_data, list) and isinstance(new_data, list) and ref_data and new_data:
-                        if set(ref_data[0].keys()) != set(new_data[0].keys()):
-                            raise HTTPException(status_code=400, detail=f"스키마 불일치: {f}와(과) 다름")
-                    elif isinstance(ref_data, dict) and isinstance(new_data, dict):
-                        if set(ref_data.keys()) != set(new_data.keys()):
-                            raise HTTPException(status_code=400, detail=f"스키마 불일치: {f}와(과) 다름")
-                except Exception as e:
-                    continue
+    mismatch = dataset_schemas.check(dataset_dir, new_data)
+    if mismatch:
+        raise HTTPException(status_code=400, detail=mismatch)
     with open(file_path, 'w', encoding='utf-8') as f:
         f.write(content)
+    dataset_schemas.add(dataset_dir, filename, new_data)
     return {"success": True, "filename": filename}
 
 # 결과 파일 리스트 및 내용 조회 (결과는 playground/results/에 저장한다고 가정)
 @app.get("/results")
-def list_results():
+def list_results(summary: bool = False, q: str = None, offset: int = 0, limit: int = 1000):
+    """
+    결과 파일 목록 (최신순, q: 파일명 검색, offset/limit: 페이지)
+    summary=true이면 파일별 주제/승리 진영/프롬프트/실행 시간/비용 요약 포함 (파일이 바뀔 때만 다시 읽음)
+    """
     results_dir = os.path.join(os.path.dirname(__file__), 'results')
     if not os.path.exists(results_dir):
         os.makedirs(results_dir)
-    files = [f for f in os.listdir(results_dir) if f.endswith('.json')]
-    return {"results": files}
+    files = [f for f in os.listdir(results_dir) if f.endswith('.json') and (not q or q.lower() in f.lower())]
+    files.sort(key=lambda f: os.path.getmtime(os.path.join(results_dir, f)), reverse=True)
+    page = paginate_listing(files, offset, limit)
+    response = {"results": page, "total": len(files), "offset": offset, "limit": limit}
+    if summary:
+        response["summaries"] = {f: result_summaries.get(os.path.join(results_dir, f)) for f in page}
+    return response
 
 @app.get("/results/{filename}")
-def get_result(filename: str):
+def get_result(filename: str, path: str = None, fields: str = None,
+               filter: list[str] = Query(None), q: str = None, offset: int = 0, limit: int = 50):
+    """
+    결과 파일 조회 (옵션은 query_document 참고)
+    예) ?fields=/win_camp_id,/ai_conclusion,/metadata/trace/total
+    """
     results_dir = os.path.join(os.path.dirname(__file__), 'results')
-    file_path = os.path.join(results_dir, filename)
-    if not os.path.exists(file_path):
-        raise HTTPException(status_code=404, detail="Result file not found")
-    with open(file_path, encoding='utf-8') as f:
-        content = json.load(f)
-    return content
+    content = load_document(os.path.join(results_dir, filename), "Result file not found")
+    return ApiJSONResponse(query_document(content, path, fields, filter, q, offset, limit))
 
-@app.post("/run_judge")
-def run_judge(request: dict):
+def prepare_run_judge(request: dict) -> dict:
     """
-    프롬프트 파일명(prompt_filename)과 데이터셋 버전/파일명(dataset_version, dataset_filename)을 받아 judge 실행 후 결과를 저장하고 반환
-    result_file 파라미터가 있으면 해당 이름으로 결과를 저장한다.
+    run_judge 요청 검증 및 데이터셋 로드 (잘못된 요청은 작업 등록 전에 HTTPException)
     """
     prompt_filename = request.get('prompt_filename')
     dataset_version = request.get('dataset_version')
     dataset_filename = request.get('dataset_filename')
     result_file = request.get('result_file')
+    config = with_llm_priority(build_judge_config(prompt_filename, request.get('config')), request, 'interactive')
 
     # 파일 경로
     prompt_dir = os.path.join(os.path.dirname(__file__), '../lib/oracle_mvp_ai/prompt_metadata')
@@ -173,66 +380,89 @@ def run_judge(request: dict):
     if not os.path.exists(dataset_path):
         raise HTTPException(status_code=404, detail="Dataset file not found")
 
-    # 데이터셋 로드 및 ObjectId 필드 감싸기
-    def convert_oid_fields(obj):
-        if isinstance(obj, dict):
-            new_obj = {}
-            for k, v in obj.items():
-                if k in ['_id', 'id', 'user_id', 'topic_id']:
-                    # ObjectId로 감싸기
-                    new_obj[k] = ObjectId(v)
-                else:
-                    new_obj[k] = convert_oid_fields(v)
-            return new_obj
-        elif isinstance(obj, list):
-            return [convert_oid_fields(item) for item in obj]
+    # 데이터셋 로드 (ObjectId 필드를 감싼 형태, 파일이 바뀌지 않았으면 캐시 사용)
+    # JSONL은 실행할 때 의견을 줄 단위로 읽으므로 여기서는 헤더 형식만 확인
+    # 아이디가 ObjectId 형식이 아니면 (백엔드 입력과 다른 형태) 400
+    dataset = None
+    stream_path = None
+    try:
+        if dataset_path.endswith(JSONL_EXTENSION):
+            header, posts = open_jsonl_dataset(dataset_path)
+            posts.close()
+            wrap_object_ids(header)
+            stream_path = dataset_path
         else:
-            return obj
-
-    with open(dataset_path, encoding='utf-8') as f:
-        dataset = json.load(f)
-        dataset = convert_oid_fields(dataset)
-
-    # judge 실행 (비동기)
-    loop = asyncio.new_event_loop()
-    asyncio.set_event_loop(loop)
-    result = loop.run_until_complete(ai_judge.judge(dataset))
-    loop.close()
+            dataset = json_files.load(dataset_path, object_ids=True)
+    except DatasetFormatError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except InvalidId as e:
+        raise HTTPException(status_code=400, detail=f"ObjectId 형식이 아닌 아이디가 있습니다: {e}")
 
-    # 결과 저장 (사용자 지정 파일명 우선)
+    # 결과 파일명 (사용자 지정 파일명 우선)
     if result_file and result_file.endswith('.json'):
         result_filename = result_file
     else:
         result_filename = f"{os.path.splitext(prompt_filename)[0]}_{dataset_version}_{os.path.splitext(dataset_filename)[0]}.json"
-    result_path = os.path.join(results_dir, result_filename)
-
-    # ObjectId를 문자열로 변환하는 함수
-    def convert_objectid_to_str(obj):
-        if isinstance(obj, dict):
-            return {k: convert_objectid_to_str(v) for k, v in obj.items()}
-        elif isinstance(obj, list):
-            return [convert_objectid_to_str(item) for item in obj]
-        elif isinstance(obj, ObjectId):
-            return str(obj)
-        else:
-            return obj
-
-    # 결과 내 ObjectId를 문자열로 변환
-    result_for_json = convert_objectid_to_str(result)
-
-    with open(result_path, 'w', encoding='utf-8') as f:
-        json.dump(result_for_json, f, ensure_ascii=False, indent=2)
+    return {
+        "prompt_filename": prompt_filename,
+        "dataset_version": dataset_version,
+        "dataset_filename": dataset_filename,
+        "config": config,
+        "dataset": dataset,
+        "stream_path": stream_path,
+        "result_filename": result_filename,
+        "result_path": os.path.join(results_dir, result_filename)
+    }
+
+async def execute_run_judge(run: dict) -> dict:
+    """
+    judge 실행 후 결과 저장
+    """
+    if run.get("stream_path"):
+        header, posts = open_jsonl_dataset(run["stream_path"])
+        with posts:
+            result = await ai_judge.judge_stream(
+                wrap_object_ids(header), (wrap_object_ids(post) for post in posts), run["config"]
+            )
+    else:
+        result = await ai_judge.judge(run["dataset"], run["config"])
+    # ObjectId는 직렬화할 때 문자열로 변환
+    await asyncio.to_thread(write_json, run["result_path"], result)
+    await asyncio.to_thread(
+        experiment_store.record_run, "judge", run["result_filename"], run, [result], config=run["config"].to_dict()
+    )
+    return {"result": result, "result_file": run["result_filename"]}
 
-    return {"result": result_for_json, "result_file": result_filename}
+@app.post("/run_judge")
+async def run_judge(request: dict, http_request: Request):
+    """
+    프롬프트 파일명(prompt_filename)과 데이터셋 버전/파일명(dataset_version, dataset_filename)을 받아 judge 실행 후 결과를 저장하고 반환
+    result_file 파라미터가 있으면 해당 이름으로 결과를 저장한다.
+    config 파라미터(dict)로 JudgeConfig 옵션(final_judgement_provider, profile 등)을 요청별로 지정할 수 있다.
+    오래 걸리는 판결은 POST /jobs/run_judge로 등록하고 GET /jobs/{job_id}로 조회하는 것을 권장
+    작업 큐를 거쳐 실행하므로 (기본 우선순위 interactive) 큐가 가득 차면 429와 Retry-After를 반환
+    """
+    # 데이터셋 읽기/디코딩/ObjectId 변환은 이벤트 루프 밖에서 실행
+    run = await asyncio.to_thread(prepare_run_judge, request)
+    return ApiJSONResponse(await run_admitted(
+        "run_judge", lambda job: execute_run_judge(run), request, http_request, default_priority="interactive"
+    ))
 
-@app.post('/run_consistency')
-async def run_consistency(request: Request):
-    data = await request.json()
+def prepare_run_consistency(data: dict) -> dict:
+    """
+    run_consistency 요청 검증 및 데이터셋 로드
+    """
     prompt_filename = data['prompt_filename']
     dataset_version = data['dataset_version']
     dataset_filename = data['dataset_filename']
     result_file = data['result_file']
     n = int(data.get('n', 5))
+    # "final": 최종 판결의 변동만 측정 (기본), "full": 임베딩/신뢰도 검사 등 앞 단계의 변동까지 측정
+    mode = data.get('mode', 'final')
+    if mode not in CONSISTENCY_MODES:
+        raise HTTPException(status_code=400, detail=f"mode는 {CONSISTENCY_MODES} 중 하나여야 합니다.")
+    # 일관성 측정은 매번 새로 판결해야 하므로 결과 캐시를 사용하지 않음
+    config = with_llm_priority(build_judge_config(prompt_filename, data.get('config')), data, 'bulk').replace(use_cache=False)
 
     # 결과 저장 폴더 생성
     result_dir = os.path.join('playground', 'results', 'consistency')
@@ -244,36 +474,223 @@ async def run_consistency(request: Request):
     dataset_path = os.path.join(dataset_dir, dataset_filename)
     if not os.path.exists(dataset_path):
         raise HTTPException(status_code=404, detail="Dataset file not found")
-    with open(dataset_path, encoding='utf-8') as f:
-        dataset = json.load(f)
-
-    # N회 실행 결과 저장 (비동기 호출)
-    results = []
-    for i in range(n):
-        result = await ai_judge.judge(dataset)
-        results.append(result)
+    if dataset_path.endswith(JSONL_EXTENSION):
+        # 일관성 측정은 같은 입력을 여러 번 판결하므로 전체 의견이 필요
+        raise HTTPException(status_code=400, detail="JSONL 데이터셋은 일관성 측정을 지원하지 않습니다.")
+    dataset = json_files.load(dataset_path)
+    return {
+        'prompt_filename': prompt_filename,
+        'dataset_version': dataset_version,
+        'dataset_filename': dataset_filename,
+        'n': n,
+        'mode': mode,
+        'config': config,
+        'dataset': dataset,
+        'result_path': result_path
+    }
+
+async def execute_run_consistency(run: dict, on_progress=None) -> dict:
+    """
+    N회 판결 후 일관성 지표 계산 및 저장 (on_progress(완료 횟수, N)로 진행 상황 전달)
+    """
+    n = run['n']
+    # 최종 판결 N회를 동시에 실행 (mode="full"이면 앞 단계까지 N회 반복)
+    results = await ai_judge.judge_consistency(run['dataset'], n, run['config'], mode=run['mode'], on_progress=on_progress)
 
     # 지표 계산
-    metrics_result = metrics.calculate_consistency_metrics(results)
+    metrics_result = await cpu_pool.consistency_metrics(results)
 
     # 파일 저장
-    with open(result_path, 'w', encoding='utf-8') as f:
-        json.dump({
-            'prompt_filename': prompt_filename,
-            'dataset_version': dataset_version,
-            'dataset_filename': dataset_filename,
-            'n': n,
-            'results': results,
-            'metrics': metrics_result
-        }, f, ensure_ascii=False, indent=2)
-
-    return JSONResponse({
-        'result_file': os.path.basename(result_path),
+    await asyncio.to_thread(write_json, run['result_path'], {
+        'prompt_filename': run['prompt_filename'],
+        'dataset_version': run['dataset_version'],
+        'dataset_filename': run['dataset_filename'],
+        'n': n,
+        'mode': run['mode'],
+        'results': results,
         'metrics': metrics_result
     })
+    await asyncio.to_thread(
+        experiment_store.record_run, "consistency", os.path.basename(run['result_path']), run, results,
+        metrics_result, config=run['config'].to_dict()
+    )
+
+    return {
+        'result_file': os.path.basename(run['result_path']),
+        'metrics': metrics_result
+    }
+
+@app.post('/run_consistency')
+async def run_consistency(request: Request):
+    data = await request.json()
+    run = await asyncio.to_thread(prepare_run_consistency, data)
+    return ApiJSONResponse(await run_admitted(
+        "run_consistency", lambda job: execute_run_consistency(run), data, request, default_priority="bulk"
+    ))
+
+# 판결 작업 큐 (백그라운드 작업과 동기 /run_judge, /run_consistency 모두 이 큐를 거쳐 동시 실행 수를 제한)
+# JUDGE_JOB_WORKERS: 동시에 실행할 판결 수, JUDGE_JOB_MAX_PENDING: 대기 작업 최대 수,
+# JUDGE_CLIENT_MAX_ACTIVE: 클라이언트(X-Client-Id 헤더, 없으면 IP)별 대기/실행 중인 작업 최대 수
+JUDGE_JOB_WORKERS = int(os.getenv("JUDGE_JOB_WORKERS", "4"))
+JUDGE_JOB_MAX_PENDING = int(os.getenv("JUDGE_JOB_MAX_PENDING", "100"))
+JUDGE_CLIENT_MAX_ACTIVE = int(os.getenv("JUDGE_CLIENT_MAX_ACTIVE", "8"))
+job_queue = JobQueue(num_workers=JUDGE_JOB_WORKERS, max_pending=JUDGE_JOB_MAX_PENDING,
+                     max_per_client=JUDGE_CLIENT_MAX_ACTIVE or None)
+
+@app.on_event("startup")
+async def start_job_workers():
+    job_queue.start()
+
+@app.on_event("shutdown")
+async def stop_job_workers():
+    await job_queue.stop()
+
+def client_id(http_request: Request) -> str:
+    return http_request.headers.get("x-client-id") or (http_request.client.host if http_request.client else "unknown")
+
+def admit_job(kind: str, run, request: dict, http_request: Request, default_priority: str = "normal"):
+    """
+    작업 큐에 등록 (요청의 priority: interactive/normal/bulk)
+    큐가 가득 찼거나 클라이언트의 작업이 너무 많으면 429와 예상 대기 시간(Retry-After)을 반환
+    """
+    priority = request.get('priority') or default_priority
+    if priority not in PRIORITIES:
+        raise HTTPException(status_code=400, detail=f"priority는 {tuple(PRIORITIES)} 중 하나여야 합니다.")
+    try:
+        return job_queue.submit(kind, run, job_params(request), priority=priority, client=client_id(http_request))
+    except JobQueueFull as e:
+        raise HTTPException(status_code=429, detail=str(e), headers={"Retry-After": str(math.ceil(e.retry_after))})
+
+async def run_admitted(kind: str, run, request: dict, http_request: Request, default_priority: str = "interactive") -> dict:
+    """
+    작업 큐에 등록하고 끝날 때까지 기다린 뒤 결과 반환 (동기 엔드포인트용)
+    """
+    job = await job_queue.wait(admit_job(kind, run, request, http_request, default_priority).id)
+    if job.status == SUCCEEDED:
+        return job.result
+    if job.status == CANCELLED:
+        raise HTTPException(status_code=409, detail="Job cancelled")
+    raise HTTPException(status_code=500, detail=job.error)
+
+def submit_job(kind: str, run, request: dict, http_request: Request, default_priority: str = "normal") -> JSONResponse:
+    job = admit_job(kind, run, request, http_request, default_priority)
+    return JSONResponse({"job_id": job.id, "status": job.status, "priority": job.priority}, status_code=202)
+
+def job_params(request: dict) -> dict:
+    # 작업 목록에 표시할 요청 정보
+    return {key: request.get(key) for key in ('prompt_filename', 'dataset_version', 'dataset_filename', 'result_file', 'n', 'mode') if key in request}
+
+@app.post("/jobs/run_judge")
+async def submit_run_judge(request: dict, http_request: Request):
+    """
+    run_judge를 백그라운드 작업으로 등록하고 job_id 반환 (202, priority 기본값 normal)
+    """
+    run = await asyncio.to_thread(prepare_run_judge, request)
+    return submit_job("run_judge", lambda job: execute_run_judge(run), request, http_request)
+
+@app.post("/jobs/run_consistency")
+async def submit_run_consistency(request: dict, http_request: Request):
+    """
+    run_consistency를 백그라운드 작업으로 등록하고 job_id 반환 (202, priority 기본값 bulk), 진행 상황은 progress.completed/total
+    """
+    run = await asyncio.to_thread(prepare_run_consistency, request)
+    return submit_job(
+        "run_consistency",
+        lambda job: execute_run_consistency(run, on_progress=lambda done, total: job.set_progress(completed=done, total=total)),
+        request, http_request, default_priority="bulk"
+    )
+
+@app.get("/jobs")
+def list_jobs(status: str = None):
+    return {"jobs": [job.to_dict(include_result=False) for job in job_queue.list(status)]}
+
+@app.get("/jobs/{job_id}")
+def get_job(job_id: str):
+    job = job_queue.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return ApiJSONResponse(job.to_dict())
+
+@app.get("/jobs/{job_id}/events")
+async def job_events(job_id: str):
+    """
+    작업 상태 변경을 Server-Sent Events로 전송 (끝나면 결과를 포함한 마지막 이벤트 후 종료)
+    """
+    if job_queue.get(job_id) is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+
+    async def events():
+        async for state in job_queue.subscribe(job_id, timeout=15):
+            yield b"data: " + dumps(state) + b"\n\n"
+
+    return StreamingResponse(events(), media_type="text/event-stream")
+
+@app.delete("/jobs/{job_id}")
+def cancel_job(job_id: str):
+    if job_queue.get(job_id) is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    if not job_queue.cancel(job_id):
+        raise HTTPException(status_code=409, detail="Job already finished")
+    return {"job_id": job_id, "cancelled": True}
+
+# 기존 JSON 결과 파일을 저장소로 가져오기 (이미 가져온 파일은 건너뜀)
+@app.on_event("startup")
+async def import_existing_results():
+    results_dir = os.path.join(os.path.dirname(__file__), 'results')
+    imported = await asyncio.to_thread(experiment_store.import_json_results, results_dir)
+    if imported:
+        logger.info(f"Imported {imported} result files into {EXPERIMENT_DB_PATH}")
+
+@app.get("/runs")
+def list_runs(kind: str = None, prompt_filename: str = None, dataset_version: str = None, dataset_filename: str = None,
+              provider: str = None, mode: str = None, topic_id: str = None, since: float = None, until: float = None,
+              limit: int = 50, offset: int = 0):
+    """
+    실행 목록 (최신순) - 종류/프롬프트/데이터셋/모델/주제/기간으로 필터링, limit/offset으로 페이지 조회
+    """
+    if not 1 <= limit <= 500 or offset < 0:
+        raise HTTPException(status_code=400, detail="limit은 1~500, offset은 0 이상이어야 합니다.")
+    return experiment_store.list_runs(
+        limit=limit, offset=offset, topic_id=topic_id, since=since, until=until, kind=kind,
+        prompt_filename=prompt_filename, dataset_version=dataset_version, dataset_filename=dataset_filename,
+        provider=provider, mode=mode
+    )
+
+@app.get("/runs/{run_id}")
+def get_run(run_id: int):
+    run = experiment_store.get_run(run_id)
+    if run is None:
+        raise HTTPException(status_code=404, detail="Run not found")
+    return run
+
+@app.get("/runs/{run_id}/results")
+def get_run_results(run_id: int, limit: int = 50, offset: int = 0, fields: str = None):
+    """
+    실행의 판결 결과 (fields: 결과마다 반환할 JSON pointer 목록, 쉼표로 구분)
+    """
+    if experiment_store.get_run(run_id) is None:
+        raise HTTPException(status_code=404, detail="Run not found")
+    if not 1 <= limit <= 500 or offset < 0:
+        raise HTTPException(status_code=400, detail="limit은 1~500, offset은 0 이상이어야 합니다.")
+    page = experiment_store.list_results(run_id, limit=limit, offset=offset)
+    pointers = [field for field in (fields or '').split(',') if field]
+    if pointers:
+        try:
+            page["results"] = [{"index": result["index"], **project(result, pointers)} for result in page["results"]]
+        except PointerError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+    return page
+
+@app.post("/runs/import")
+def import_runs(overwrite: bool = False):
+    """
+    playground/results의 JSON 결과 파일을 저장소로 다시 가져오기
+    """
+    results_dir = os.path.join(os.path.dirname(__file__), 'results')
+    return {"imported": experiment_store.import_json_results(results_dir, overwrite=overwrite)}
 
 @app.post('/recalc_consistency')
-def recalc_consistency(request: dict):
+async def recalc_consistency(request: dict):
     """
     결과 파일명을 받아서, 해당 파일의 원본 결과(results)로 지표만 다시 계산해서 반환
     """
@@ -282,10 +699,68 @@ def recalc_consistency(request: dict):
     result_path = os.path.join(result_dir, result_file)
     if not os.path.exists(result_path):
         raise HTTPException(status_code=404, detail="Result file not found")
-    with open(result_path, encoding='utf-8') as f:
-        data = json.load(f)
+    data = await asyncio.to_thread(json_files.load, result_path)
     results = data.get('results', [])
-    metrics_result = metrics.calculate_consistency_metrics(results)
+    metrics_result = await cpu_pool.consistency_metrics(results)
     return {"metrics": metrics_result}
 
+# 시작 시 준비 (warm-up): 첫 요청이 SDK 초기화/프롬프트 파싱/TLS 연결/토크나이저 로드 비용을 내지 않도록 미리 실행
+# WARMUP_REQUIRED_PROVIDERS의 연결 준비가 실패하면 준비되지 않은 상태로 두고 WARMUP_RETRY_SECONDS마다 다시 시도
+WARMUP_TIMEOUT_SECONDS = float(os.getenv("WARMUP_TIMEOUT_SECONDS", "30"))
+WARMUP_RETRY_SECONDS = float(os.getenv("WARMUP_RETRY_SECONDS", "30"))
+WARMUP_REQUIRED_PROVIDERS = [p for p in os.getenv("WARMUP_REQUIRED_PROVIDERS", "openai").split(",") if p]
+warmup = WarmUp(timeout=WARMUP_TIMEOUT_SECONDS)
+
+async def warm_prompts():
+    # 모든 프롬프트 버전을 읽고 템플릿을 파싱하여 레지스트리 캐시에 올림
+    registry = ai_judge.prompt_registry
+    await asyncio.to_thread(lambda: [registry.get(filename) for filename in registry.list()])
 
+async def warm_datasets():
+    # 데이터셋 요약/디코딩 캐시 채우기
+    dataset_dir = os.path.join(os.path.dirname(__file__), '../dataset')
+    paths = [
+        os.path.join(dataset_dir, version, f)
+        for version in os.listdir(dataset_dir) if os.path.isdir(os.path.join(dataset_dir, version))
+        for f in os.listdir(os.path.join(dataset_dir, version)) if f.endswith(('.json', JSONL_EXTENSION))
+    ]
+    await asyncio.to_thread(lambda: [dataset_summaries.get(path) for path in paths])
+
+async def warm_compute():
+    # 토크나이저 로드, sklearn/numpy 첫 실행 (일관성 지표 계산 경로)
+    def run():
+        count_tokens("warm up")
+        metrics.calculate_consistency_metrics([
+            {"win_camp_id": "a", "ai_conclusion": "warm up", "judgement_percentage": [{"percentage": 50}]},
+            {"win_camp_id": "a", "ai_conclusion": "warm up run", "judgement_percentage": [{"percentage": 50}]}
+        ])
+    await asyncio.to_thread(run)
+
+warmup.add("prompts", warm_prompts)
+warmup.add("datasets", warm_datasets)
+warmup.add("compute", warm_compute)
+# 작업 프로세스 시작과 모듈 import
+warmup.add("cpu_pool", cpu_pool.start)
+for provider in ("openai", "anthropic", "google"):
+    warmup.add(f"provider:{provider}", ai_judge._get_client(provider).warm_up, required=provider in WARMUP_REQUIRED_PROVIDERS)
+
+@app.on_event("startup")
+async def start_warmup():
+    async def run():
+        await warmup.run()
+        while not warmup.ready:
+            await asyncio.sleep(WARMUP_RETRY_SECONDS)
+            await warmup.run(warmup.failed_steps())
+    asyncio.create_task(run())
+
+@app.on_event("shutdown")
+def stop_cpu_pool():
+    cpu_pool.shutdown()
+
+@app.get("/ready")
+def ready():
+    """
+    준비 상태 (warm-up의 필수 단계가 모두 끝났으면 200, 아니면 503과 단계별 상태)
+    로드 밸런서/오토스케일러의 readiness probe로 사용
+    """
+    return JSONResponse(warmup.to_dict(), status_code=200 if warmup.ready else 503)
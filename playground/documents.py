@@ -0,0 +1,218 @@
+import json
+import os
+import threading
+from typing import Dict, Any, Optional, List, Callable, Tuple, Iterable
+
+
+class PointerError(ValueError):
+    """
+    JSON pointer 문법 오류 또는 문서에 없는 경로
+    """
+    pass
+
+
+_MISSING = object()
+
+
+def parse_pointer(pointer: str) -> List[str]:
+    """
+    JSON pointer (RFC 6901)를 토큰 리스트로 변환 ("/topic/posts/0" -> ["topic", "posts", "0"])
+    """
+    if pointer == "":
+        return []
+    if not pointer.startswith("/"):
+        raise PointerError(f"JSON pointer must start with '/': {pointer!r}")
+    return [token.replace("~1", "/").replace("~0", "~") for token in pointer[1:].split("/")]
+
+
+def resolve_pointer(doc: Any, pointer: str, default: Any = _MISSING) -> Any:
+    """
+    문서에서 JSON pointer 위치의 값 반환 (없으면 default, default가 없으면 PointerError)
+    """
+    value = doc
+    for token in parse_pointer(pointer):
+        if isinstance(value, dict) and token in value:
+            value = value[token]
+        elif isinstance(value, list) and token.isdigit() and int(token) < len(value):
+            value = value[int(token)]
+        else:
+            if default is _MISSING:
+                raise PointerError(f"Path not found: {pointer}")
+            return default
+    return value
+
+
+def project(doc: Any, pointers: List[str]) -> Dict[str, Any]:
+    """
+    요청한 경로의 값만 반환 ({pointer: 값}, 없는 경로는 None)
+    """
+    return {pointer: resolve_pointer(doc, pointer, None) for pointer in pointers}
+
+
+def parse_filters(filters: List[str]) -> List[Tuple[str, str]]:
+    """
+    "pointer=value" 형식의 필터를 (pointer, value)로 변환
+    """
+    parsed = []
+    for item in filters:
+        pointer, sep, value = item.partition("=")
+        if not sep:
+            raise PointerError(f"Filter must be 'pointer=value': {item!r}")
+        parse_pointer(pointer)
+        parsed.append((pointer, value))
+    return parsed
+
+
+def _matches(item: Any, filters: List[Tuple[str, str]], query: Optional[str]) -> bool:
+    for pointer, expected in filters:
+        value = resolve_pointer(item, pointer, None)
+        if value is None or str(value) != expected:
+            return False
+    if query:
+        return query.lower() in json.dumps(item, ensure_ascii=False, default=str).lower()
+    return True
+
+
+def page_items(doc: Any, path: str, offset: int = 0, limit: int = 50, fields: Optional[List[str]] = None,
+               filters: Optional[List[str]] = None, query: Optional[str] = None) -> Dict[str, Any]:
+    """
+    문서 안의 리스트(path)를 필터링 후 페이지 단위로 반환
+
+    Args:
+        doc: 문서
+        path: 리스트 위치 (JSON pointer)
+        offset, limit: 페이지
+        fields: 항목마다 반환할 경로 (없으면 항목 전체)
+        filters: 항목 기준 "pointer=value" 일치 조건
+        query: 항목 JSON에 포함되어야 하는 문자열 (대소문자 무시)
+
+    Returns:
+        {"path", "total": 조건에 맞는 항목 수, "offset", "limit", "items": [{"index": 원래 위치, ...}]}
+    """
+    items = resolve_pointer(doc, path)
+    if not isinstance(items, list):
+        raise PointerError(f"Path is not a list: {path}")
+    return page_iter(items, path, offset, limit, fields, filters, query)
+
+
+def page_iter(items: Iterable[Any], path: str, offset: int = 0, limit: int = 50, fields: Optional[List[str]] = None,
+              filters: Optional[List[str]] = None, query: Optional[str] = None) -> Dict[str, Any]:
+    """
+    page_items와 같지만 항목을 iterable로 받아 한 번만 순회 (JSONL 파일처럼 전체를 메모리에 올리지 않을 때)
+
+    페이지에 들어가는 항목만 보관하고 나머지는 개수만 셉니다.
+    """
+    parsed = parse_filters(filters or [])
+    total = 0
+    page = []
+    for i, item in enumerate(items):
+        if not _matches(item, parsed, query):
+            continue
+        if offset <= total < offset + limit:
+            page.append((i, item))
+        total += 1
+    return {
+        "path": path,
+        "total": total,
+        "offset": offset,
+        "limit": limit,
+        "items": [
+            {"index": i, **(project(item, fields) if fields else {"value": item})}
+            for i, item in page
+        ]
+    }
+
+
+class SummaryCache:
+    """
+    파일별 요약 메타데이터 캐시 (파일 수정 시각/크기가 바뀌면 다시 계산)
+
+    목록 조회 때마다 모든 파일을 읽지 않도록 summarize(path) 결과를 보관합니다.
+    """
+    def __init__(self, summarize: Callable[[str], Dict[str, Any]]):
+        self.summarize = summarize
+        self._entries: Dict[str, Tuple[Tuple[float, int], Dict[str, Any]]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, path: str) -> Dict[str, Any]:
+        stat = os.stat(path)
+        key = (stat.st_mtime, stat.st_size)
+        with self._lock:
+            entry = self._entries.get(path)
+        if entry is not None and entry[0] == key:
+            return entry[1]
+        try:
+            summary = self.summarize(path)
+        except (OSError, ValueError) as e:
+            summary = {"error": str(e)}
+        summary = {"size": stat.st_size, "mtime": stat.st_mtime, **summary}
+        with self._lock:
+            self._entries[path] = (key, summary)
+        return summary
+
+
+class DatasetSchemaIndex:
+    """
+    버전 폴더별 데이터셋 키 구조 색인 ({키 구조: [파일명]})
+
+    업로드할 때마다 폴더의 모든 파일을 읽지 않도록 처음 한 번만 색인을 만들고 이후에는 add()로 갱신합니다.
+    폴더 수정 시각이 바뀌면 (업로드 외의 방법으로 파일이 추가/삭제된 경우) 다시 만듭니다.
+    """
+    def __init__(self, load: Callable[[str], Any], signature: Callable[[Any], Tuple[str, ...]]):
+        self.load = load
+        self.signature = signature
+        self._versions: Dict[str, Tuple[int, Dict[Tuple[str, ...], List[str]]]] = {}
+        self._lock = threading.Lock()
+
+    def _build(self, version_dir: str) -> Dict[Tuple[str, ...], List[str]]:
+        signatures: Dict[Tuple[str, ...], List[str]] = {}
+        for filename in sorted(os.listdir(version_dir)):
+            if not filename.endswith(".json"):
+                continue
+            try:
+                content = self.load(os.path.join(version_dir, filename))
+            except (OSError, ValueError):
+                # 읽을 수 없는 파일은 비교 대상에서 제외
+                continue
+            signatures.setdefault(self.signature(content), []).append(filename)
+        return signatures
+
+    def get(self, version_dir: str) -> Dict[Tuple[str, ...], List[str]]:
+        if not os.path.isdir(version_dir):
+            return {}
+        mtime = os.stat(version_dir).st_mtime_ns
+        with self._lock:
+            entry = self._versions.get(version_dir)
+            if entry is not None and entry[0] == mtime:
+                return entry[1]
+        signatures = self._build(version_dir)
+        with self._lock:
+            self._versions[version_dir] = (mtime, signatures)
+        return signatures
+
+    def check(self, version_dir: str, content: Any) -> Optional[str]:
+        """
+        같은 폴더의 다른 파일과 키 구조가 다르면 오류 메시지 반환 (같으면 None)
+        """
+        signature = self.signature(content)
+        for other, files in self.get(version_dir).items():
+            if other != signature:
+                missing = sorted(set(other) - set(signature))
+                extra = sorted(set(signature) - set(other))
+                return f"스키마 불일치: {files[0]}와(과) 다름 (없는 키: {missing}, 추가된 키: {extra})"
+        return None
+
+    def add(self, version_dir: str, filename: str, content: Any):
+        """
+        새로 저장한 파일을 색인에 추가 (저장 후 호출)
+        """
+        with self._lock:
+            entry = self._versions.get(version_dir)
+            if entry is not None:
+                # 저장으로 바뀐 폴더 수정 시각을 기록하여 다시 만들지 않도록 함
+                files = entry[1].setdefault(self.signature(content), [])
+                if filename not in files:
+                    files.append(filename)
+                self._versions[version_dir] = (os.stat(version_dir).st_mtime_ns, entry[1])
+                return
+        self.get(version_dir)
@@ -0,0 +1,302 @@
+import asyncio
+import itertools
+import logging
+import math
+import time
+import uuid
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Dict, Any, Optional, Callable, Awaitable, List, AsyncIterator
+from lib.oracle_mvp_ai import telemetry
+
+logger = logging.getLogger(__name__)
+
+
+# 작업 상태
+QUEUED = "queued"
+RUNNING = "running"
+SUCCEEDED = "succeeded"
+FAILED = "failed"
+CANCELLED = "cancelled"
+FINISHED_STATUSES = (SUCCEEDED, FAILED, CANCELLED)
+
+# 작업 우선순위 (값이 작을수록 먼저 실행)
+PRIORITIES = {"interactive": 0, "normal": 1, "bulk": 2}
+DEFAULT_PRIORITY = "normal"
+
+
+class JobQueueFull(Exception):
+    """
+    대기 중인 작업이 max_pending을 넘은 경우
+
+    retry_after: 다시 시도할 때까지 기다릴 예상 시간 (초)
+    """
+    def __init__(self, message: str, retry_after: float = 1.0):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+class ClientLimitExceeded(JobQueueFull):
+    """
+    같은 클라이언트의 대기/실행 중인 작업이 max_per_client를 넘은 경우
+    """
+    pass
+
+
+@dataclass
+class Job:
+    """
+    백그라운드 판결 작업 한 건
+
+    run(job)은 결과 dict를 반환하는 코루틴 함수이며, 진행 상황은 job.set_progress()로 알립니다.
+    """
+    id: str
+    kind: str
+    run: Callable[["Job"], Awaitable[Dict[str, Any]]]
+    params: Dict[str, Any] = field(default_factory=dict)
+    priority: str = DEFAULT_PRIORITY
+    client: Optional[str] = None
+    status: str = QUEUED
+    progress: Dict[str, Any] = field(default_factory=dict)
+    result: Optional[Dict[str, Any]] = None
+    error: Optional[str] = None
+    created_at: float = field(default_factory=time.time)
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+    # 상태가 바뀔 때마다 증가 (구독자가 변경 여부 확인)
+    version: int = 0
+    _changed: asyncio.Event = field(default_factory=asyncio.Event, repr=False)
+    _task: Optional[asyncio.Task] = field(default=None, repr=False)
+
+    @property
+    def finished(self) -> bool:
+        return self.status in FINISHED_STATUSES
+
+    def _notify(self):
+        self.version += 1
+        self._changed.set()
+        self._changed = asyncio.Event()
+
+    def set_progress(self, **progress: Any):
+        self.progress.update(progress)
+        self._notify()
+
+    def to_dict(self, include_result: bool = True) -> Dict[str, Any]:
+        data = {
+            "job_id": self.id,
+            "kind": self.kind,
+            "priority": self.priority,
+            "status": self.status,
+            "params": self.params,
+            "progress": self.progress,
+            "error": self.error,
+            "created_at": self.created_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+        }
+        if include_result:
+            data["result"] = self.result
+        return data
+
+
+class JobQueue:
+    """
+    판결 작업 큐 (프로세스 메모리, 이벤트 루프 안에서 동작)
+
+    submit()은 작업을 등록하고 바로 반환하며, 워커 num_workers개가 우선순위(PRIORITIES) 순, 같은 우선순위는 등록 순서대로 작업을 실행합니다.
+    끝난 작업은 max_finished개까지 보관하고, 넘으면 가장 오래된 것부터 제거합니다.
+
+    과부하 시에는 실행 중인 작업이 느려지는 대신 새 작업을 거절합니다 (JobQueueFull, retry_after 포함).
+    - 대기 작업이 max_pending개이면 거절 (bulk 작업은 max_pending * bulk_pending_fraction개부터 거절하여
+      interactive/normal 작업이 들어올 자리를 남김)
+    - 같은 클라이언트의 대기/실행 중인 작업이 max_per_client개이면 거절
+    """
+    def __init__(self, num_workers: int = 2, max_pending: Optional[int] = None, max_finished: int = 200,
+                 max_per_client: Optional[int] = None, bulk_pending_fraction: float = 0.5):
+        if num_workers <= 0:
+            raise ValueError("num_workers must be positive")
+        if not 0 < bulk_pending_fraction <= 1:
+            raise ValueError("bulk_pending_fraction must be in (0, 1]")
+        self.num_workers = num_workers
+        self.max_pending = max_pending
+        self.max_finished = max_finished
+        self.max_per_client = max_per_client
+        self.bulk_pending_fraction = bulk_pending_fraction
+        self._jobs: "OrderedDict[str, Job]" = OrderedDict()
+        self._queue: Optional[asyncio.PriorityQueue] = None
+        self._workers: List[asyncio.Task] = []
+        self._sequence = itertools.count()
+        # 최근 작업 실행 시간의 이동 평균 (Retry-After 추정용)
+        self._average_seconds: Optional[float] = None
+
+    def start(self):
+        """
+        워커 시작 (앱 startup 이벤트에서 호출)
+        """
+        if self._workers:
+            return
+        self._queue = asyncio.PriorityQueue()
+        self._workers = [asyncio.create_task(self._worker(i)) for i in range(self.num_workers)]
+
+    async def stop(self):
+        """
+        워커 종료 (실행 중인 작업은 취소)
+        """
+        for worker in self._workers:
+            worker.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+
+    def pending_count(self) -> int:
+        return sum(1 for job in self._jobs.values() if job.status == QUEUED)
+
+    def active_count(self, client: str) -> int:
+        """
+        클라이언트의 대기/실행 중인 작업 수
+        """
+        return sum(1 for job in self._jobs.values() if job.client == client and not job.finished)
+
+    def retry_after(self, ahead: Optional[int] = None) -> float:
+        """
+        작업 ahead개(기본: 대기 중인 작업 전체)가 끝날 때까지의 예상 시간 (초, 최소 1초)
+        """
+        if ahead is None:
+            ahead = self.pending_count() + 1
+        average = self._average_seconds if self._average_seconds is not None else 5.0
+        return max(1.0, average * math.ceil(ahead / self.num_workers))
+
+    def submit(self, kind: str, run: Callable[[Job], Awaitable[Dict[str, Any]]],
+               params: Optional[Dict[str, Any]] = None, priority: str = DEFAULT_PRIORITY,
+               client: Optional[str] = None) -> Job:
+        """
+        작업 등록
+
+        Args:
+            kind: 작업 종류 (run_judge, run_consistency)
+            run: 작업 실행 코루틴 함수
+            params: 작업 목록에 표시할 요청 정보
+            priority: PRIORITIES 중 하나
+            client: 클라이언트 식별자 (max_per_client 적용 기준, 없으면 제한 없음)
+
+        Raises:
+            JobQueueFull: 대기 작업이 너무 많은 경우
+            ClientLimitExceeded: 클라이언트의 작업이 너무 많은 경우
+        """
+        if self._queue is None:
+            raise RuntimeError("JobQueue.start() must be called before submit()")
+        if priority not in PRIORITIES:
+            raise ValueError(f"priority must be one of {tuple(PRIORITIES)}")
+        if self.max_per_client is not None and client is not None and self.active_count(client) >= self.max_per_client:
+            telemetry.JOB_REJECTED.inc(reason="client_limit")
+            # 클라이언트의 작업이 하나 끝날 때까지
+            raise ClientLimitExceeded(f"Too many active jobs for client (max {self.max_per_client})",
+                                      retry_after=self.retry_after(ahead=1))
+        if self.max_pending is not None:
+            limit = self.max_pending
+            if priority == "bulk":
+                limit = max(1, int(self.max_pending * self.bulk_pending_fraction))
+            pending = self.pending_count()
+            if pending >= limit:
+                telemetry.JOB_REJECTED.inc(reason="queue_full")
+                raise JobQueueFull(f"Too many pending jobs (max {limit} for {priority})",
+                                   retry_after=self.retry_after(pending - limit + 1))
+        job = Job(id=uuid.uuid4().hex, kind=kind, run=run, params=dict(params or {}), priority=priority, client=client)
+        self._jobs[job.id] = job
+        self._queue.put_nowait((PRIORITIES[priority], next(self._sequence), job))
+        telemetry.JOB_QUEUE_DEPTH.inc(priority=priority)
+        return job
+
+    def get(self, job_id: str) -> Optional[Job]:
+        return self._jobs.get(job_id)
+
+    def list(self, status: Optional[str] = None) -> List[Job]:
+        jobs = [job for job in self._jobs.values() if status is None or job.status == status]
+        return sorted(jobs, key=lambda job: job.created_at, reverse=True)
+
+    def cancel(self, job_id: str) -> bool:
+        """
+        대기 중이거나 실행 중인 작업 취소 (이미 끝난 작업이면 False)
+        """
+        job = self._jobs.get(job_id)
+        if job is None or job.finished:
+            return False
+        if job._task is not None:
+            job._task.cancel()
+        else:
+            self._finish(job, CANCELLED)
+        return True
+
+    async def wait(self, job_id: str) -> Optional[Job]:
+        """
+        작업이 끝날 때까지 기다린 뒤 반환 (없는 작업이면 None)
+        """
+        job = self._jobs.get(job_id)
+        while job is not None and not job.finished:
+            await job._changed.wait()
+        return job
+
+    async def subscribe(self, job_id: str, timeout: Optional[float] = None) -> AsyncIterator[Dict[str, Any]]:
+        """
+        상태가 바뀔 때마다 작업 상태를 반환 (끝나면 결과를 포함해 마지막으로 한 번 반환)
+
+        timeout초 동안 변화가 없으면 현재 상태를 다시 반환 (연결 유지용)
+        """
+        job = self._jobs.get(job_id)
+        if job is None:
+            return
+        yield job.to_dict(include_result=job.finished)
+        while not job.finished:
+            changed = job._changed
+            try:
+                await asyncio.wait_for(changed.wait(), timeout)
+            except asyncio.TimeoutError:
+                pass
+            yield job.to_dict(include_result=job.finished)
+
+    def _finish(self, job: Job, status: str, result: Optional[Dict[str, Any]] = None, error: Optional[str] = None):
+        if job.status == QUEUED:
+            telemetry.JOB_QUEUE_DEPTH.dec(priority=job.priority)
+        elif job.started_at is not None and status != CANCELLED:
+            seconds = time.time() - job.started_at
+            self._average_seconds = seconds if self._average_seconds is None else 0.8 * self._average_seconds + 0.2 * seconds
+        job.status = status
+        job.result = result
+        job.error = error
+        job.finished_at = time.time()
+        job._notify()
+        self._evict()
+
+    def _evict(self):
+        finished = [job_id for job_id, job in self._jobs.items() if job.finished]
+        for job_id in itertools.islice(finished, max(0, len(finished) - self.max_finished)):
+            del self._jobs[job_id]
+
+    async def _worker(self, index: int):
+        while True:
+            _, _, job = await self._queue.get()
+            try:
+                if job.status != QUEUED:
+                    # 대기 중에 취소된 작업
+                    continue
+                telemetry.JOB_QUEUE_DEPTH.dec(priority=job.priority)
+                job.status = RUNNING
+                job.started_at = time.time()
+                telemetry.JOB_QUEUE_WAIT.observe(job.started_at - job.created_at, priority=job.priority)
+                job._notify()
+                job._task = asyncio.create_task(job.run(job))
+                try:
+                    result = await asyncio.shield(job._task)
+                except asyncio.CancelledError:
+                    if not job._task.cancelled():
+                        # 워커 자체가 종료되는 경우
+                        job._task.cancel()
+                        self._finish(job, CANCELLED)
+                        raise
+                    self._finish(job, CANCELLED)
+                except Exception as e:
+                    logger.exception(f"Job {job.id} ({job.kind}) failed")
+                    self._finish(job, FAILED, error=f"{type(e).__name__}: {e}")
+                else:
+                    self._finish(job, SUCCEEDED, result=result)
+            finally:
+                self._queue.task_done()
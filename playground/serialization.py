@@ -0,0 +1,126 @@
+import os
+import tempfile
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Tuple
+
+import orjson
+from bson import ObjectId
+from fastapi.responses import Response
+
+
+# 데이터셋 로드 시 ObjectId로 감쌀 필드
+OBJECT_ID_FIELDS = frozenset(['_id', 'id', 'user_id', 'topic_id'])
+
+_OPTIONS = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+
+
+def _default(obj: Any) -> Any:
+    # orjson이 직접 처리하지 못하는 타입 (ObjectId 등)은 문자열로 저장
+    if isinstance(obj, ObjectId):
+        return str(obj)
+    if isinstance(obj, (set, frozenset, tuple)):
+        return list(obj)
+    return str(obj)
+
+
+def _stringify_keys(obj: Any) -> Any:
+    if isinstance(obj, dict):
+        return {k if isinstance(k, (str, int, float, bool)) or k is None else str(k): _stringify_keys(v) for k, v in obj.items()}
+    if isinstance(obj, (list, tuple)):
+        return [_stringify_keys(item) for item in obj]
+    return obj
+
+
+def dumps(obj: Any, pretty: bool = False) -> bytes:
+    """
+    JSON 직렬화 (UTF-8 bytes, ObjectId/numpy 값 지원)
+    """
+    option = _OPTIONS | (orjson.OPT_INDENT_2 if pretty else 0)
+    try:
+        return orjson.dumps(obj, default=_default, option=option)
+    except TypeError:
+        # ObjectId 등 orjson이 지원하지 않는 dict 키가 있을 때만 키를 문자열로 바꿔 다시 시도
+        return orjson.dumps(_stringify_keys(obj), default=_default, option=option)
+
+
+def loads(data: Any) -> Any:
+    return orjson.loads(data)
+
+
+def write_json(path: str, obj: Any, pretty: bool = True):
+    """
+    JSON 파일 저장 (임시 파일에 쓴 뒤 교체하여 읽는 쪽이 쓰다 만 파일을 보지 않도록 함)
+    """
+    directory = os.path.dirname(path) or '.'
+    fd, tmp_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(dumps(obj, pretty=pretty))
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+
+def wrap_object_ids(obj: Any) -> Any:
+    """
+    OBJECT_ID_FIELDS 필드 값을 ObjectId로 감싼 복사본 (백엔드가 보내는 입력과 같은 형태)
+    """
+    if isinstance(obj, dict):
+        return {k: ObjectId(v) if k in OBJECT_ID_FIELDS else wrap_object_ids(v) for k, v in obj.items()}
+    if isinstance(obj, list):
+        return [wrap_object_ids(item) for item in obj]
+    return obj
+
+
+class ApiJSONResponse(Response):
+    """
+    orjson으로 직렬화하는 응답 (ObjectId 포함 결과를 변환 없이 반환)
+
+    엔드포인트에서 이 응답을 직접 반환하면 FastAPI의 jsonable_encoder 변환도 거치지 않습니다.
+    """
+    media_type = "application/json"
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
+
+
+class JsonFileCache:
+    """
+    JSON 파일 디코딩 결과 캐시 (파일 수정 시각/크기가 같으면 다시 읽지 않음, LRU)
+
+    반환한 객체는 여러 요청이 공유하므로 호출하는 쪽에서 수정하면 안 됩니다.
+    """
+    def __init__(self, max_entries: int = 64):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Tuple[str, bool], Tuple[Tuple[float, int], Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def load(self, path: str, object_ids: bool = False) -> Any:
+        """
+        Args:
+            path: JSON 파일 경로
+            object_ids: True이면 OBJECT_ID_FIELDS 값을 ObjectId로 감싼 형태로 반환
+        """
+        stat = os.stat(path)
+        version = (stat.st_mtime_ns, stat.st_size)
+        key = (os.path.abspath(path), object_ids)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] == version:
+                self._entries.move_to_end(key)
+                return entry[1]
+        with open(path, 'rb') as f:
+            content = loads(f.read())
+        if object_ids:
+            content = wrap_object_ids(content)
+        with self._lock:
+            self._entries[key] = (version, content)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return content
+
+    def stats(self) -> Dict[str, Any]:
+        return {"entries": len(self._entries), "max_entries": self.max_entries}
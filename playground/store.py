@@ -0,0 +1,264 @@
+import logging
+import os
+import sqlite3
+import threading
+import time
+from typing import Dict, Any, Optional, List
+from playground.serialization import dumps, loads
+
+logger = logging.getLogger(__name__)
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    kind TEXT NOT NULL,
+    result_file TEXT NOT NULL,
+    prompt_filename TEXT,
+    dataset_version TEXT,
+    dataset_filename TEXT,
+    provider TEXT,
+    mode TEXT,
+    n INTEGER,
+    created_at REAL NOT NULL,
+    duration_seconds REAL,
+    tokens INTEGER,
+    cost_usd REAL,
+    metrics TEXT,
+    config TEXT,
+    UNIQUE (kind, result_file)
+);
+CREATE INDEX IF NOT EXISTS idx_runs_kind_created ON runs (kind, created_at);
+CREATE INDEX IF NOT EXISTS idx_runs_prompt ON runs (prompt_filename);
+CREATE INDEX IF NOT EXISTS idx_runs_dataset ON runs (dataset_version, dataset_filename);
+
+CREATE TABLE IF NOT EXISTS results (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    run_id INTEGER NOT NULL REFERENCES runs (id) ON DELETE CASCADE,
+    idx INTEGER NOT NULL,
+    topic_id TEXT,
+    win_camp_id TEXT,
+    ai_conclusion TEXT,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_results_run ON results (run_id, idx);
+CREATE INDEX IF NOT EXISTS idx_results_topic ON results (topic_id);
+"""
+
+# list_runs에서 지원하는 필터 (컬럼 이름과 같음)
+RUN_FILTERS = ("kind", "prompt_filename", "dataset_version", "dataset_filename", "provider", "mode")
+RUN_COLUMNS = ("id", "kind", "result_file", "prompt_filename", "dataset_version", "dataset_filename", "provider",
+               "mode", "n", "created_at", "duration_seconds", "tokens", "cost_usd")
+
+
+def _dumps(obj: Any) -> str:
+    # 결과의 ObjectId는 문자열로 저장
+    return dumps(obj).decode("utf-8")
+
+
+def _usage(results: List[Dict[str, Any]]) -> Dict[str, Optional[float]]:
+    """
+    결과들의 metadata.trace / metadata.spend에서 실행 시간, 토큰 수, 비용 합계 (기록이 없으면 None)
+    """
+    seconds = tokens = cost = None
+    for result in results:
+        metadata = result.get("metadata") or {}
+        total = (metadata.get("trace") or {}).get("total")
+        if total:
+            seconds = (seconds or 0) + total.get("seconds", 0)
+        spend = metadata.get("spend")
+        if spend:
+            tokens = (tokens or 0) + spend.get("tokens", 0)
+            cost = (cost or 0) + spend.get("cost_usd", 0)
+    return {"duration_seconds": seconds, "tokens": tokens, "cost_usd": cost}
+
+
+class ExperimentStore:
+    """
+    실험 실행/결과/일관성 지표 저장소 (SQLite, WAL 모드)
+
+    - runs: 실행 한 건 (judge 또는 consistency)의 프롬프트, 데이터셋, 모델, 실행 시간/토큰/비용, 지표
+    - results: 실행별 주제 판결 결과 (consistency는 N개)
+    같은 종류/결과 파일명으로 다시 기록하면 이전 기록을 대체합니다 (결과 파일 덮어쓰기와 동일).
+    """
+    def __init__(self, db_path: str):
+        self.db_path = db_path
+        if os.path.dirname(db_path):
+            os.makedirs(os.path.dirname(db_path), exist_ok=True)
+        # FastAPI 스레드풀/이벤트 루프에서 함께 사용하므로 연결 하나를 잠금으로 보호
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._lock = threading.Lock()
+        with self._lock:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.execute("PRAGMA foreign_keys=ON")
+            self._conn.executescript(SCHEMA)
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+    def record_run(self, kind: str, result_file: str, params: Dict[str, Any], results: List[Dict[str, Any]],
+                   metrics: Optional[Dict[str, Any]] = None, config: Optional[Dict[str, Any]] = None,
+                   created_at: Optional[float] = None) -> int:
+        """
+        실행 한 건과 결과 저장
+
+        Args:
+            kind: "judge" 또는 "consistency"
+            result_file: 결과 파일명
+            params: prompt_filename, dataset_version, dataset_filename, mode, n
+            results: 판결 결과 리스트
+            metrics: 일관성 지표
+            config: JudgeConfig.to_dict() (final_judgement_provider를 provider로 기록)
+            created_at: 실행 시각 (없으면 현재 시각)
+
+        Returns:
+            run id
+        """
+        usage = _usage(results)
+        row = {
+            "kind": kind,
+            "result_file": result_file,
+            "prompt_filename": params.get("prompt_filename"),
+            "dataset_version": params.get("dataset_version"),
+            "dataset_filename": params.get("dataset_filename"),
+            "provider": (config or {}).get("final_judgement_provider"),
+            "mode": params.get("mode"),
+            "n": params.get("n", len(results)),
+            "created_at": created_at or time.time(),
+            **usage,
+            "metrics": _dumps(metrics) if metrics is not None else None,
+            "config": _dumps(config) if config is not None else None,
+        }
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM runs WHERE kind = ? AND result_file = ?", (kind, result_file))
+            cursor = self._conn.execute(
+                f"INSERT INTO runs ({', '.join(row)}) VALUES ({', '.join('?' for _ in row)})", tuple(row.values())
+            )
+            run_id = cursor.lastrowid
+            self._conn.executemany(
+                "INSERT INTO results (run_id, idx, topic_id, win_camp_id, ai_conclusion, data) VALUES (?, ?, ?, ?, ?, ?)",
+                [
+                    (run_id, i, str(result.get("topic_id", "")), None if result.get("win_camp_id") is None else str(result["win_camp_id"]),
+                     result.get("ai_conclusion"), _dumps(result))
+                    for i, result in enumerate(results)
+                ]
+            )
+        return run_id
+
+    def _run_dict(self, row: sqlite3.Row, include_details: bool = False) -> Dict[str, Any]:
+        run = {column: row[column] for column in RUN_COLUMNS}
+        if include_details:
+            run["metrics"] = loads(row["metrics"]) if row["metrics"] else None
+            run["config"] = loads(row["config"]) if row["config"] else None
+        return run
+
+    def list_runs(self, limit: int = 50, offset: int = 0, topic_id: Optional[str] = None,
+                  since: Optional[float] = None, until: Optional[float] = None, **filters: Optional[str]) -> Dict[str, Any]:
+        """
+        실행 목록 (최신순, 페이지 단위)
+
+        Args:
+            limit, offset: 페이지
+            topic_id: 해당 주제의 결과가 있는 실행만
+            since, until: 실행 시각 범위 (unix time)
+            filters: RUN_FILTERS 컬럼별 일치 조건 (None이면 무시)
+
+        Returns:
+            {"runs": 실행 요약 리스트 (지표 포함), "total": 전체 개수, "limit", "offset"}
+        """
+        unknown = set(filters) - set(RUN_FILTERS)
+        if unknown:
+            raise ValueError(f"Unknown filters: {sorted(unknown)}")
+        where, args = [], []
+        for column, value in filters.items():
+            if value is not None:
+                where.append(f"{column} = ?")
+                args.append(value)
+        if topic_id is not None:
+            where.append("id IN (SELECT run_id FROM results WHERE topic_id = ?)")
+            args.append(topic_id)
+        if since is not None:
+            where.append("created_at >= ?")
+            args.append(since)
+        if until is not None:
+            where.append("created_at < ?")
+            args.append(until)
+        clause = f"WHERE {' AND '.join(where)}" if where else ""
+        with self._lock:
+            total = self._conn.execute(f"SELECT COUNT(*) FROM runs {clause}", args).fetchone()[0]
+            rows = self._conn.execute(
+                f"SELECT * FROM runs {clause} ORDER BY created_at DESC, id DESC LIMIT ? OFFSET ?", args + [limit, offset]
+            ).fetchall()
+        runs = []
+        for row in rows:
+            run = self._run_dict(row)
+            run["metrics"] = loads(row["metrics"]) if row["metrics"] else None
+            runs.append(run)
+        return {"runs": runs, "total": total, "limit": limit, "offset": offset}
+
+    def get_run(self, run_id: int) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            row = self._conn.execute("SELECT * FROM runs WHERE id = ?", (run_id,)).fetchone()
+        return self._run_dict(row, include_details=True) if row else None
+
+    def list_results(self, run_id: int, limit: int = 50, offset: int = 0) -> Dict[str, Any]:
+        """
+        실행의 판결 결과 (회차 순, 페이지 단위)
+        """
+        with self._lock:
+            total = self._conn.execute("SELECT COUNT(*) FROM results WHERE run_id = ?", (run_id,)).fetchone()[0]
+            rows = self._conn.execute(
+                "SELECT idx, data FROM results WHERE run_id = ? ORDER BY idx LIMIT ? OFFSET ?", (run_id, limit, offset)
+            ).fetchall()
+        return {
+            "results": [{"index": row["idx"], **loads(row["data"])} for row in rows],
+            "total": total, "limit": limit, "offset": offset
+        }
+
+    def has_run(self, kind: str, result_file: str) -> bool:
+        with self._lock:
+            return self._conn.execute(
+                "SELECT 1 FROM runs WHERE kind = ? AND result_file = ?", (kind, result_file)
+            ).fetchone() is not None
+
+    def import_json_results(self, results_dir: str, overwrite: bool = False) -> int:
+        """
+        기존 JSON 결과 파일 가져오기 (results_dir/*.json은 judge, results_dir/consistency/*.json은 consistency)
+
+        judge 결과 파일에는 프롬프트/데이터셋 정보가 없으므로 파일명만 기록합니다.
+        이미 가져온 파일은 overwrite=True가 아니면 건너뜁니다.
+
+        Returns:
+            가져온 파일 수
+        """
+        sources = [("judge", results_dir), ("consistency", os.path.join(results_dir, "consistency"))]
+        imported = 0
+        for kind, directory in sources:
+            if not os.path.isdir(directory):
+                continue
+            for filename in sorted(os.listdir(directory)):
+                if not filename.endswith(".json") or (not overwrite and self.has_run(kind, filename)):
+                    continue
+                path = os.path.join(directory, filename)
+                try:
+                    with open(path, "rb") as f:
+                        content = loads(f.read())
+                except (OSError, ValueError) as e:
+                    logger.warning(f"Skipping {path}: {e}")
+                    continue
+                if not isinstance(content, dict):
+                    logger.warning(f"Skipping {path}: expected a JSON object, got {type(content).__name__}")
+                    continue
+                if kind == "consistency":
+                    params = {key: content.get(key) for key in ("prompt_filename", "dataset_version", "dataset_filename", "n", "mode")}
+                    results = content.get("results")
+                    results = [result for result in results if isinstance(result, dict)] if isinstance(results, list) else []
+                    self.record_run(kind, filename, params, results, content.get("metrics"),
+                                    created_at=os.path.getmtime(path))
+                else:
+                    self.record_run(kind, filename, {}, [content], created_at=os.path.getmtime(path))
+                imported += 1
+        return imported
@@ -1,33 +1,41 @@
 from nicegui import ui
-import os
 import json
+import requests
 from ..common import render_header
 
-RESULTS_DIR = os.path.join('playground', 'results', 'consistency')
+API_URL = 'http://localhost:8000'
+# 목록에 표시할 최근 일관성 측정 수, 원본 결과 한 페이지 크기
+RUNS_LIMIT = 50
+RESULTS_PAGE_SIZE = 10
+# 원본 결과에서 표시할 필드 (JSON pointer)
+RESULT_FIELDS = '/win_camp_id,/ai_conclusion,/judgement_percentage,/metadata/consistency'
 
 @ui.page('/consistency_results')
 def consistency_results_page():
     render_header()
     ui.label('일관성 측정 결과 목록').classes('text-2xl font-bold q-mb-md')
 
-    files = []
-    if os.path.exists(RESULTS_DIR):
-        files = [f for f in os.listdir(RESULTS_DIR) if f.endswith('.json')]
-        files.sort(reverse=True)
+    # 저장소에 기록된 일관성 측정 목록 (최신순, 지표 포함)
+    runs = requests.get(f'{API_URL}/runs', params={'kind': 'consistency', 'limit': RUNS_LIMIT}).json().get('runs', [])
 
     # selected_file, result_data를 일반 변수로 선언
     selected_file = ''
     result_data = None
 
-    def load_file(filename):
+    def load_results(offset):
+        page = requests.get(f"{API_URL}/runs/{result_data['id']}/results",
+                            params={'fields': RESULT_FIELDS, 'offset': offset, 'limit': RESULTS_PAGE_SIZE}).json()
+        result_data['results_page'] = page
+        show_details.refresh()
+
+    def load_file(run):
         nonlocal selected_file, result_data
-        if not filename:
+        if not run:
             # 재측정: 현재 선택된 파일로 metrics만 다시 계산
             if not selected_file:
                 ui.notify('먼저 결과 파일을 선택하세요.', type='warning')
                 return
-            import requests
-            url = 'http://localhost:8000/recalc_consistency'
+            url = f'{API_URL}/recalc_consistency'
             try:
                 resp = requests.post(url, json={'result_file': selected_file})
                 if resp.status_code == 200:
@@ -41,14 +49,9 @@ def consistency_results_page():
             except Exception as e:
                 ui.notify(f'API 호출 오류: {e}', type='negative')
             return
-        path = os.path.join(RESULTS_DIR, filename)
-        with open(path, 'r', encoding='utf-8') as f:
-            data = json.load(f)
-        result_data = data
-        selected_file = filename
-        show_details.refresh()  # 상태 변경 시 상세 결과 갱신
-
-    
+        result_data = dict(run)
+        selected_file = run['result_file']
+        load_results(0)  # 상태 변경 시 상세 결과 갱신
 
     with ui.column().classes('w-full'):
         # 지표별 일관성 기준 안내
@@ -72,8 +75,8 @@ def consistency_results_page():
         with ui.column().classes('w-full flex-1'):
             ui.label('결과 파일 목록').classes('font-bold')
             with ui.row().classes('w-full q-mb-xs'):
-                for f in files:
-                    ui.button(f, on_click=lambda e, fname=f: load_file(fname))
+                for run in runs:
+                    ui.button(run['result_file'], on_click=lambda e, r=run: load_file(r)).props('no-caps')
         with ui.column().classes('w-full flex-1'):
             with ui.row().classes('w-full q-mb-xs items-center'):
                 ui.label('상세 결과').classes('font-bold')
@@ -89,12 +92,18 @@ def consistency_results_page():
                         ui.label(f"파일명: {selected_file}").classes('q-mb-xs')
                         ui.label(f"프롬프트: {d.get('prompt_filename')}")
                         ui.label(f"데이터셋: {d.get('dataset_version')}/{d.get('dataset_filename')}")
-                        ui.label(f"실행 횟수: {d.get('n')}")
+                        ui.label(f"실행 횟수: {d.get('n')}" + (f" ({d.get('mode')})" if d.get('mode') else ''))
                         ui.label('지표 요약:').classes('q-mt-md font-bold')
                         m = d.get('metrics', {})
                         for k, v in m.items():
                             ui.label(f"{k}: {v}")
                     with ui.column().classes('flex-1'):
-                        ui.label('원본 결과:').classes('q-mt-md font-bold')
-                        ui.textarea('원본', value=json.dumps(d.get('results', []), ensure_ascii=False, indent=2)).props('rows=40').props('readonly').classes('w-full')
+                        page = d.get('results_page') or {}
+                        offset, total = page.get('offset', 0), page.get('total', 0)
+                        with ui.row().classes('items-center q-mt-md'):
+                            ui.label('원본 결과:').classes('font-bold')
+                            ui.button('이전', on_click=lambda: load_results(max(0, offset - RESULTS_PAGE_SIZE))).props('dense' + (' disable' if offset == 0 else ''))
+                            ui.label(f"{min(total, offset + 1)}-{min(total, offset + RESULTS_PAGE_SIZE)} / {total}")
+                            ui.button('다음', on_click=lambda: load_results(offset + RESULTS_PAGE_SIZE)).props('dense' + (' disable' if offset + RESULTS_PAGE_SIZE >= total else ''))
+                        ui.textarea('원본', value=json.dumps(page.get('results', []), ensure_ascii=False, indent=2)).props('rows=40').props('readonly').classes('w-full')
             show_details() 
\ No newline at end of file
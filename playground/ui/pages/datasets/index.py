@@ -5,17 +5,26 @@ import json
 import os
 
 API_URL = 'http://localhost:8000'
+# 의견 목록 한 페이지에 표시할 개수
+POSTS_PAGE_SIZE = 50
 
 @ui.page('/datasets')
 def dataset_list_and_detail_page():
     render_header()
     ui.label('데이터셋 목록').classes('text-2xl font-bold q-mb-md')
-    r = requests.get(f'{API_URL}/datasets')
+    r = requests.get(f'{API_URL}/datasets', params={'summary': 'true'})
     datasets = r.json().get('datasets', [])
-    def show_detail(version, filename):
-        r = requests.get(f'{API_URL}/datasets/{version}/{filename}')
-        content = r.json()
-        selected_content.value = json.dumps(content, ensure_ascii=False, indent=2)
+    selected = {'version': None, 'filename': None, 'offset': 0}
+    def show_detail(version, filename, offset=0):
+        # 주제/진영 정보와 의견 한 페이지만 가져옴
+        selected.update(version=version, filename=filename, offset=offset)
+        url = f'{API_URL}/datasets/{version}/{filename}'
+        header = requests.get(url, params={'fields': '/topic/_id,/topic/title,/topic/description,/topic/camps'}).json()
+        posts = requests.get(url, params={'path': '/topic/posts', 'offset': offset, 'limit': POSTS_PAGE_SIZE}).json()
+        selected_content.value = json.dumps({**header, '/topic/posts': posts}, ensure_ascii=False, indent=2)
+    def move(step):
+        if selected['filename']:
+            show_detail(selected['version'], selected['filename'], max(0, selected['offset'] + step * POSTS_PAGE_SIZE))
     def show_add_dataset():
         # 버전 목록
         version_list = [d['version'] for d in datasets]
@@ -37,11 +46,15 @@ def dataset_list_and_detail_page():
                     dialog.close()
                     ui.notify('데이터셋이 추가되었습니다.')
                     # 목록 갱신
-                    r2 = requests.get(f'{API_URL}/datasets')
+                    r2 = requests.get(f'{API_URL}/datasets', params={'summary': 'true'})
                     datasets.clear()
                     datasets.extend(r2.json().get('datasets', []))
                 else:
-                    error_label.text = r.json().get('detail', '오류 발생')
+                    detail = r.json().get('detail', '오류 발생')
+                    if isinstance(detail, dict):
+                        # 형식 검사 오류는 경로별 메시지 목록
+                        detail = f"{detail.get('message')} " + '; '.join(detail.get('errors', []))
+                    error_label.text = detail
             with ui.row():
                 ui.button('확인', on_click=submit, color='primary')
                 ui.button('취소', on_click=lambda: dialog.close())
@@ -50,5 +63,10 @@ def dataset_list_and_detail_page():
         for d in datasets:
             version = d['version']
             for filename in d['files']:
-                ui.button(f'{version}/{filename}', on_click=lambda v=version, fn=filename: show_detail(v, fn)).classes('q-mb-sm')
+                summary = d.get('summaries', {}).get(filename, {})
+                label = f"{version}/{filename} ({summary.get('title')}, 의견 {summary.get('posts')}개)"
+                ui.button(label, on_click=lambda v=version, fn=filename: show_detail(v, fn)).props('no-caps').classes('q-mb-sm')
+    with ui.row().classes('items-center'):
+        ui.button('이전 의견', on_click=lambda: move(-1)).props('dense')
+        ui.button('다음 의견', on_click=lambda: move(1)).props('dense')
     selected_content = ui.textarea('내용', value='').props('readonly').props('rows=40').style('min-height: 300px;').classes('w-full')
\ No newline at end of file
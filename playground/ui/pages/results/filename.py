@@ -2,14 +2,19 @@ from nicegui import ui
 from ..common import render_header
 import requests
 import json
+from .index import DETAIL_FIELDS
 
 API_URL = 'http://localhost:8000'
 
 @ui.page('/results/{filename}')
 def result_detail_page(filename: str):
     render_header()
-    r = requests.get(f'{API_URL}/results/{filename}')
+    # 요약 필드만 먼저 가져오고, 전체 내용은 요청할 때만 가져옴
+    r = requests.get(f'{API_URL}/results/{filename}', params={'fields': ','.join(DETAIL_FIELDS)})
     content = r.json()
     ui.label(f'실험 결과: {filename}').classes('text-xl font-bold q-mb-md')
-    ui.textarea('내용', value=json.dumps(content, ensure_ascii=False, indent=2)).props('readonly').props('rows=40').style('min-height: 1600px;').classes('w-full')
+    content_area = ui.textarea('내용', value=json.dumps(content, ensure_ascii=False, indent=2)).props('readonly').props('rows=40').style('min-height: 1600px;').classes('w-full')
+    def show_full():
+        content_area.value = json.dumps(requests.get(f'{API_URL}/results/{filename}').json(), ensure_ascii=False, indent=2)
+    ui.button('전체 내용 보기', on_click=show_full)
     ui.button('목록으로', on_click=lambda: ui.navigate.to('/results')) 
\ No newline at end of file
@@ -4,19 +4,59 @@ import requests
 import json
 
 API_URL = 'http://localhost:8000'
+# 목록 한 페이지에 표시할 결과 파일 수
+PAGE_SIZE = 20
+# 상세 화면에 표시할 결과 필드 (JSON pointer)
+DETAIL_FIELDS = [
+    '/topic_id', '/win_camp_id', '/ai_conclusion', '/judgement_percentage',
+    '/metadata/used_prompt_uris', '/metadata/degradations', '/metadata/trace/total', '/metadata/spend'
+]
 
 @ui.page('/results')
 def result_list_and_detail_page():
     render_header()
     ui.label('실험 결과 목록').classes('text-2xl font-bold q-mb-md')
-    r = requests.get(f'{API_URL}/results')
-    results = r.json().get('results', [])
-    def show_detail(filename):
-        r = requests.get(f'{API_URL}/results/{filename}')
-        content = r.json()
-        selected_content.value = json.dumps(content, ensure_ascii=False, indent=2)
-
-    with ui.column().classes('w-full flex flex-row items-start justify-start'):
-        for filename in results:
-            ui.button(filename, on_click=lambda fn=filename: show_detail(fn)).classes('q-mb-sm')
-    selected_content = ui.textarea('내용', value='').props('readonly').props('rows=40').style('min-height: 300px;').classes('w-full')
\ No newline at end of file
+    state = {'offset': 0, 'q': '', 'filename': None}
+
+    def show_detail(filename, full=False):
+        state['filename'] = filename
+        params = {} if full else {'fields': ','.join(DETAIL_FIELDS)}
+        r = requests.get(f'{API_URL}/results/{filename}', params=params)
+        selected_content.value = json.dumps(r.json(), ensure_ascii=False, indent=2)
+
+    def show_full():
+        if state['filename']:
+            show_detail(state['filename'], full=True)
+
+    def search(e=None):
+        state['offset'] = 0
+        state['q'] = search_input.value or ''
+        result_list.refresh()
+
+    def move(step):
+        state['offset'] = max(0, state['offset'] + step * PAGE_SIZE)
+        result_list.refresh()
+
+    search_input = ui.input('파일명 검색', on_change=search).classes('w-full q-mb-sm')
+
+    @ui.refreshable
+    def result_list():
+        params = {'summary': 'true', 'offset': state['offset'], 'limit': PAGE_SIZE}
+        if state['q']:
+            params['q'] = state['q']
+        data = requests.get(f'{API_URL}/results', params=params).json()
+        summaries = data.get('summaries', {})
+        with ui.column().classes('w-full items-start'):
+            for filename in data.get('results', []):
+                s = summaries.get(filename, {})
+                label = f"{filename}  (승리 진영: {s.get('win_camp_id')}, 실행 시간: {s.get('seconds')}s)"
+                ui.button(label, on_click=lambda fn=filename: show_detail(fn)).props('flat no-caps').classes('q-mb-xs')
+        total = data.get('total', 0)
+        with ui.row().classes('items-center'):
+            ui.button('이전', on_click=lambda: move(-1)).props('dense' + (' disable' if state['offset'] == 0 else ''))
+            ui.label(f"{min(total, state['offset'] + 1)}-{min(total, state['offset'] + PAGE_SIZE)} / {total}")
+            ui.button('다음', on_click=lambda: move(1)).props('dense' + (' disable' if state['offset'] + PAGE_SIZE >= total else ''))
+
+    result_list()
+    ui.button('전체 내용 보기', on_click=show_full).classes('q-mt-md')
+    selected_content = ui.textarea('내용', value='').props('readonly').props('rows=40').style('min-height: 300px;').classes('w-full')
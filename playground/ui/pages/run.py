@@ -5,6 +5,33 @@ import asyncio
 from .common import render_header
 
 API_URL = 'http://localhost:8000'
+# 작업 상태 조회 간격 (초)
+JOB_POLL_INTERVAL = 2
+
+async def run_job(path, data, on_status):
+    """
+    판결 작업을 등록하고 끝날 때까지 상태를 조회 (on_status(작업 상태)로 진행 상황 표시)
+    성공하면 작업 결과를 반환하고, 실패/취소되면 예외 발생
+    """
+    loop = asyncio.get_event_loop()
+    def submit():
+        # 화면에서 기다리는 실행이므로 배치 작업보다 먼저 실행
+        r = requests.post(f'{API_URL}{path}', json={'priority': 'interactive', **data})
+        if r.status_code == 429:
+            raise RuntimeError(f"실행 대기열이 가득 찼습니다. {r.headers.get('Retry-After')}초 후 다시 시도하세요.")
+        r.raise_for_status()
+        return r.json()
+    def poll(job_id):
+        return requests.get(f'{API_URL}/jobs/{job_id}').json()
+    job = await loop.run_in_executor(None, submit)
+    while True:
+        job = await loop.run_in_executor(None, poll, job['job_id'])
+        on_status(job)
+        if job['status'] == 'succeeded':
+            return job['result']
+        if job['status'] in ('failed', 'cancelled'):
+            raise RuntimeError(job.get('error') or job['status'])
+        await asyncio.sleep(JOB_POLL_INTERVAL)
 
 @ui.page('/run')
 def run_judge_page():
@@ -80,11 +107,9 @@ def run_judge_page():
         result_file_label.text = ''
         await asyncio.sleep(0)  # UI 업데이트 강제 반영
         try:
-            loop = asyncio.get_event_loop()
-            def post_request():
-                r = requests.post(f'{API_URL}/run_judge', json=data)
-                return r.json()
-            res = await loop.run_in_executor(None, post_request)
+            def on_status(job):
+                result_area.value = f"로딩중입니다... ({job['status']})"
+            res = await run_job('/jobs/run_judge', data, on_status)
             result_area.value = json.dumps(res.get('result', {}), ensure_ascii=False, indent=2)
             result_file_label.text = f"저장 파일명: {res.get('result_file', '')}"
         except Exception as e:
@@ -94,6 +119,8 @@ def run_judge_page():
 
     # N값 입력란 추가 (일관성 측정용)
     n_input = ui.number('실행 횟수(N)', value=5, min=1, max=20).classes('w-full q-mb-md')
+    # final: 최종 판결만 N회 (앞 단계 결과 재사용), full: 전체 파이프라인 N회
+    mode_select = ui.select({'final': '최종 판결만 반복', 'full': '전체 파이프라인 반복'}, value='final', label='측정 방식').classes('w-full q-mb-md')
     
     # 기존 실행 버튼 아래에 일관성 측정 버튼 추가
     async def on_consistency():
@@ -116,17 +143,20 @@ def run_judge_page():
             'dataset_version': dataset_version,
             'dataset_filename': dataset_filename,
             'result_file': result_file,
-            'n': n
+            'n': n,
+            'mode': mode_select.value,
+            # N회 반복 판결은 대량 작업으로 실행하여 다른 사용자의 판결을 막지 않도록 함
+            'priority': 'bulk'
         }
         result_area.value = '일관성 측정 중입니다...'
         result_file_label.text = ''
         await asyncio.sleep(0)
         try:
-            loop = asyncio.get_event_loop()
-            def post_request():
-                r = requests.post(f'{API_URL}/run_consistency', json=data)
-                return r.json()
-            res = await loop.run_in_executor(None, post_request)
+            def on_status(job):
+                progress = job.get('progress') or {}
+                done = f" {progress['completed']}/{progress['total']}" if 'completed' in progress else ''
+                result_area.value = f"일관성 측정 중입니다... ({job['status']}{done})"
+            res = await run_job('/jobs/run_consistency', data, on_status)
             result_area.value = json.dumps(res.get('metrics', {}), ensure_ascii=False, indent=2)
             result_file_label.text = f"저장 파일명: {res.get('result_file', '')}"
         except Exception as e:
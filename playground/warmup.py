@@ -0,0 +1,76 @@
+import asyncio
+import logging
+import time
+from typing import Dict, Any, Optional, Callable, Awaitable, Iterable
+
+logger = logging.getLogger(__name__)
+
+
+# 단계 상태
+PENDING = "pending"
+OK = "ok"
+FAILED = "failed"
+
+
+class WarmUp:
+    """
+    시작 시 준비 단계(warm-up) 실행 및 준비 상태 관리
+
+    add()로 단계를 등록하고 run()으로 동시에 실행합니다.
+    required 단계가 모두 성공해야 ready가 되며, 선택 단계는 실패해도 상태만 기록합니다.
+    """
+    def __init__(self, timeout: Optional[float] = 30.0):
+        self.timeout = timeout
+        self._steps: Dict[str, Dict[str, Any]] = {}
+        self._runs: Dict[str, Callable[[], Awaitable[Any]]] = {}
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+
+    def add(self, name: str, run: Callable[[], Awaitable[Any]], required: bool = True):
+        self._steps[name] = {"status": PENDING, "required": required, "seconds": None, "error": None}
+        self._runs[name] = run
+
+    @property
+    def ready(self) -> bool:
+        return self.finished_at is not None and all(
+            step["status"] == OK for step in self._steps.values() if step["required"]
+        )
+
+    async def _run_step(self, name: str):
+        step = self._steps[name]
+        started = time.monotonic()
+        try:
+            await asyncio.wait_for(self._runs[name](), self.timeout)
+        except asyncio.TimeoutError:
+            step["status"], step["error"] = FAILED, f"timed out after {self.timeout}s"
+        except Exception as e:
+            step["status"], step["error"] = FAILED, f"{type(e).__name__}: {e}"
+        else:
+            step["status"] = OK
+        step["seconds"] = round(time.monotonic() - started, 3)
+        if step["status"] == FAILED:
+            log = logger.error if step["required"] else logger.warning
+            log(f"Warm-up step {name} failed: {step['error']}")
+
+    async def run(self, names: Optional[Iterable[str]] = None):
+        """
+        등록한 단계를 동시에 실행 (names가 있으면 해당 단계만 다시 실행)
+        """
+        self.started_at = time.monotonic()
+        self.finished_at = None
+        names = list(names) if names is not None else list(self._steps)
+        for name in names:
+            self._steps[name].update(status=PENDING, seconds=None, error=None)
+        await asyncio.gather(*[self._run_step(name) for name in names])
+        self.finished_at = time.monotonic()
+        logger.info(f"Warm-up finished in {self.finished_at - self.started_at:.2f}s (ready={self.ready})")
+
+    def failed_steps(self) -> list:
+        return [name for name, step in self._steps.items() if step["status"] == FAILED]
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "ready": self.ready,
+            "seconds": round(self.finished_at - self.started_at, 3) if self.finished_at and self.started_at else None,
+            "steps": {name: dict(step) for name, step in self._steps.items()}
+        }
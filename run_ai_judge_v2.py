@@ -1,6 +1,7 @@
 import os
 import dotenv
 import json
+import logging
 from lib.oracle_mvp_ai.ai_judge import AiJudge
 
 import asyncio
@@ -12,6 +13,7 @@ def main():
 
     # Get API key
     dotenv.load_dotenv()
+    logging.basicConfig(level=os.getenv("LOG_LEVEL", "INFO").upper())
     api_key = os.getenv('OPENAI_API_KEY')
     if not api_key:
         raise RuntimeError('OPENAI_API_KEY environment variable not set')
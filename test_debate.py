@@ -1,11 +1,12 @@
 from lib.oracle_mvp_ai.strategies.final_debate import JudgeAfterDebate
 from lib.oracle_mvp_ai.llm_clients.factory import LLMClientFactory
+import asyncio
 import json
 
 def test_debate():
     # Initialize the judge
     openai_client = LLMClientFactory.create_client("openai")
-    judge = JudgeAfterDebate()
+    judge = JudgeAfterDebate(openai_client)
 
     # Test messages
     messages = [
@@ -66,7 +67,7 @@ Available camps: 오타니 (ID: 68775014a64d6b51065d49b3)
     ]
 
     # Run the debate
-    result = judge.debate(messages)
+    result = asyncio.run(judge.debate(messages))
     
     # Print results in a formatted way
     print("\n=== Final Result ===")
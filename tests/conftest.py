@@ -0,0 +1,46 @@
+import copy
+import os
+import tempfile
+from typing import Any, Dict, Optional
+
+import pytest
+
+# LLM 클라이언트 생성에 필요한 키 (테스트는 실제 API를 호출하지 않음)
+for name in ("OPENAI_API_KEY", "CLAUDE_API_KEY", "GEMINI_API_KEY"):
+    os.environ.setdefault(name, "test-key")
+# playground.api를 import할 때 만드는 실험 저장소와 CPU 작업 풀 (작업 프로세스 없이 스레드에서 실행)
+os.environ.setdefault("EXPERIMENT_DB_PATH", os.path.join(tempfile.mkdtemp(prefix="oracle-tests-"), "experiments.db"))
+os.environ.setdefault("CPU_POOL_WORKERS", "0")
+
+from lib.oracle_mvp_ai.ai_judge import AiJudge  # noqa: E402
+from lib.oracle_mvp_ai.config import JudgeConfig  # noqa: E402
+from tests.fakes import SAMPLE_TOPIC, FakeLLM, install_fake  # noqa: E402
+
+
+@pytest.fixture
+def fake_llm() -> FakeLLM:
+    return FakeLLM()
+
+
+@pytest.fixture
+def make_judge(fake_llm):
+    """
+    가짜 클라이언트를 연결한 AiJudge 생성 (make_judge(**AiJudge 인자))
+    """
+    def make(openai: Optional[FakeLLM] = None, google: Optional[FakeLLM] = None,
+             anthropic: Optional[FakeLLM] = None, **kwargs) -> AiJudge:
+        return install_fake(AiJudge("test-key", **kwargs), openai or fake_llm, google, anthropic)
+    return make
+
+
+@pytest.fixture
+def topic() -> Dict[str, Any]:
+    return copy.deepcopy(SAMPLE_TOPIC)
+
+
+@pytest.fixture
+def offline_config() -> JudgeConfig:
+    """
+    토론 없이 v_2_1_1 프롬프트로 판결하는 설정
+    """
+    return JudgeConfig(prompt_file="v_2_1_1.yaml", judge_after_debate=False, use_cache=False)
@@ -0,0 +1,167 @@
+# 테스트용 가짜 LLM 클라이언트와 샘플 데이터
+import asyncio
+import copy
+import hashlib
+import json
+import re
+from types import SimpleNamespace
+from typing import Any, Dict, List, Optional, Sequence
+
+from bson import ObjectId
+
+from lib.oracle_mvp_ai.ai_judge import AiJudge
+from lib.oracle_mvp_ai.llm_clients.openai_client import OpenAIClient
+
+
+SAMPLE_TOPIC = {
+    "topic": {
+        "_id": "t1",
+        "title": "A vs B",
+        "description": "어느 쪽이 더 나은가",
+        "camps": [{"id": "a", "name": "A"}, {"id": "b", "name": "B"}],
+        "posts": [
+            {"user_id": "u1", "camp_id": "a", "msg": "A is better because of x"},
+            {"user_id": "u2", "camp_id": "a", "msg": "A wins on y"},
+            {"user_id": "u3", "camp_id": "b", "msg": "B has more titles"},
+        ]
+    }
+}
+
+
+# 백엔드 입력처럼 캠프 아이디가 ObjectId인 경우 (의견의 camp_id는 문자열)
+OBJECT_ID_CAMPS = ("64b7f0c2a1b2c3d4e5f60701", "64b7f0c2a1b2c3d4e5f60702")
+
+
+def object_id_topic() -> Dict[str, Any]:
+    """
+    SAMPLE_TOPIC의 캠프 a, b를 ObjectId 캠프로 바꾼 입력
+    """
+    data = copy.deepcopy(SAMPLE_TOPIC)
+    mapping = dict(zip(("a", "b"), OBJECT_ID_CAMPS))
+    for camp in data["topic"]["camps"]:
+        camp["id"] = ObjectId(mapping[camp["id"]])
+    for post in data["topic"]["posts"]:
+        post["camp_id"] = mapping[post["camp_id"]]
+    return data
+
+
+def judgment_json(camp_id: str, percentage_a: int = 60, camp_ids: Sequence[str] = ("a", "b")) -> str:
+    """
+    최종 판결 응답 (기본 캠프 a, b)
+    """
+    first, second = camp_ids
+    return json.dumps({
+        "camp_id": camp_id,
+        "reason": f"{camp_id} is more convincing",
+        "percentage": [{"camp_id": first, "percentage": percentage_a}, {"camp_id": second, "percentage": 100 - percentage_a}]
+    })
+
+
+class FakeLLM:
+    """
+    OpenAI/Google/Anthropic 클라이언트 대신 쓰는 가짜 클라이언트
+
+    임베딩은 텍스트 해시로 만들고, 신뢰도 점수 요청에는 모든 의견에 5점을 주며,
+    최종 판결 요청에는 judgments를 차례로 반환합니다 (마지막 값 반복, 예외면 발생).
+    """
+    def __init__(self, judgments: Optional[List[Any]] = None, delay: float = 0.0):
+        self.judgments = list(judgments or [judgment_json("a")])
+        self.delay = delay
+        self.calls: List[str] = []
+        # 최종 판결 요청 메시지
+        self.final_messages: List[list] = []
+
+    def _embed(self, text: str) -> List[float]:
+        return [b / 255 for b in hashlib.md5(text.encode("utf-8")).digest()]
+
+    async def create_embedding_async(self, text: str, model: str = "fake") -> List[float]:
+        self.calls.append("embedding")
+        return self._embed(text)
+
+    async def create_embeddings_async(self, texts: List[str], model: str = "fake", batch_size: int = 512) -> List[List[float]]:
+        self.calls.append("embeddings")
+        return [self._embed(text) for text in texts]
+
+    async def web_search_mini_chat(self, messages, model: str = "fake") -> str:
+        self.calls.append("web_search")
+        return "facts"
+
+    async def web_search_chat(self, messages, model: str = "fake") -> str:
+        return await self.web_search_mini_chat(messages, model)
+
+    async def chat_async(self, messages, model: str = "fake", temperature: float = 0, seed: int = 42) -> str:
+        user = messages[-1]["content"]
+        opinions = re.findall(r"^\d+\. (.*)$", user, re.M)
+        if "camp_id" not in messages[0]["content"] and opinions:
+            self.calls.append("scoring")
+            return json.dumps([{"opinion": opinion, "score": 5} for opinion in opinions])
+        self.calls.append("final")
+        self.final_messages.append(messages)
+        await asyncio.sleep(self.delay)
+        response = self.judgments.pop(0) if len(self.judgments) > 1 else self.judgments[0]
+        if isinstance(response, Exception):
+            raise response
+        return response
+
+
+class DistinctLLM(FakeLLM):
+    """
+    서로 다른 의견마다 직교하는 임베딩을 반환 (중복 제거로 의견이 묶이지 않도록)
+    """
+    def __init__(self, judgments: Optional[List[Any]] = None, delay: float = 0.0):
+        super().__init__(judgments, delay)
+        self.texts: Dict[str, int] = {}
+
+    def _embed(self, text: str) -> List[float]:
+        index = self.texts.setdefault(text, len(self.texts))
+        return [1.0 if i == index else 0.0 for i in range(64)]
+
+
+def install_fake(judge: AiJudge, openai: FakeLLM, google: Optional[FakeLLM] = None,
+                 anthropic: Optional[FakeLLM] = None) -> AiJudge:
+    judge.openai_client = openai
+    judge.google_client = google or openai
+    judge.anthropic_client = anthropic or openai
+    judge.duplicate_checker.openai_client = openai
+    judge.credibility_checker.client = openai
+    judge.credibility_checker_batch.client = openai
+    return judge
+
+
+class StubOpenAIAPI:
+    """
+    OpenAIClient.async_client 대신 쓰는 가짜 SDK (chat.completions.create, embeddings.create)
+
+    호출마다 prompt_tokens 10, completion_tokens 5를 사용한 것으로 응답하고 calls에 기록합니다.
+    """
+    def __init__(self, delay: float = 0.05, content: str = "ok"):
+        self.delay = delay
+        self.content = content
+        self.calls: List[dict] = []
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self._chat))
+        self.embeddings = SimpleNamespace(create=self._embeddings)
+
+    def _usage(self):
+        return SimpleNamespace(prompt_tokens=10, completion_tokens=5)
+
+    async def _chat(self, **kwargs):
+        self.calls.append(kwargs)
+        await asyncio.sleep(self.delay)
+        choices = [SimpleNamespace(message=SimpleNamespace(content=self.content)) for _ in range(kwargs.get("n", 1))]
+        return SimpleNamespace(choices=choices, usage=self._usage())
+
+    async def _embeddings(self, **kwargs):
+        self.calls.append(kwargs)
+        await asyncio.sleep(self.delay)
+        texts = kwargs["input"] if isinstance(kwargs["input"], list) else [kwargs["input"]]
+        data = [SimpleNamespace(embedding=FakeLLM()._embed(text), index=i) for i, text in enumerate(texts)]
+        return SimpleNamespace(data=data, usage=SimpleNamespace(prompt_tokens=10, completion_tokens=0))
+
+
+def stub_openai_client(delay: float = 0.05) -> OpenAIClient:
+    """
+    실제 OpenAIClient (제한/합치기/사용량 기록 포함)에 가짜 SDK를 연결
+    """
+    client = OpenAIClient("test-key")
+    client.async_client = StubOpenAIAPI(delay)
+    return client
@@ -0,0 +1,71 @@
+import asyncio
+import copy
+
+import pytest
+
+from lib.oracle_mvp_ai.budget import BudgetExceeded, SpendBudget, TenantBudgets, activate_budgets, check_budget
+from lib.oracle_mvp_ai.strategies.final_ensemble import JudgeEnsemble
+from tests.fakes import SAMPLE_TOPIC, FakeLLM, judgment_json, stub_openai_client
+
+
+def make_topics(count):
+    topics = []
+    for i in range(count):
+        data = copy.deepcopy(SAMPLE_TOPIC)
+        data["topic"]["_id"] = f"t{i}"
+        for post in data["topic"]["posts"]:
+            post["msg"] = f"{post['msg']} ({i})"
+        topics.append(data)
+    return topics
+
+
+def test_check_budget_raises_only_when_exhausted():
+    budget = SpendBudget(max_tokens=100)
+    with activate_budgets(budget):
+        check_budget()
+        budget.charge(100, 0)
+        with pytest.raises(BudgetExceeded):
+            check_budget()
+    # 블록 밖에서는 적용되지 않음
+    check_budget()
+
+
+def test_judge_many_charges_window_embedding_to_budgets_and_traces(make_judge, offline_config):
+    judge = make_judge(tenant_budgets=TenantBudgets(default_limits=(100000, None)))
+    embedder = stub_openai_client(delay=0)
+    judge.duplicate_checker.openai_client = embedder
+    config = offline_config.replace(tenant="acme", max_total_tokens=100000)
+
+    async def main():
+        return [result async for result in judge.judge_many(make_topics(3), config, embedding_window=3)]
+
+    results = asyncio.run(main())
+    # 세 주제의 의견을 한 번의 배치 요청으로 임베딩
+    assert len(embedder.async_client.calls) == 1
+    tenant = judge.tenant_budgets.get("acme")
+    assert tenant.spent_tokens == 10
+    shares = [result["metadata"]["trace"]["stages"]["embedding"]["prompt_tokens"] for result in results]
+    assert all(share > 0 for share in shares)
+    assert sum(shares) == pytest.approx(10, abs=1)
+    assert all(result["metadata"]["spend"]["request_budget"]["spent_tokens"] > 0 for result in results)
+
+
+def test_ensemble_propagates_budget_exhaustion():
+    exhausted = FakeLLM([BudgetExceeded("tenant budget exhausted")])
+    ensemble = JudgeEnsemble({"openai": FakeLLM([judgment_json("a")]), "google": exhausted})
+
+    with pytest.raises(BudgetExceeded):
+        asyncio.run(ensemble.judge(
+            [{"role": "system", "content": "camp_id"}, {"role": "user", "content": "x"}],
+            lambda response: {"camp_id": "a", "reason": "", "percentage": []},
+            ["a", "b"]
+        ))
+
+
+def test_ensemble_budget_exhaustion_uses_spend_fallback(make_judge, offline_config, topic):
+    exhausted = FakeLLM([BudgetExceeded("request budget exhausted")])
+    judge = make_judge(google=exhausted)
+    config = offline_config.replace(final_judgement_provider="ensemble", ensemble_providers=("openai", "google"))
+
+    result = asyncio.run(judge.judge(topic, config))
+    assert "final_judgment_spend_fallback" in result["metadata"]["degradations"]
@@ -0,0 +1,110 @@
+import asyncio
+
+import pytest
+
+from lib.oracle_mvp_ai.budget import BudgetExceeded, SpendBudget, activate_budgets
+from lib.oracle_mvp_ai.llm_clients.coalescer import independent_chat_calls
+from lib.oracle_mvp_ai.llm_clients.limiter import llm_priority
+from lib.oracle_mvp_ai.tracing import start_trace
+from tests.fakes import stub_openai_client
+
+
+MESSAGES = [{"role": "user", "content": "same question"}]
+
+
+async def ask(client, budget=None, priority="interactive", delay=0.0):
+    await asyncio.sleep(delay)
+    with activate_budgets(budget), llm_priority(priority), start_trace() as trace:
+        with trace.stage("final_judgment"):
+            content = await client.chat_async(MESSAGES)
+    return content, trace.to_dict()["stages"]["final_judgment"]
+
+
+def test_identical_calls_share_one_request_and_charge_every_caller():
+    client = stub_openai_client()
+    budget_a, budget_b = SpendBudget(max_tokens=1000, name="tenant:a"), SpendBudget(max_tokens=1000, name="tenant:b")
+
+    async def main():
+        return await asyncio.gather(ask(client, budget_a), ask(client, budget_b, delay=0.01))
+
+    (content_a, stage_a), (content_b, stage_b) = asyncio.run(main())
+    assert len(client.async_client.calls) == 1
+    assert content_a == content_b == "ok"
+    assert budget_a.spent_tokens == budget_b.spent_tokens == 15
+    assert stage_a["calls"] == stage_b["calls"] == 1
+    assert stage_b["prompt_tokens"] == 10
+
+
+def test_exhausted_tenant_does_not_fail_other_waiters():
+    client = stub_openai_client()
+    exhausted, healthy = SpendBudget(max_tokens=10, name="tenant:a"), SpendBudget(max_tokens=1000, name="tenant:b")
+    exhausted.charge(10, 0)
+
+    async def main():
+        # 예산이 남은 테넌트가 먼저 요청하고, 예산을 다 쓴 테넌트가 같은 요청에 합류
+        return await asyncio.gather(
+            ask(client, healthy), ask(client, exhausted, delay=0.01), return_exceptions=True
+        )
+
+    healthy_result, exhausted_result = asyncio.run(main())
+    assert healthy_result[0] == "ok"
+    assert isinstance(exhausted_result, BudgetExceeded)
+    assert exhausted.spent_tokens == 10
+    assert healthy.spent_tokens == 15
+
+
+def test_exhausted_leader_does_not_block_other_tenant():
+    client = stub_openai_client()
+    exhausted, healthy = SpendBudget(max_tokens=10, name="tenant:a"), SpendBudget(max_tokens=1000, name="tenant:b")
+    exhausted.charge(10, 0)
+
+    async def main():
+        return await asyncio.gather(
+            ask(client, exhausted), ask(client, healthy, delay=0.01), return_exceptions=True
+        )
+
+    exhausted_result, healthy_result = asyncio.run(main())
+    assert isinstance(exhausted_result, BudgetExceeded)
+    assert healthy_result[0] == "ok"
+    assert len(client.async_client.calls) == 1
+
+
+@pytest.mark.parametrize("priorities, expected_calls", [
+    (("interactive", "interactive"), 1),
+    (("bulk", "bulk"), 1),
+    (("bulk", "interactive"), 2),
+])
+def test_calls_are_coalesced_only_within_a_priority(priorities, expected_calls):
+    client = stub_openai_client()
+
+    async def main():
+        await asyncio.gather(ask(client, priority=priorities[0]), ask(client, priority=priorities[1], delay=0.01))
+
+    asyncio.run(main())
+    assert len(client.async_client.calls) == expected_calls
+
+
+def test_independent_and_sampled_chat_calls_are_not_coalesced():
+    client = stub_openai_client()
+
+    async def main():
+        with independent_chat_calls():
+            await asyncio.gather(client.chat_async(MESSAGES), client.chat_async(MESSAGES))
+        await asyncio.gather(client.chat_async(MESSAGES, temperature=0.7), client.chat_async(MESSAGES, temperature=0.7))
+
+    asyncio.run(main())
+    assert len(client.async_client.calls) == 4
+
+
+def test_cancelling_one_waiter_keeps_the_shared_request():
+    client = stub_openai_client(delay=0.1)
+
+    async def main():
+        first = asyncio.create_task(client.chat_async(MESSAGES))
+        second = asyncio.create_task(client.chat_async(MESSAGES))
+        await asyncio.sleep(0.02)
+        first.cancel()
+        return await second
+
+    assert asyncio.run(main()) == "ok"
+    assert len(client.async_client.calls) == 1
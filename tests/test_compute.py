@@ -0,0 +1,52 @@
+import asyncio
+
+import numpy as np
+
+from lib.oracle_mvp_ai import metrics
+from lib.oracle_mvp_ai.checker.duplicate_checker import cluster_embeddings
+from lib.oracle_mvp_ai.compute import CpuPool
+
+
+OPINIONS = ["A is better", "A is clearly better overall", "B wins", "something else"]
+EMBEDDINGS = np.array([[1.0, 0.0, 0.0], [0.95, 0.05, 0.0], [0.0, 1.0, 0.0], [0.0, 0.0, 1.0]], dtype=np.float32)
+RESULTS = [
+    {"win_camp_id": "a", "ai_conclusion": "A has better arguments",
+     "judgement_percentage": [{"camp_id": "a", "percentage": 60}, {"camp_id": "b", "percentage": 40}]},
+    {"win_camp_id": "a", "ai_conclusion": "A has stronger arguments",
+     "judgement_percentage": [{"camp_id": "a", "percentage": 70}, {"camp_id": "b", "percentage": 30}]},
+    {"win_camp_id": "b", "ai_conclusion": "B is more convincing",
+     "judgement_percentage": [{"camp_id": "a", "percentage": 45}, {"camp_id": "b", "percentage": 55}]},
+]
+
+
+def test_cluster_embeddings_picks_longest_representative():
+    clusters = cluster_embeddings(EMBEDDINGS, [len(opinion) for opinion in OPINIONS], 0.8)
+    assert clusters == [[1, 0], [2], [3]]
+
+
+def test_thread_mode_matches_inline_computation():
+    pool = CpuPool(0)
+
+    async def main():
+        return (await pool.cluster_opinions(OPINIONS, EMBEDDINGS), await pool.cluster_opinions([], np.empty((0, 3))),
+                await pool.consistency_metrics(RESULTS))
+
+    clusters, empty, consistency = asyncio.run(main())
+    assert clusters == [[1, 0], [2], [3]]
+    assert empty == []
+    assert consistency == metrics.calculate_consistency_metrics(RESULTS)
+
+
+def test_process_pool_uses_shared_memory():
+    pool = CpuPool(1)
+
+    async def main():
+        try:
+            await pool.start()
+            return await pool.cluster_opinions(OPINIONS, EMBEDDINGS), await pool.consistency_metrics(RESULTS)
+        finally:
+            pool.shutdown()
+
+    clusters, consistency = asyncio.run(main())
+    assert clusters == [[1, 0], [2], [3]]
+    assert consistency == metrics.calculate_consistency_metrics(RESULTS)
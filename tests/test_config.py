@@ -0,0 +1,51 @@
+import asyncio
+import dataclasses
+
+import pytest
+
+from lib.oracle_mvp_ai.config import JudgeConfig
+
+
+def test_from_dict_rejects_unknown_options():
+    config = JudgeConfig.from_dict({"final_judgement_provider": "google", "ensemble_providers": ["openai", "google"]})
+    assert config.final_judgement_provider == "google"
+    assert config.ensemble_providers == ("openai", "google")
+    assert JudgeConfig.from_dict(config.to_dict()) == config
+    with pytest.raises(ValueError):
+        JudgeConfig.from_dict({"no_such_option": True})
+
+
+@pytest.mark.parametrize("options", [
+    {"final_judgement_provider": "mistral"},
+    {"ensemble_providers": ("ensemble",)},
+    {"opinion_token_budget": 0},
+    {"budget_reserve_fraction": 1},
+    {"priority": "urgent"},
+])
+def test_invalid_options_rejected(options):
+    with pytest.raises(ValueError):
+        JudgeConfig(**options)
+
+
+def test_replace_returns_new_frozen_config():
+    config = JudgeConfig()
+    changed = config.replace(output_judgement_percentage=False)
+    assert config.output_judgement_percentage and not changed.output_judgement_percentage
+    with pytest.raises(dataclasses.FrozenInstanceError):
+        config.profile = "fast"
+
+
+def test_one_judge_serves_different_configs_concurrently(make_judge, offline_config, topic):
+    judge = make_judge()
+
+    async def run():
+        return await asyncio.gather(
+            judge.judge(topic, offline_config),
+            judge.judge(topic, offline_config.replace(output_judgement_percentage=False)),
+        )
+
+    with_percentage, without_percentage = asyncio.run(run())
+    assert "judgement_percentage" in with_percentage
+    assert "judgement_percentage" not in without_percentage
+    # 인스턴스 기본 설정은 바뀌지 않음
+    assert judge.config.output_judgement_percentage
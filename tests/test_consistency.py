@@ -0,0 +1,38 @@
+import asyncio
+
+import pytest
+
+from tests.fakes import FakeLLM, judgment_json
+
+
+def embedding_calls(llm):
+    return llm.calls.count("embedding") + llm.calls.count("embeddings")
+
+
+def test_final_mode_reuses_upstream_stages(make_judge, offline_config, topic):
+    llm = FakeLLM([judgment_json("a"), judgment_json("b", 30), judgment_json("a")])
+    progress = []
+    results = asyncio.run(make_judge(openai=llm).judge_consistency(
+        topic, 3, offline_config, mode="final", on_progress=lambda done, total: progress.append((done, total))
+    ))
+    assert [result["metadata"]["consistency"]["run"] for result in results] == [1, 2, 3]
+    assert sorted(result["win_camp_id"] for result in results) == ["a", "a", "b"]
+    assert llm.calls.count("final") == 3
+    # 임베딩/신뢰도 검사는 한 번만 실행
+    assert llm.calls.count("scoring") == 1
+    assert embedding_calls(llm) == 1
+    assert "upstream_trace" in results[0]["metadata"]
+    assert progress == [(1, 3), (2, 3), (3, 3)]
+
+
+def test_full_mode_reruns_pipeline(make_judge, offline_config, topic):
+    llm = FakeLLM()
+    results = asyncio.run(make_judge(openai=llm).judge_consistency(topic, 2, offline_config, mode="full"))
+    assert all(result["metadata"]["consistency"]["mode"] == "full" for result in results)
+    assert llm.calls.count("final") == 2
+    assert llm.calls.count("scoring") == 2
+
+
+def test_unknown_mode_rejected(make_judge, offline_config, topic):
+    with pytest.raises(ValueError):
+        asyncio.run(make_judge().judge_consistency(topic, 2, offline_config, mode="partial"))
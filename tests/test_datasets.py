@@ -0,0 +1,51 @@
+import glob
+import json
+import os
+
+import pytest
+
+from lib.oracle_mvp_ai.datasets import validate_dataset
+
+
+DATASET_DIR = os.path.join(os.path.dirname(__file__), "..", "dataset")
+DATASET_FILES = sorted(glob.glob(os.path.join(DATASET_DIR, "*", "*.json")))
+
+
+def test_shipped_datasets_exist():
+    assert DATASET_FILES
+
+
+@pytest.mark.parametrize("path", DATASET_FILES, ids=lambda path: os.path.relpath(path, DATASET_DIR))
+def test_shipped_datasets_pass_validation(path):
+    with open(path, encoding="utf-8") as f:
+        assert validate_dataset(json.load(f)) == []
+
+
+def test_plain_string_ids_are_valid(topic):
+    topic["topic"]["_id"] = "test_topic_001"
+    topic["topic"]["camps"][0]["id"] = "camp_001"
+    assert validate_dataset(topic) == []
+
+
+def test_validation_reports_pointers(topic):
+    del topic["topic"]["title"]
+    topic["topic"]["camps"][1]["id"] = 7
+    topic["topic"]["posts"][0] = {"camp_id": "a"}
+    errors = validate_dataset(topic)
+    assert "/topic: missing required field 'title'" in errors
+    assert "/topic/camps/1/id: expected string, got int" in errors
+    assert "/topic/posts/0: missing required field 'msg'" in errors
+
+
+def test_run_judge_requires_object_ids_only_when_wrapping():
+    from fastapi import HTTPException
+    from playground import api
+
+    request = {"prompt_filename": "v_2_1_1.yaml", "dataset_version": "v1", "dataset_filename": "messi_ronaldo.json"}
+    with pytest.raises(HTTPException) as e:
+        api.prepare_run_judge(request)
+    assert e.value.status_code == 400
+    assert "ObjectId" in e.value.detail
+
+    run = api.prepare_run_judge({**request, "dataset_version": "v2", "dataset_filename": "faker_vs_jenny.json"})
+    assert run["dataset"]["topic"]["title"]
@@ -0,0 +1,68 @@
+import asyncio
+import os
+
+import httpx
+import pytest
+
+from playground.documents import PointerError, SummaryCache, page_items, project, resolve_pointer
+from tests.fakes import SAMPLE_TOPIC
+
+
+def test_resolve_pointer():
+    assert resolve_pointer(SAMPLE_TOPIC, "/topic/posts/2/camp_id") == "b"
+    assert resolve_pointer({"a/b": {"~": 1}}, "/a~1b/~0") == 1
+    assert resolve_pointer(SAMPLE_TOPIC, "") is SAMPLE_TOPIC
+    assert resolve_pointer(SAMPLE_TOPIC, "/topic/posts/9", None) is None
+    with pytest.raises(PointerError):
+        resolve_pointer(SAMPLE_TOPIC, "/topic/missing")
+    with pytest.raises(PointerError):
+        resolve_pointer(SAMPLE_TOPIC, "topic")
+
+
+def test_project():
+    assert project(SAMPLE_TOPIC, ["/topic/_id", "/topic/nope"]) == {"/topic/_id": "t1", "/topic/nope": None}
+
+
+def test_page_items_filters_and_projects():
+    page = page_items(SAMPLE_TOPIC, "/topic/posts", offset=1, limit=1, fields=["/msg"], filters=["/camp_id=a"])
+    assert page["total"] == 2
+    assert page["items"] == [{"index": 1, "/msg": "A wins on y"}]
+    page = page_items(SAMPLE_TOPIC, "/topic/posts", query="TITLES")
+    assert page["total"] == 1 and page["items"][0]["value"]["user_id"] == "u3"
+    with pytest.raises(PointerError):
+        page_items(SAMPLE_TOPIC, "/topic/title")
+    with pytest.raises(PointerError):
+        page_items(SAMPLE_TOPIC, "/topic/posts", filters=["camp_id"])
+
+
+def test_summary_cache_recomputes_on_change(tmp_path):
+    path = tmp_path / "r.json"
+    path.write_text("{}")
+    calls = []
+    cache = SummaryCache(lambda p: calls.append(p) or {"ok": True})
+    assert cache.get(str(path))["ok"]
+    cache.get(str(path))
+    assert len(calls) == 1
+    path.write_text('{"changed": true}')
+    os.utime(path, (1, 1))
+    cache.get(str(path))
+    assert len(calls) == 2
+
+
+def test_dataset_endpoint_pages_posts():
+    from playground import api
+
+    async def main():
+        transport = httpx.ASGITransport(app=api.app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            page = await client.get("/datasets/v2/faker_vs_jenny.json",
+                                    params={"path": "/topic/posts", "fields": "/camp_id", "limit": 2})
+            bad = await client.get("/datasets/v2/faker_vs_jenny.json", params={"path": "/topic/nope"})
+            return page, bad
+
+    page, bad = asyncio.run(main())
+    assert page.status_code == 200
+    body = page.json()
+    assert body["total"] > 2
+    assert [set(item) for item in body["items"]] == [{"index", "/camp_id"}] * 2
+    assert bad.status_code == 400
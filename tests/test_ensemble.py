@@ -0,0 +1,66 @@
+import asyncio
+import json
+
+from lib.oracle_mvp_ai.strategies.final_ensemble import JudgeEnsemble, aggregate_judgments, average_percentages
+from tests.fakes import FakeLLM, judgment_json
+
+
+CAMP_IDS = ["a", "b"]
+MESSAGES = [{"role": "system", "content": "camp_id"}, {"role": "user", "content": "x"}]
+
+
+def parse(response):
+    return json.loads(response)
+
+
+def judgment(camp_id, percentage_a):
+    return parse(judgment_json(camp_id, percentage_a))
+
+
+def test_average_percentages_sums_to_100():
+    averaged = average_percentages([
+        [{"camp_id": "a", "percentage": 33.3}, {"camp_id": "b", "percentage": 66.7}],
+        [{"camp_id": "a", "percentage": 34}, {"camp_id": "b", "percentage": 66}],
+    ], CAMP_IDS)
+    assert averaged == [{"camp_id": "a", "percentage": 34}, {"camp_id": "b", "percentage": 66}]
+    assert sum(entry["percentage"] for entry in average_percentages([], ["a", "b", "c"])) == 100
+
+
+def test_majority_wins_and_tie_breaks_on_share():
+    result = aggregate_judgments([judgment("b", 40), judgment("b", 20), judgment("a", 70)], CAMP_IDS)
+    assert result["camp_id"] == "b"
+    assert result["votes"] == {"a": 1, "b": 2}
+    assert result["percentage"] == [{"camp_id": "a", "percentage": 30}, {"camp_id": "b", "percentage": 70}]
+    # 동률이면 평균 비율이 높은 진영
+    assert aggregate_judgments([judgment("a", 55), judgment("b", 10)], CAMP_IDS)["camp_id"] == "b"
+
+
+def test_ensemble_tolerates_failed_provider():
+    ensemble = JudgeEnsemble({
+        "openai": FakeLLM([judgment_json("b", 40)]),
+        "google": FakeLLM([judgment_json("b", 30)]),
+        "anthropic": FakeLLM([RuntimeError("provider down")]),
+    })
+    result = asyncio.run(ensemble.judge(MESSAGES, parse, CAMP_IDS))
+    assert result["camp_id"] == "b"
+    assert sorted(result["providers"]) == ["google", "openai"]
+    assert result["agreement"] == 1.0
+
+
+def test_quorum_cancels_slow_provider():
+    ensemble = JudgeEnsemble({
+        "openai": FakeLLM([judgment_json("a")]),
+        "google": FakeLLM([judgment_json("a")]),
+        "anthropic": FakeLLM([judgment_json("b")], delay=5),
+    }, quorum=2)
+    result = asyncio.run(asyncio.wait_for(ensemble.judge(MESSAGES, parse, CAMP_IDS), timeout=2))
+    assert result["camp_id"] == "a"
+    assert result["cancelled_providers"] == ["anthropic"]
+
+
+def test_judge_with_ensemble_provider(make_judge, offline_config, topic):
+    judge = make_judge(google=FakeLLM([judgment_json("b", 30)]), anthropic=FakeLLM([judgment_json("b", 20)]))
+    config = offline_config.replace(final_judgement_provider="ensemble")
+    result = asyncio.run(judge.judge(topic, config))
+    assert result["win_camp_id"] == "b"
+    assert result["metadata"]["ensemble"]["votes"] == {"a": 1, "b": 2}
@@ -0,0 +1,126 @@
+import asyncio
+import time
+
+import httpx
+import pytest
+from fastapi import HTTPException
+
+from playground.jobs import CANCELLED, FAILED, SUCCEEDED, ClientLimitExceeded, JobQueue, JobQueueFull
+
+
+def test_job_status_transitions():
+    async def main():
+        queue = JobQueue(num_workers=1)
+        queue.start()
+        try:
+            async def run(job):
+                job.set_progress(completed=1, total=1)
+                return {"answer": 42}
+
+            async def fail(job):
+                raise RuntimeError("boom")
+
+            ok = queue.submit("run_judge", run)
+            failed = queue.submit("run_judge", fail)
+            # 워커가 하나뿐이므로 뒤의 작업은 대기 상태에서 취소됨
+            queue.submit("run_judge", lambda job: asyncio.sleep(10))
+            queued = queue.submit("run_judge", run)
+            assert queue.cancel(queued.id)
+            await queue.wait(ok.id)
+            await queue.wait(failed.id)
+            return ok, failed, queued
+        finally:
+            await queue.stop()
+
+    ok, failed, queued = asyncio.run(main())
+    assert ok.status == SUCCEEDED and ok.result == {"answer": 42} and ok.progress == {"completed": 1, "total": 1}
+    assert failed.status == FAILED and "boom" in failed.error
+    assert queued.status == CANCELLED
+
+
+def test_run_judge_prepares_dataset_off_the_event_loop(monkeypatch):
+    from playground import api
+
+    def slow_prepare(request):
+        # 큰 데이터셋을 읽고 디코딩하는 동안 이벤트 루프를 막지 않아야 함
+        time.sleep(0.5)
+        raise HTTPException(status_code=404, detail="Dataset file not found")
+
+    monkeypatch.setattr(api, "prepare_run_judge", slow_prepare)
+
+    async def main():
+        transport = httpx.ASGITransport(app=api.app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            started = time.monotonic()
+            slow = asyncio.create_task(client.post("/run_judge", json={}))
+            await asyncio.sleep(0.05)
+            listing = await client.get("/jobs")
+            elapsed = time.monotonic() - started
+            return (await slow).status_code, listing.status_code, elapsed
+
+    slow_status, listing_status, elapsed = asyncio.run(main())
+    assert slow_status == 404
+    assert listing_status == 200
+    assert elapsed < 0.3
+
+
+def test_admission_control_rejects_with_retry_after():
+    async def main():
+        queue = JobQueue(num_workers=1, max_pending=4, max_per_client=2, bulk_pending_fraction=0.5)
+        queue.start()
+        try:
+            block = lambda job: asyncio.sleep(10)
+            queue.submit("run_judge", block, client="c1")
+            await asyncio.sleep(0)
+            queue.submit("run_judge", block, priority="bulk", client="c2")
+            queue.submit("run_judge", block, priority="bulk", client="c2")
+            # bulk 작업은 대기 2개(4 * 0.5)부터 거절, interactive/normal은 자리가 남아 있음
+            with pytest.raises(JobQueueFull) as bulk_rejected:
+                queue.submit("run_judge", block, priority="bulk", client="c3")
+            queue.submit("run_judge", block, priority="interactive", client="c3")
+            queue.submit("run_judge", block, client="c1")
+            # 같은 클라이언트는 대기/실행 중인 작업 2개까지
+            with pytest.raises(ClientLimitExceeded):
+                queue.submit("run_judge", block, priority="interactive", client="c1")
+            with pytest.raises(JobQueueFull) as full:
+                queue.submit("run_judge", block, priority="interactive", client="c4")
+            return bulk_rejected.value, full.value, queue.pending_count()
+        finally:
+            await queue.stop()
+
+    bulk_rejected, full, pending = asyncio.run(main())
+    assert pending == 4
+    assert not isinstance(full, ClientLimitExceeded)
+    # 작업 하나가 끝날 때까지의 예상 시간 (실행 기록이 없으면 작업당 5초)
+    assert bulk_rejected.retry_after == 5
+    assert full.retry_after == 5
+
+
+def test_api_returns_429_with_retry_after_header(monkeypatch):
+    from playground import api
+
+    monkeypatch.setattr(api, "prepare_run_judge", lambda request: {})
+    monkeypatch.setattr(api, "execute_run_judge", lambda run: asyncio.sleep(10))
+
+    async def main():
+        queue = JobQueue(num_workers=1, max_pending=1)
+        queue.start()
+        monkeypatch.setattr(api, "job_queue", queue)
+        transport = httpx.ASGITransport(app=api.app)
+        try:
+            async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+                first = await client.post("/jobs/run_judge", json={}, headers={"X-Client-Id": "c1"})
+                await asyncio.sleep(0)
+                second = await client.post("/jobs/run_judge", json={}, headers={"X-Client-Id": "c1"})
+                third = await client.post("/jobs/run_judge", json={}, headers={"X-Client-Id": "c2"})
+                invalid = await client.post("/jobs/run_judge", json={"priority": "urgent"})
+                return first, second, third, invalid
+        finally:
+            await queue.stop()
+
+    first, second, third, invalid = asyncio.run(main())
+    assert first.status_code == 202 and first.json()["priority"] == "normal"
+    assert second.status_code == 202
+    assert third.status_code == 429
+    assert int(third.headers["Retry-After"]) >= 1
+    assert invalid.status_code == 400
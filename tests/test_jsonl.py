@@ -0,0 +1,60 @@
+import asyncio
+import copy
+import json
+
+import numpy as np
+import pytest
+
+from lib.oracle_mvp_ai.checker.duplicate_checker import OnlineDeduplicator
+from lib.oracle_mvp_ai.datasets import DatasetFormatError, convert_json_to_jsonl, open_jsonl_dataset
+from tests.fakes import SAMPLE_TOPIC
+
+
+def write_lines(path, lines):
+    path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+    return str(path)
+
+
+def test_convert_and_stream_posts(tmp_path):
+    src = tmp_path / "topic.json"
+    src.write_text(json.dumps(SAMPLE_TOPIC), encoding="utf-8")
+    dst = str(tmp_path / "topic.jsonl")
+    assert convert_json_to_jsonl(str(src), dst) == 3
+
+    header, posts = open_jsonl_dataset(dst)
+    assert "posts" not in header and header["_id"] == "t1"
+    with posts:
+        assert [post["msg"] for post in posts] == [post["msg"] for post in SAMPLE_TOPIC["topic"]["posts"]]
+
+
+@pytest.mark.parametrize("lines, message", [
+    (['{"topic": {"_id": "t", "posts": []}}'], "one per line"),
+    (['{"topic": {"_id": "t"}}', '{"camp_id": "a"}'], "line 2"),
+    (['{"topic": {"_id": "t"}}', "not json"], "invalid JSON"),
+    ([""], "empty dataset"),
+])
+def test_format_errors_report_line(tmp_path, lines, message):
+    path = write_lines(tmp_path / "bad.jsonl", lines)
+    with pytest.raises(DatasetFormatError, match=message):
+        header, posts = open_jsonl_dataset(path)
+        list(posts)
+
+
+def test_online_deduplicator_keeps_longest_representative():
+    deduplicator = OnlineDeduplicator(similarity_threshold=0.9)
+    deduplicator.add(["short", "other"], ["a", "b"], np.array([[1.0, 0.0], [0.0, 1.0]]))
+    deduplicator.add(["much longer", "x"], ["b", ""], np.array([[0.99, 0.01], [0.7, 0.7]]))
+    assert len(deduplicator) == 3
+    assert deduplicator.representatives[0] == "much longer"
+    assert deduplicator.support[0] == {"a": 1, "b": 1}
+    assert deduplicator.seen == 4
+
+
+def test_judge_stream_merges_repeated_posts(make_judge, offline_config):
+    header = copy.deepcopy(SAMPLE_TOPIC["topic"])
+    posts = header.pop("posts") * 4
+    result = asyncio.run(make_judge().judge_stream(header, iter(posts), offline_config, batch_size=5))
+    assert result["metadata"]["stream"]["posts"] == 12
+    assert result["metadata"]["stream"]["batches"] == 3
+    assert result["metadata"]["stream"]["clusters"] <= 3
+    assert result["win_camp_id"] == "a"
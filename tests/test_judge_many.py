@@ -0,0 +1,87 @@
+import asyncio
+import copy
+
+from lib.oracle_mvp_ai.result_cache import JudgeResultCache
+from tests.fakes import SAMPLE_TOPIC, FakeLLM
+
+
+class CountingLLM(FakeLLM):
+    """
+    동시에 진행 중인 최종 판결 요청 수를 기록
+    """
+    def __init__(self, delay: float):
+        super().__init__(delay=delay)
+        self.active = 0
+        self.max_active = 0
+
+    async def chat_async(self, messages, model: str = "fake", temperature: float = 0, seed: int = 42) -> str:
+        if "camp_id" not in messages[0]["content"]:
+            return await super().chat_async(messages, model, temperature, seed)
+        self.active += 1
+        self.max_active = max(self.max_active, self.active)
+        try:
+            return await super().chat_async(messages, model, temperature, seed)
+        finally:
+            self.active -= 1
+
+
+def make_topics(count):
+    topics = []
+    for i in range(count):
+        data = copy.deepcopy(SAMPLE_TOPIC)
+        data["topic"]["_id"] = f"t{i}"
+        topics.append(data)
+    return topics
+
+
+async def collect(judge, topics, config, **kwargs):
+    return [result async for result in judge.judge_many(topics, config, **kwargs)]
+
+
+def test_judge_many_limits_concurrency_and_batches_embeddings(make_judge, offline_config):
+    llm = CountingLLM(delay=0.05)
+    judge = make_judge(openai=llm)
+    results = asyncio.run(collect(judge, make_topics(6), offline_config, max_concurrent_topics=2, embedding_window=8))
+    assert sorted(result["topic_id"] for result in results) == [f"t{i}" for i in range(6)]
+    assert 1 < llm.max_active <= 2
+    # 6개 주제의 임베딩을 한 번의 배치 요청으로 생성
+    assert llm.calls.count("embeddings") == 1
+    assert "embedding" not in llm.calls
+
+
+def test_failed_topic_yields_error_result(make_judge, offline_config):
+    judge = make_judge()
+    topics = make_topics(2) + [{"topic": {"_id": "broken"}}]
+    results = {result["topic_id"]: result for result in asyncio.run(collect(judge, topics, offline_config))}
+    assert results["broken"]["win_camp_id"] is None
+    assert results["broken"]["error"]
+    assert results["t0"]["win_camp_id"] == "a"
+    assert results["t1"]["win_camp_id"] == "a"
+
+
+class EmbeddingCountingLLM(FakeLLM):
+    def __init__(self):
+        super().__init__()
+        self.embedded = []
+
+    async def create_embeddings_async(self, texts, model: str = "fake", batch_size: int = 512):
+        self.embedded.extend(texts)
+        return await super().create_embeddings_async(texts, model, batch_size)
+
+
+def test_cached_topics_skip_batch_embedding(make_judge, offline_config):
+    llm = EmbeddingCountingLLM()
+    judge = make_judge(openai=llm, result_cache=JudgeResultCache())
+    config = offline_config.replace(use_cache=True)
+    topics = make_topics(3)
+    for data in topics:
+        for post in data["topic"]["posts"]:
+            post["msg"] = f"{data['topic']['_id']}: {post['msg']}"
+    asyncio.run(collect(judge, topics[:1], config))
+    llm.embedded.clear()
+
+    results = {result["topic_id"]: result for result in asyncio.run(collect(judge, topics, config))}
+    assert results["t0"]["metadata"]["cache_hit"] is True
+    assert results["t1"]["metadata"]["cache_hit"] is False
+    # 결과 캐시에 있는 t0의 의견은 임베딩하지 않음
+    assert sorted(llm.embedded) == sorted(post["msg"] for data in topics[1:] for post in data["topic"]["posts"])
@@ -0,0 +1,118 @@
+import asyncio
+
+import pytest
+
+from lib.oracle_mvp_ai.llm_clients.limiter import RequestLimiter, current_priority, llm_priority
+from lib.oracle_mvp_ai.strategies.final_debate import JudgeAfterDebate
+from tests.fakes import FakeLLM, judgment_json, stub_openai_client
+
+
+async def schedule(limiter, priorities):
+    """
+    자리를 하나 잡아 둔 상태에서 priorities 순으로 대기시킨 뒤 실행된 순서 반환
+    """
+    order = []
+
+    async def call(name, priority):
+        with llm_priority(priority):
+            async with limiter:
+                order.append(name)
+                await asyncio.sleep(0)
+
+    async with limiter:
+        tasks = []
+        for i, priority in enumerate(priorities):
+            tasks.append(asyncio.create_task(call(f"{priority[0]}{i}", priority)))
+            await asyncio.sleep(0)
+    await asyncio.gather(*tasks)
+    return order
+
+
+def test_interactive_runs_before_waiting_bulk():
+    limiter = RequestLimiter(max_concurrency=1, bulk_min_share=0)
+    order = asyncio.run(schedule(limiter, ["bulk", "bulk", "interactive", "interactive"]))
+    assert order == ["i2", "i3", "b0", "b1"]
+
+
+def test_bulk_keeps_minimum_share():
+    limiter = RequestLimiter(max_concurrency=1, bulk_min_share=0.2)
+    order = asyncio.run(schedule(limiter, ["bulk"] * 3 + ["interactive"] * 5))
+    # 함께 기다리는 동안에도 bulk가 허용된 요청의 20% 이상 실행됨
+    assert order == ["b0", "i3", "i4", "i5", "i6", "b1", "i7", "b2"]
+
+
+def test_priority_context():
+    assert current_priority() == "interactive"
+    with llm_priority("bulk"):
+        assert current_priority() == "bulk"
+    assert current_priority() == "interactive"
+    with pytest.raises(ValueError):
+        with llm_priority("urgent"):
+            pass
+
+
+def test_cancelled_interactive_waiter_does_not_count_as_contention():
+    limiter = RequestLimiter(max_concurrency=1, bulk_min_share=0.5)
+    order = []
+
+    async def call(name, priority):
+        with llm_priority(priority):
+            async with limiter:
+                order.append(name)
+                await asyncio.sleep(0)
+
+    async def main():
+        async with limiter:
+            tasks = {}
+            for name, priority in [("i0", "interactive"), ("i1", "interactive"), ("b2", "bulk"), ("b3", "bulk")]:
+                tasks[name] = asyncio.create_task(call(name, priority))
+                await asyncio.sleep(0)
+            tasks.pop("i1").cancel()
+            await asyncio.sleep(0)
+            # 자리가 한꺼번에 늘어나 한 번에 여러 요청을 허용
+            limiter.max_concurrency = 3
+        await asyncio.gather(*tasks.values())
+        limiter.max_concurrency = 1
+        return await schedule(limiter, ["bulk", "interactive", "interactive"])
+
+    later = asyncio.run(main())
+    assert order == ["b2", "i0", "b3"]
+    # 취소된 i1과 b3가 함께 기다린 것으로 세지 않으므로 다음 경합에서도 bulk 비율을 지킴
+    assert later == ["b0", "i1", "i2"]
+
+
+def test_bulk_debate_calls_queue_behind_interactive():
+    client = stub_openai_client(delay=0.02)
+    client.async_client.content = "[동의] " + judgment_json("a")
+    client.limiter = RequestLimiter(max_concurrency=1, bulk_min_share=0)
+    debate = JudgeAfterDebate(client, max_turns=3)
+
+    async def bulk_debate():
+        with llm_priority("bulk"):
+            return await debate.debate([{"role": "user", "content": "debate"}])
+
+    async def interactive(i):
+        with llm_priority("interactive"):
+            await client.chat_async([{"role": "user", "content": f"interactive {i}"}])
+
+    async def main():
+        task = asyncio.create_task(bulk_debate())
+        await asyncio.sleep(0.005)
+        await asyncio.gather(interactive(0), interactive(1))
+        return await task
+
+    result = asyncio.run(main())
+    order = [call["messages"][-1]["content"] for call in client.async_client.calls]
+    assert result["final_state"] == "agreement"
+    # 토론의 첫 호출이 진행되는 동안 들어온 interactive 요청이 다음 토론 호출보다 먼저 실행됨
+    assert order[1:3] == ["interactive 0", "interactive 1"]
+    assert len(order) == 6
+
+
+def test_debate_uses_judge_client(make_judge, offline_config, topic):
+    llm = FakeLLM(["[동의] " + judgment_json("b", 40)])
+    result = asyncio.run(make_judge(openai=llm).judge(topic, offline_config.replace(judge_after_debate=True)))
+    assert result["win_camp_id"] == "b"
+    assert result["metadata"]["debate"] == {"final_state": "agreement", "turns": 0}
+    # 초기 판결 2번 + 한 턴의 A, B 응답
+    assert len(llm.final_messages) == 4
@@ -0,0 +1,75 @@
+import asyncio
+
+from lib.oracle_mvp_ai.strategies.opinion_summary import OpinionSummarizer, count_tokens, truncate_to_tokens
+from tests.fakes import OBJECT_ID_CAMPS, DistinctLLM, judgment_json, object_id_topic
+
+
+class SummaryLLM:
+    def __init__(self, fail: bool = False):
+        self.fail = fail
+        self.calls = 0
+
+    async def chat_async(self, messages, model: str = "fake", temperature: float = 0, seed: int = 42) -> str:
+        self.calls += 1
+        if self.fail:
+            raise RuntimeError("summary failed")
+        return "1. merged argument"
+
+
+def long_opinions(count):
+    return [f"opinion {i}: " + "evidence " * 40 for i in range(count)]
+
+
+def test_truncate_to_tokens():
+    text = "word " * 100
+    assert count_tokens(truncate_to_tokens(text, 10)) <= 10
+    assert truncate_to_tokens("short", 10) == "short"
+
+
+def test_within_budget_skips_llm():
+    client = SummaryLLM()
+    result = asyncio.run(OpinionSummarizer(client, token_budget=10_000).summarize("T", {"A": ["x"], "B": ["y"]}))
+    assert result["rounds"] == 0
+    assert result["opinions"] == {"A": ["x"], "B": ["y"]}
+    assert client.calls == 0
+
+
+def test_summarizes_each_camp_into_budget():
+    client = SummaryLLM()
+    summarizer = OpinionSummarizer(client, token_budget=200, chunk_tokens=300)
+    result = asyncio.run(summarizer.summarize("T", {"A": long_opinions(10), "B": long_opinions(10), "C": []}))
+    assert set(result["opinions"]) == {"A", "B"}
+    assert result["rounds"] >= 1
+    assert result["input_tokens"] > 200
+    assert result["output_tokens"] <= 200
+    assert client.calls > 2
+
+
+def test_failed_summary_still_fits_budget():
+    summarizer = OpinionSummarizer(SummaryLLM(fail=True), token_budget=100, chunk_tokens=300, max_rounds=2)
+    result = asyncio.run(summarizer.summarize("T", {"A": long_opinions(10)}))
+    assert 0 < result["output_tokens"] <= 100
+
+
+def test_judge_records_summarization(make_judge, offline_config, topic):
+    topic["topic"]["posts"] += [{"user_id": f"v{i}", "camp_id": "b", "msg": f"B point {i}: " + "detail " * 60} for i in range(6)]
+    result = asyncio.run(make_judge().judge(topic, offline_config.replace(opinion_token_budget=150)))
+    summarization = result["metadata"]["summarization"]
+    assert summarization["token_budget"] == 150
+    assert summarization["input_tokens"] > 150
+    assert summarization["rounds"] >= 1
+
+
+def test_weighted_summary_keeps_object_id_camps_apart(make_judge, offline_config):
+    data = object_id_topic()
+    camp_b = OBJECT_ID_CAMPS[1]
+    data["topic"]["posts"] += [{"user_id": f"v{i}", "camp_id": camp_b, "msg": f"B point {i}: " + "detail " * 60} for i in range(6)]
+    llm = DistinctLLM([judgment_json(camp_b, 40, OBJECT_ID_CAMPS)])
+    config = offline_config.replace(weight_opinions_by_support=True, opinion_token_budget=150)
+    result = asyncio.run(make_judge(openai=llm).judge(data, config))
+    assert result["metadata"]["summarization"]["rounds"] >= 1
+    prompt = llm.final_messages[-1][-1]["content"]
+    assert "A camp opinions (summarized):" in prompt
+    assert "B camp opinions (summarized):" in prompt
+    assert "Unassigned" not in prompt
+    assert result["win_camp_id"] == camp_b
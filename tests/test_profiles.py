@@ -0,0 +1,45 @@
+import asyncio
+import time
+
+import pytest
+
+from lib.oracle_mvp_ai.config import JudgeConfig
+from lib.oracle_mvp_ai.profiles import JUDGE_PROFILES, Deadline, get_profile
+from tests.fakes import FakeLLM, judgment_json
+
+
+def test_deadline_remaining_respects_reserve():
+    assert Deadline().remaining() is None
+    deadline = Deadline(10)
+    assert 9 < deadline.remaining() <= 10
+    assert 4 < deadline.remaining(reserve=5) <= 5
+    assert deadline.remaining(reserve=60) == 0.0
+    time.sleep(0.01)
+    assert deadline.elapsed() >= 0.01
+
+
+def test_unknown_profile_rejected():
+    with pytest.raises(ValueError):
+        get_profile("nope")
+    with pytest.raises(ValueError):
+        JudgeConfig(profile="nope")
+
+
+def test_fast_profile_skips_web_search(make_judge, offline_config, topic, fake_llm):
+    judge = make_judge()
+    result = asyncio.run(judge.judge(topic, offline_config.replace(profile="fast")))
+    profile = result["metadata"]["profile"]
+    assert profile["name"] == "fast"
+    assert "web_search_skipped" in profile["degradations"]
+    assert "web_search" not in fake_llm.calls
+
+
+def test_final_judgment_timeout_falls_back_to_post_counts(make_judge, offline_config, topic, monkeypatch):
+    monkeypatch.setitem(JUDGE_PROFILES, "tight", dict(JUDGE_PROFILES["fast"], deadline_seconds=0.3, final_reserve_seconds=0))
+    judge = make_judge(openai=FakeLLM([judgment_json("b", 10)], delay=5))
+    started = time.monotonic()
+    result = asyncio.run(judge.judge(topic, offline_config.replace(profile="tight")))
+    assert time.monotonic() - started < 3
+    assert "final_judgment_timeout" in result["metadata"]["profile"]["degradations"]
+    # 진영별 의견 수 (a 2개, b 1개)로 판결
+    assert result["win_camp_id"] == "a"
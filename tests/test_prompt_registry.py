@@ -0,0 +1,26 @@
+from lib.oracle_mvp_ai.prompt_registry import PromptRegistry, PromptTemplate
+
+
+def test_template_format_and_replace_modes():
+    assert PromptTemplate("Topic: {topic}, {{literal}}").render(topic="T") == "Topic: T, {literal}"
+    assert PromptTemplate("{x:>3}").render(x=1) == "  1"
+    # fields를 지정하면 JSON 예시 중괄호는 그대로 둠
+    template = PromptTemplate('{topic} -> {"camp_id": "..."}', fields=("topic",))
+    assert template.render(topic="T") == 'T -> {"camp_id": "..."}'
+
+
+def test_registry_parses_once_and_reloads_on_invalidate(tmp_path):
+    path = tmp_path / "v1.yaml"
+    path.write_text("final_judgment:\n  user: 'Topic {topic} {opinions} {camps} {\"camp_id\": 1}'\n", encoding="utf-8")
+    registry = PromptRegistry(tmp_path)
+    version = registry.get("v1.yaml")
+    assert registry.get("v1.yaml") is version
+    assert registry.list() == ["v1.yaml"]
+    assert version.render("final_judgment", "user", topic="T", opinions="O", camps="C") == 'Topic T O C {"camp_id": 1}'
+
+    path.write_text("final_judgment:\n  user: changed\n", encoding="utf-8")
+    assert registry.get("v1.yaml") is version
+    registry.invalidate("v1.yaml")
+    reloaded = registry.get("v1.yaml")
+    assert reloaded["final_judgment"]["user"] == "changed"
+    assert reloaded.digest != version.digest
@@ -0,0 +1,64 @@
+import asyncio
+import copy
+
+from lib.oracle_mvp_ai.result_cache import JudgeResultCache, make_cache_key
+
+
+PROCESSED = {
+    "topic": "A vs B", "camps": ["A", "B"], "camp_ids": ["a", "b"],
+    "posts": ["x", "y"], "post_camp_ids": ["a", "b"], "prompt_file": "v_2_1_1.yaml",
+}
+
+
+def test_cache_key_ignores_non_result_options():
+    key = make_cache_key(PROCESSED, "digest", {"final_judgement_provider": "openai", "tenant": "t1", "priority": "bulk"})
+    assert key == make_cache_key(PROCESSED, "digest", {"final_judgement_provider": "openai", "tenant": "t2"})
+    assert key != make_cache_key(PROCESSED, "digest", {"final_judgement_provider": "google"})
+    assert key != make_cache_key(PROCESSED, "other-digest", {"final_judgement_provider": "openai"})
+    assert key != make_cache_key({**PROCESSED, "posts": ["x", "z"]}, "digest", {"final_judgement_provider": "openai"})
+    assert key != make_cache_key({**PROCESSED, "topic_id": "t2"}, "digest", {"final_judgement_provider": "openai"})
+
+
+def test_ttl_and_lru_eviction(monkeypatch):
+    now = [100.0]
+    monkeypatch.setattr("lib.oracle_mvp_ai.result_cache.time.monotonic", lambda: now[0])
+    cache = JudgeResultCache(ttl_seconds=10, max_entries=2)
+    cache.set("a", {"v": 1})
+    cache.set("b", {"v": 2})
+    assert cache.get("a") == {"v": 1}
+    cache.set("c", {"v": 3})
+    # 가장 오래 사용하지 않은 b가 제거됨
+    assert cache.get("b") is None
+    now[0] += 11
+    assert cache.get("a") is None
+    assert cache.stats()["hits"] == 1 and cache.stats()["misses"] == 2
+
+
+def test_cached_result_is_a_copy():
+    cache = JudgeResultCache()
+    cache.set("k", {"metadata": {}})
+    cache.get("k")["metadata"]["cache_hit"] = True
+    assert cache.get("k") == {"metadata": {}}
+
+
+def test_repeat_judge_hits_cache(make_judge, offline_config, topic, fake_llm):
+    judge = make_judge(result_cache=JudgeResultCache())
+    config = offline_config.replace(use_cache=True)
+    first = asyncio.run(judge.judge(topic, config))
+    calls = len(fake_llm.calls)
+    second = asyncio.run(judge.judge(topic, config))
+    assert first["metadata"]["cache_hit"] is False
+    assert second["metadata"]["cache_hit"] is True
+    assert second["win_camp_id"] == first["win_camp_id"]
+    assert len(fake_llm.calls) == calls
+
+
+def test_topics_with_same_content_do_not_share_results(make_judge, offline_config, topic):
+    judge = make_judge(result_cache=JudgeResultCache())
+    config = offline_config.replace(use_cache=True)
+    other = copy.deepcopy(topic)
+    other["topic"]["_id"] = "t2"
+    asyncio.run(judge.judge(topic, config))
+    result = asyncio.run(judge.judge(other, config))
+    assert result["topic_id"] == "t2"
+    assert result["metadata"]["cache_hit"] is False
@@ -0,0 +1,47 @@
+import asyncio
+
+import pytest
+
+from lib.oracle_mvp_ai.strategies.self_consistency import JudgeSelfConsistency
+from tests.fakes import FakeLLM, judgment_json
+
+
+CAMPS = ["A", "B"]
+CAMP_IDS = ["a", "b"]
+
+
+@pytest.mark.parametrize("response", [
+    '{"camp_id": "", "reason": "r", "percentage": [50, 50]}',
+    '{"camp_id": "zzz", "reason": "r", "percentage": [50, 50]}',
+    'not a judgment',
+])
+def test_strict_parse_rejects_missing_or_unknown_camp(make_judge, response):
+    judge = make_judge()
+    with pytest.raises(ValueError):
+        judge._parse_final_judgment(response, CAMPS, CAMP_IDS, strict=True)
+    # strict가 아니면 기존처럼 첫 번째 캠프로 대체
+    assert judge._parse_final_judgment(response, CAMPS, CAMP_IDS)["camp_id"] == "a"
+
+
+def test_strict_parse_accepts_valid_judgment(make_judge):
+    judgment = make_judge()._parse_final_judgment(judgment_json("b", 30), CAMPS, CAMP_IDS, strict=True)
+    assert judgment["camp_id"] == "b"
+    assert [entry["percentage"] for entry in judgment["percentage"]] == [30, 70]
+
+
+def test_malformed_samples_do_not_vote(make_judge):
+    judge = make_judge()
+    client = FakeLLM([
+        judgment_json("b", 40), judgment_json("b", 30),
+        '{"camp_id": "", "reason": "r"}', '{"camp_id": "hallucinated"}', "garbage",
+    ])
+    sampler = JudgeSelfConsistency(client, samples=5)
+    result = asyncio.run(sampler.judge(
+        [{"role": "system", "content": "camp_id"}, {"role": "user", "content": "x"}],
+        lambda response: judge._parse_final_judgment(response, CAMPS, CAMP_IDS, strict=True),
+        CAMP_IDS
+    ))
+    assert result["camp_id"] == "b"
+    assert result["votes"] == {"a": 0, "b": 2}
+    assert result["samples"] == 2
+    assert result["agreement"] == 1.0
@@ -0,0 +1,42 @@
+import os
+
+import numpy as np
+import pytest
+from bson import ObjectId
+from bson.errors import InvalidId
+
+from playground.serialization import ApiJSONResponse, JsonFileCache, dumps, loads, wrap_object_ids, write_json
+
+
+OID = "64b7f0c2a1b2c3d4e5f60718"
+
+
+def test_dumps_handles_object_ids_numpy_and_keys():
+    data = {"_id": ObjectId(OID), "score": np.float32(0.5), "vector": np.arange(3), "tags": {"x"}, ObjectId(OID): 1}
+    assert loads(dumps(data)) == {"_id": OID, "score": 0.5, "vector": [0, 1, 2], "tags": ["x"], OID: 1}
+    assert dumps({"msg": "한글"}) == '{"msg":"한글"}'.encode("utf-8")
+    assert ApiJSONResponse({"_id": ObjectId(OID)}).body == f'{{"_id":"{OID}"}}'.encode()
+
+
+def test_wrap_object_ids():
+    wrapped = wrap_object_ids({"topic": {"_id": OID, "posts": [{"user_id": OID, "msg": OID}]}})
+    assert wrapped["topic"]["_id"] == ObjectId(OID)
+    assert wrapped["topic"]["posts"][0]["user_id"] == ObjectId(OID)
+    assert wrapped["topic"]["posts"][0]["msg"] == OID
+    with pytest.raises(InvalidId):
+        wrap_object_ids({"_id": "not-an-object-id"})
+
+
+def test_json_file_cache_reloads_on_change(tmp_path):
+    path = str(tmp_path / "d.json")
+    write_json(path, {"_id": OID})
+    cache = JsonFileCache(max_entries=1)
+    first = cache.load(path)
+    assert cache.load(path) is first
+    assert cache.load(path, object_ids=True)["_id"] == ObjectId(OID)
+    assert cache.stats()["entries"] == 1
+
+    write_json(path, {"_id": OID, "changed": True})
+    os.utime(path, ns=(1, 1))
+    assert cache.load(path)["changed"] is True
+    assert [name for name in os.listdir(tmp_path) if name.endswith(".tmp")] == []
@@ -0,0 +1,33 @@
+import asyncio
+
+import numpy as np
+
+from lib.oracle_mvp_ai.snapshots import TopicSnapshotStore
+from tests.fakes import DistinctLLM
+
+
+def test_store_roundtrip(tmp_path):
+    store = TopicSnapshotStore(tmp_path)
+    assert store.load("t/1") is None
+    store.save("t/1", {"prompt_file": "p.yaml", "embeddings": {"x": [0.5, 1.0]}, "scored_opinions": {}})
+    snapshot = store.load("t/1")
+    assert snapshot["prompt_file"] == "p.yaml"
+    assert np.allclose(snapshot["embeddings"]["x"], [0.5, 1.0])
+    store.delete("t/1")
+    assert store.load("t/1") is None
+
+
+def test_rejudge_reuses_embeddings_and_scores(make_judge, offline_config, topic, tmp_path):
+    llm = DistinctLLM()
+    judge = make_judge(openai=llm, snapshot_store=TopicSnapshotStore(tmp_path))
+    first = asyncio.run(judge.judge(topic, offline_config))
+    assert first["metadata"]["incremental"]["reused_embeddings"] == 0
+    assert first["metadata"]["incremental"]["new_scores"] == 3
+
+    topic["topic"]["posts"].append({"user_id": "u4", "camp_id": "b", "msg": "B also has the better roster"})
+    second = asyncio.run(judge.judge(topic, offline_config))
+    incremental = second["metadata"]["incremental"]
+    assert incremental["reused_embeddings"] == 3
+    assert incremental["new_embeddings"] == 1
+    assert incremental["reused_scores"] == 3
+    assert incremental["new_scores"] == 1
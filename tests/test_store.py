@@ -0,0 +1,59 @@
+import json
+
+from playground.store import ExperimentStore
+
+
+def judge_result(topic_id, win_camp_id="a"):
+    return {
+        "topic_id": topic_id,
+        "win_camp_id": win_camp_id,
+        "ai_conclusion": "a wins",
+        "metadata": {"spend": {"tokens": 100, "cost_usd": 0.01}}
+    }
+
+
+def test_record_and_query_runs(tmp_path):
+    store = ExperimentStore(str(tmp_path / "experiments.db"))
+    judge_id = store.record_run("judge", "r1.json", {"prompt_filename": "v_2_1_1.yaml", "dataset_version": "v2"},
+                                [judge_result("t1")], config={"final_judgement_provider": "openai"}, created_at=1)
+    store.record_run("consistency", "c1.json", {"prompt_filename": "v_2_1_1.yaml", "n": 2},
+                     [judge_result("t2"), judge_result("t2", "b")], metrics={"winner_consistency": 0.5}, created_at=2)
+
+    runs = store.list_runs()
+    assert runs["total"] == 2
+    assert [run["result_file"] for run in runs["runs"]] == ["c1.json", "r1.json"]
+    assert runs["runs"][0]["metrics"] == {"winner_consistency": 0.5}
+    assert store.list_runs(topic_id="t1")["runs"][0]["id"] == judge_id
+    assert store.list_runs(kind="consistency", since=2)["total"] == 1
+    assert store.get_run(judge_id)["config"] == {"final_judgement_provider": "openai"}
+    results = store.list_results(judge_id)
+    assert results["total"] == 1 and results["results"][0]["win_camp_id"] == "a"
+
+    # 같은 결과 파일을 다시 기록하면 교체
+    store.record_run("judge", "r1.json", {}, [judge_result("t3")])
+    assert store.list_runs(kind="judge")["total"] == 1
+    assert store.list_runs(topic_id="t1")["total"] == 0
+    store.close()
+
+
+def test_import_skips_non_object_json(tmp_path):
+    results_dir = tmp_path / "results"
+    consistency_dir = results_dir / "consistency"
+    consistency_dir.mkdir(parents=True)
+    (results_dir / "judge.json").write_text(json.dumps(judge_result("t1")))
+    (results_dir / "list.json").write_text(json.dumps([judge_result("t1")]))
+    (consistency_dir / "ok.json").write_text(json.dumps({
+        "prompt_filename": "v_2_1_1.yaml", "n": 2, "mode": "final",
+        "results": [judge_result("t1"), judge_result("t1")], "metrics": {"winner_consistency": 1.0}
+    }))
+    (consistency_dir / "list.json").write_text(json.dumps([1, 2, 3]))
+    (consistency_dir / "scalar.json").write_text("42")
+    (consistency_dir / "broken.json").write_text("{")
+
+    store = ExperimentStore(str(tmp_path / "experiments.db"))
+    assert store.import_json_results(str(results_dir)) == 2
+    assert store.has_run("judge", "judge.json") and store.has_run("consistency", "ok.json")
+    assert not store.has_run("consistency", "list.json")
+    # 이미 가져온 파일은 건너뜀
+    assert store.import_json_results(str(results_dir)) == 0
+    store.close()
@@ -0,0 +1,56 @@
+import asyncio
+
+import pytest
+
+from tests.fakes import OBJECT_ID_CAMPS, DistinctLLM, judgment_json, object_id_topic
+
+
+POSTS = ["a1", "a1 again", "a1 once more", "b1", "b2", "a2"]
+POST_CAMPS = ["a", "a", "b", "b", "b", "a"]
+CLUSTERS = [[0, 1, 2], [3], [4], [5]]
+
+
+def test_clusters_carry_support_and_camp_breakdown(make_judge):
+    weighted, stats = make_judge()._weight_opinion_clusters(
+        CLUSTERS, POSTS, {"a1": "a1 (credibility score of 7)"}, POST_CAMPS, ["a", "b"], ["A", "B"]
+    )
+    assert weighted[0] == {"camp_id": "a", "support": 3, "line": "[support 3: A 2, B 1] a1 (credibility score of 7)"}
+    assert [entry["support"] for entry in weighted] == [3, 1, 1, 1]
+    assert stats == {"clusters": 4, "included": 4, "omitted": 0}
+
+
+def test_max_clusters_keeps_camp_proportions(make_judge):
+    weighted, stats = make_judge()._weight_opinion_clusters(
+        CLUSTERS, POSTS, {}, POST_CAMPS, ["a", "b"], ["A", "B"], max_clusters=2
+    )
+    assert sorted(entry["camp_id"] for entry in weighted) == ["a", "b"]
+    assert weighted[0]["support"] == 3
+    assert stats == {"clusters": 4, "included": 2, "omitted": 2}
+
+
+def test_post_support_from_stream_dedup(make_judge):
+    weighted, _ = make_judge()._weight_opinion_clusters(
+        [[0], [1]], ["x", "y"], {}, None, ["a", "b"], ["A", "B"], post_support=[{"a": 4, "b": 1}, {"b": 2}]
+    )
+    assert weighted[0]["line"] == "[support 5: A 4, B 1] x"
+    assert weighted[1]["camp_id"] == "b"
+
+
+def test_judge_records_support_weighting(make_judge, offline_config, topic):
+    result = asyncio.run(make_judge().judge(topic, offline_config.replace(weight_opinions_by_support=True)))
+    support_weighting = result["metadata"]["support_weighting"]
+    assert support_weighting["included"] == support_weighting["clusters"]
+    assert support_weighting["omitted"] == 0
+
+
+@pytest.mark.parametrize("weighted", [True, False])
+def test_grouped_opinions_with_object_id_camps(make_judge, offline_config, weighted):
+    camp_b = OBJECT_ID_CAMPS[1]
+    llm = DistinctLLM([judgment_json(camp_b, 40, OBJECT_ID_CAMPS)])
+    config = offline_config.replace(weight_opinions_by_support=weighted, group_opinions_by_camp=True)
+    result = asyncio.run(make_judge(openai=llm).judge(object_id_topic(), config))
+    prompt = llm.final_messages[-1][-1]["content"]
+    assert prompt.count("A camp opinions:") == 1
+    assert prompt.count("B camp opinions:") == 1
+    assert "Unassigned" not in prompt
+    assert result["win_camp_id"] == camp_b
@@ -0,0 +1,58 @@
+import asyncio
+
+import httpx
+import pytest
+
+from lib.oracle_mvp_ai import telemetry
+from lib.oracle_mvp_ai.telemetry import MetricsRegistry
+
+
+def test_registry_renders_prometheus_text():
+    registry = MetricsRegistry()
+    requests = registry.counter("t_requests_total", "Requests", ("status",))
+    in_flight = registry.gauge("t_in_flight", "In flight")
+    latency = registry.histogram("t_seconds", "Latency", buckets=(0.1, 1))
+    requests.inc(status="ok")
+    requests.inc(2, status='say "hi"')
+    with in_flight.track():
+        assert in_flight.value() == 1
+    latency.observe(0.5)
+    latency.observe(5)
+
+    text = registry.render()
+    assert "# TYPE t_requests_total counter" in text
+    assert 't_requests_total{status="ok"} 1' in text
+    assert 't_requests_total{status="say \\"hi\\""} 2' in text
+    assert "t_in_flight 0" in text
+    assert 't_seconds_bucket{le="0.1"} 0' in text
+    assert 't_seconds_bucket{le="1"} 1' in text
+    assert 't_seconds_bucket{le="+Inf"} 2' in text
+    assert "t_seconds_count 2" in text
+    with pytest.raises(ValueError):
+        requests.inc(wrong="x")
+    with pytest.raises(ValueError):
+        registry.counter("t_requests_total", "duplicate")
+
+
+def test_judgment_updates_metrics(make_judge, offline_config, topic):
+    before = telemetry.JUDGE_REQUESTS.value(status="ok")
+    count = telemetry.STAGE_DURATION.count(stage="final_judgment")
+    asyncio.run(make_judge().judge(topic, offline_config))
+    assert telemetry.JUDGE_REQUESTS.value(status="ok") == before + 1
+    assert telemetry.STAGE_DURATION.count(stage="final_judgment") == count + 1
+
+
+def test_metrics_endpoint():
+    from playground import api
+
+    async def main():
+        transport = httpx.ASGITransport(app=api.app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            await client.get("/prompts")
+            return await client.get("/metrics")
+
+    response = asyncio.run(main())
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+    assert "# TYPE oracle_judge_duration_seconds histogram" in response.text
+    assert 'oracle_http_request_duration_seconds_count{path="/prompts",method="GET",status="200"}' in response.text
@@ -0,0 +1,45 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from lib.oracle_mvp_ai.tracing import estimate_cost, record_usage, stage, start_trace
+from tests.fakes import FakeLLM
+
+
+class UsageLLM(FakeLLM):
+    """
+    실제 클라이언트처럼 호출마다 record_usage로 사용량을 기록
+    """
+    async def chat_async(self, messages, model: str = "gpt-4o", temperature: float = 0, seed: int = 42) -> str:
+        record_usage("gpt-4o", SimpleNamespace(prompt_tokens=100, completion_tokens=20))
+        return await super().chat_async(messages, model, temperature, seed)
+
+
+def test_usage_is_recorded_in_current_stage():
+    with start_trace() as trace:
+        with stage("final_judgment"):
+            record_usage("gpt-4o", SimpleNamespace(prompt_tokens=1000, completion_tokens=100))
+            record_usage("gpt-4o", SimpleNamespace(input_tokens=10, output_tokens=5))
+        record_usage("unknown-model", None)
+    report = trace.to_dict()
+    final = report["stages"]["final_judgment"]
+    assert final["calls"] == 2
+    assert final["prompt_tokens"] == 1010 and final["completion_tokens"] == 105
+    assert final["cost_usd"] == pytest.approx(estimate_cost("gpt-4o", 1010, 105), abs=1e-6)
+    assert report["stages"]["other"]["calls"] == 1
+    assert report["total"]["calls"] == 3
+    # trace 밖의 호출은 기록되지 않음
+    record_usage("gpt-4o", None)
+    assert trace.to_dict()["total"]["calls"] == 3
+
+
+def test_judge_reports_trace_in_metadata(make_judge, offline_config, topic):
+    llm = UsageLLM()
+    result = asyncio.run(make_judge(openai=llm).judge(topic, offline_config))
+    trace = result["metadata"]["trace"]
+    assert {"embedding", "dedup", "web_search", "final_judgment"} <= set(trace["stages"])
+    assert trace["stages"]["final_judgment"]["calls"] == 1
+    assert trace["stages"]["final_judgment"]["prompt_tokens"] == 100
+    assert trace["total"]["calls"] == llm.calls.count("final") + llm.calls.count("scoring")
+    assert trace["total"]["cost_usd"] > 0
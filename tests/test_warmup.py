@@ -0,0 +1,72 @@
+import asyncio
+
+import httpx
+
+from playground.warmup import FAILED, OK, PENDING, WarmUp
+
+
+def test_required_steps_decide_readiness():
+    attempts = []
+
+    async def flaky():
+        attempts.append(1)
+        if len(attempts) == 1:
+            raise ConnectionError("provider unreachable")
+
+    async def optional_failure():
+        raise RuntimeError("optional")
+
+    async def slow():
+        await asyncio.sleep(5)
+
+    async def main():
+        warmup = WarmUp(timeout=0.1)
+        warmup.add("prompts", lambda: asyncio.sleep(0))
+        warmup.add("provider", flaky)
+        warmup.add("extra", optional_failure, required=False)
+        warmup.add("slow", slow, required=False)
+        assert not warmup.ready and warmup.to_dict()["steps"]["prompts"]["status"] == PENDING
+
+        await warmup.run()
+        first = warmup.to_dict()
+        failed = warmup.failed_steps()
+        await warmup.run(["provider"])
+        return warmup, first, failed
+
+    warmup, first, failed = asyncio.run(main())
+    assert first["ready"] is False
+    assert first["steps"]["provider"]["error"] == "ConnectionError: provider unreachable"
+    assert "timed out" in first["steps"]["slow"]["error"]
+    assert failed == ["provider", "extra", "slow"]
+    # 필수 단계를 다시 실행해 성공하면 선택 단계가 실패해도 준비 완료
+    assert warmup.ready
+    steps = warmup.to_dict()["steps"]
+    assert steps["provider"]["status"] == OK and steps["extra"]["status"] == FAILED
+    assert len(attempts) == 2
+
+
+def test_ready_endpoint_status(monkeypatch):
+    from playground import api
+
+    async def fail():
+        raise RuntimeError("down")
+
+    async def get_ready(warmup):
+        monkeypatch.setattr(api, "warmup", warmup)
+        transport = httpx.ASGITransport(app=api.app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            return await client.get("/ready")
+
+    async def main():
+        not_ready = WarmUp()
+        not_ready.add("provider:openai", fail)
+        await not_ready.run()
+        ready = WarmUp()
+        ready.add("prompts", lambda: asyncio.sleep(0))
+        await ready.run()
+        return await get_ready(not_ready), await get_ready(ready)
+
+    not_ready, ready = asyncio.run(main())
+    assert not_ready.status_code == 503
+    assert not_ready.json()["steps"]["provider:openai"]["status"] == FAILED
+    assert ready.status_code == 200 and ready.json()["ready"] is True